@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+
+SNAPSHOT_NAME = "snapshot.json"
+JOURNAL_PATTERN = "journal.{}.jsonl"
+
+
+def default_journal_dir():
+    """Returns the per-user directory holding the attempt journal."""
+    return os.path.join(os.path.expanduser("~"), ".spelling_app", "journal")
+
+
+def _fsync_dir(directory):
+    """Makes a rename in `directory` durable (a no-op where directories cannot be opened)."""
+    try: fd = os.open(directory, os.O_RDONLY)
+    except OSError: return
+    try: os.fsync(fd)
+    except OSError: pass
+    finally: os.close(fd)
+
+
+class AttemptJournal:
+    """Crash-safe record of the misspelled-words log: a snapshot plus an append-only journal.
+
+    Every change is appended to journal.<generation>.jsonl as one JSON line
+    and flushed to the OS straight away; `sync` batches the fsyncs and is
+    meant to be driven by a timer. `compact` starts a new generation
+    and writes the current state as the snapshot on a background thread
+    (temp file, fsync, atomic rename) before deleting older journals, so
+    replay on startup reads the snapshot and only the journal lines written
+    since it.
+    """
+
+    COMPACT_BYTES = 256 * 1024 # Journal size that triggers compaction on the next sync, or the snapshot size if larger
+
+    def __init__(self, directory=None):
+        self.directory = directory or default_journal_dir()
+        os.makedirs(self.directory, exist_ok=True)
+        self.generation = 0
+        self._file = None
+        self._dirty = False
+        self._writer = None # Background snapshot thread
+        self._snapshot_bytes = 0 # Compacting only once the journal outgrows the snapshot keeps the cost amortized
+
+    def _journal_path(self, generation):
+        return os.path.join(self.directory, JOURNAL_PATTERN.format(generation))
+
+    def _journal_generations(self):
+        """Returns the generations of the journal files on disk, oldest first."""
+        prefix, suffix = JOURNAL_PATTERN.split("{}")
+        generations = []
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith(suffix) and name[len(prefix):-len(suffix)].isdigit():
+                generations.append(int(name[len(prefix):-len(suffix)]))
+        return sorted(generations)
+
+    # --- Replay ---
+    def replay(self, session):
+        """Rebuilds the session's misspelled words and tracking from the snapshot and the journal tail.
+
+        Returns the number of journal entries applied. Call before attaching
+        the journal to the session, so replayed changes are not journaled again.
+        """
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_NAME)
+        data = {}
+        if os.path.exists(snapshot_path):
+            try:
+                with open(snapshot_path, 'r', encoding='utf-8') as f: data = json.load(f)
+                self._snapshot_bytes = os.path.getsize(snapshot_path)
+            except (OSError, ValueError) as e: print(f"Error reading journal snapshot: {e}")
+        self.generation = data.get('generation', 0)
+        session.load_tracking(data.get('saved_misspelled_words', []), data.get('saved_tracking_data', {}))
+
+        applied = skipped = 0
+        for generation in self._journal_generations():
+            if generation < self.generation: continue # Already folded into the snapshot
+            self.generation = generation + 1 # New entries go to a fresh file, never after a torn line
+            with open(self._journal_path(generation), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try: entry = json.loads(line)
+                    except ValueError: break # Torn final line from a crash mid-write
+                    if self._apply(session, entry): applied += 1
+                    else: skipped += 1
+        if skipped: print(f"Skipped {skipped} malformed attempt journal entries.")
+        return applied
+
+    @staticmethod
+    def _apply(session, entry):
+        """Applies one journal entry to the session. Returns False, changing nothing, if it is not a well-formed entry."""
+        if not isinstance(entry, dict): return False
+        kind = entry.get('op')
+        if kind == "attempt":
+            word, attempt, is_correct, confused_with = entry.get('w'), entry.get('a'), entry.get('ok'), entry.get('c', [])
+            if not (isinstance(word, str) and isinstance(attempt, str) and isinstance(is_correct, bool) and isinstance(confused_with, list)): return False
+            session.record_result(word, attempt, is_correct, confused_with) # The real-word index is not built yet
+        elif kind == "round": session.reset_round_counts()
+        else: return False
+        return True
+
+    # --- Appending ---
+    def _append(self, entry):
+        if self._file is None: self._file = open(self._journal_path(self.generation), 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush() # Survives an app crash now; `sync` makes it survive a power cut
+        self._dirty = True
+
+    def append_attempt(self, word, attempt, is_correct, confused_with=()):
+        """Records one graded attempt, with the real words a wrong one was mistaken for."""
+        entry = {'op': "attempt", 'w': word, 'a': attempt, 'ok': is_correct}
+        if confused_with: entry['c'] = list(confused_with)
+        self._append(entry)
+
+    def append_round_reset(self):
+        """Records the start of a misspelled-practice round, which resets correct counts."""
+        self._append({'op': "round"})
+
+    def sync(self, session=None):
+        """Fsyncs appends made since the last sync; with a session, also compacts once the journal has grown large."""
+        if self._dirty and self._file:
+            try: os.fsync(self._file.fileno())
+            except OSError as e: print(f"Error syncing attempt journal: {e}")
+            self._dirty = False
+        if session is not None and self._file and self._file.tell() >= max(self.COMPACT_BYTES, self._snapshot_bytes):
+            self.compact(session)
+
+    # --- Compaction ---
+    def compact(self, session, force=False):
+        """Writes the session's current state as the new snapshot and retires the journal behind it.
+
+        Without `force`, does nothing while a previous snapshot is still being
+        written (the next sync tries again). Use `force` when the state was
+        replaced wholesale, since the journal cannot describe that change.
+        """
+        if self._writer and self._writer.is_alive():
+            if not force: return False
+            self._writer.join()
+        data = dict(session.to_saved_data(), generation=self.generation + 1)
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":")) # Serialized here, while the state cannot change
+        self._snapshot_bytes = len(text)
+        if self._file:
+            self.sync()
+            self._file.close()
+            self._file = None
+        self.generation += 1
+        self._writer = threading.Thread(target=self._write_snapshot, args=(text, self.generation), daemon=True)
+        self._writer.start()
+        return True
+
+    def _write_snapshot(self, text, generation):
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_NAME)
+        temp_path = snapshot_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, snapshot_path)
+            _fsync_dir(self.directory)
+            for old in self._journal_generations():
+                if old < generation: os.remove(self._journal_path(old))
+        except OSError as e: print(f"Error writing journal snapshot: {e}")
+
+    def close(self, session=None):
+        """Compacts (if given the session) and closes the journal, waiting for the snapshot to land."""
+        if session is not None: self.compact(session, force=True)
+        elif self._file: self.sync()
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._writer: self._writer.join()
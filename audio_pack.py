@@ -0,0 +1,255 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from bisect import bisect_left
+from urllib.parse import quote
+
+from tts_cache import AudioCache
+
+# Layout (little-endian):
+#   header   MAGIC, uint32 clip count, uint32 metadata length, uint64 index position
+#   metadata UTF-8 JSON: list name, voice, rate and clip format
+#   clips    each word's complete audio file, back to back
+#   index    per clip, sorted by key: 20-byte SHA-1 of the word, uint64 clip position, uint32 clip length
+MAGIC = b"SPAPACK\x01"
+HEADER = struct.Struct("<8sIIQ")
+INDEX_ENTRY = struct.Struct("<20sQI")
+KEY_SIZE = 20
+AUDIO_PACK_EXTENSION = ".audiopack"
+DEFAULT_RATE = 150
+BAKE_BATCH = 25 # Words a worker synthesizes per runAndWait
+COPY_CHUNK_BYTES = 1 << 20
+
+
+def default_pack_dir():
+    """Returns the per-user directory holding baked audio packs."""
+    return os.path.join(os.path.expanduser("~"), ".spelling_app", "audio_packs")
+
+
+def pack_path(list_name, pack_dir=None):
+    """Returns the audio pack file for a word list."""
+    return os.path.join(pack_dir or default_pack_dir(), quote(list_name, safe="") + AUDIO_PACK_EXTENSION)
+
+
+def clip_key(word):
+    """Returns the index key of a word's clip."""
+    return hashlib.sha1(word.encode('utf-8')).digest()
+
+
+class AudioPack:
+    """Read-only, memory-mapped view of a baked audio pack.
+
+    Clips are found by binary search over the sorted key index, touching
+    only the index entries on the search path, so opening a pack costs the
+    same however many words it holds.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.clip_count, metadata_length, self._index_position = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC: raise ValueError(f"{filename} is not an audio pack")
+            if self._index_position + self.clip_count * INDEX_ENTRY.size > len(self._map): raise ValueError(f"{filename} is truncated")
+            self.metadata = json.loads(self._map[HEADER.size:HEADER.size + metadata_length].decode('utf-8'))
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Unmaps and closes the file."""
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __len__(self):
+        return self.clip_count
+
+    def __getitem__(self, i):
+        """Returns the i-th index key, so the pack itself can be bisected."""
+        start = self._index_position + i * INDEX_ENTRY.size
+        return self._map[start:start + KEY_SIZE]
+
+    def _find(self, key):
+        """Returns (position, length) of the clip with this key, or None."""
+        i = bisect_left(self, key)
+        if i == self.clip_count: return None
+        found, position, length = INDEX_ENTRY.unpack_from(self._map, self._index_position + i * INDEX_ENTRY.size)
+        return (position, length) if found == key else None
+
+    def __contains__(self, word):
+        return self._find(clip_key(word)) is not None
+
+    def clip(self, word):
+        """Returns a word's audio file as bytes, or None if it was not baked."""
+        found = self._find(clip_key(word))
+        if found is None: return None
+        position, length = found
+        return self._map[position:position + length]
+
+    def entries(self):
+        """Returns (key, position, length) for every clip, in key order."""
+        return [INDEX_ENTRY.unpack_from(self._map, self._index_position + i * INDEX_ENTRY.size) for i in range(self.clip_count)]
+
+    def copy_clip(self, position, length, f):
+        """Writes one clip's bytes to a file, a chunk at a time."""
+        end = position + length
+        while position < end:
+            f.write(self._map[position:min(end, position + COPY_CHUNK_BYTES)])
+            position += COPY_CHUNK_BYTES
+
+
+# --- Baking ---
+_engine = None # Each bake worker process owns one TTS engine
+_engine_error = None
+
+
+def _init_bake_worker(rate, voice):
+    global _engine, _engine_error
+    try:
+        import pyttsx3
+        _engine = pyttsx3.init()
+        _engine.setProperty('rate', rate)
+        if voice: _engine.setProperty('voice', voice)
+    except Exception as e:
+        _engine_error = str(e)
+
+
+def _render_batch(words, temp_dir, extension):
+    """Runs in a bake worker: synthesizes words into temp files. Returns [(word, path)], skipping words that failed."""
+    if _engine is None: raise RuntimeError(f"Speech engine unavailable: {_engine_error}")
+    paths = []
+    for word in words:
+        fd, path = tempfile.mkstemp(suffix=extension, dir=temp_dir)
+        os.close(fd)
+        _engine.save_to_file(word, path)
+        paths.append(path)
+    _engine.runAndWait() # One engine loop renders the whole batch
+    rendered = []
+    for word, path in zip(words, paths):
+        if os.path.getsize(path) > 0: rendered.append((word, path))
+        else: os.remove(path)
+    return rendered
+
+
+def bake(words, filename, list_name=None, rate=DEFAULT_RATE, voice=None, workers=None, progress=None):
+    """Renders every word into an audio pack, reusing clips from an existing pack with the same voice and rate.
+
+    Synthesis runs across a process pool with one TTS engine per process;
+    finished clips are streamed into the new pack as they arrive, which
+    then atomically replaces `filename`. Returns (rendered, reused, failed
+    words). `progress(done, total)` is called as batches finish.
+    """
+    words = list(dict.fromkeys(words))
+    metadata = {'list': list_name, 'voice': voice, 'rate': rate, 'format': AudioCache.CLIP_EXTENSION}
+    old = None
+    if os.path.exists(filename):
+        try: old = AudioPack(filename)
+        except (OSError, ValueError) as e: print(f"Ignoring unreadable audio pack {filename}: {e}")
+        if old and any(old.metadata.get(k) != metadata[k] for k in ('voice', 'rate', 'format')): # Rebaking in another voice
+            old.close()
+            old = None
+    try:
+        keys = set(map(clip_key, words))
+        reused = [entry for entry in old.entries() if entry[0] in keys] if old else []
+        reused_keys = {key for key, _, _ in reused}
+        todo = [word for word in words if clip_key(word) not in reused_keys]
+        if old and not todo and len(reused) == old.clip_count and old.metadata == metadata: return 0, len(reused), []
+
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        temp_filename = filename + ".tmp"
+        index = []
+        with open(temp_filename, 'wb') as f, tempfile.TemporaryDirectory(dir=directory) as temp_dir:
+            encoded_metadata = json.dumps(metadata, ensure_ascii=False).encode('utf-8')
+            f.write(HEADER.pack(MAGIC, 0, len(encoded_metadata), 0)) # Rewritten once the clips are in
+            f.write(encoded_metadata)
+            for key, position, length in reused:
+                index.append((key, f.tell(), length))
+                old.copy_clip(position, length, f)
+            rendered = _render_all(todo, temp_dir, rate, voice, workers, f, index, progress)
+            index.sort()
+            index_position = f.tell()
+            f.writelines(INDEX_ENTRY.pack(*entry) for entry in index)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, len(index), len(encoded_metadata), index_position))
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        try: os.remove(filename + ".tmp")
+        except OSError: pass
+        raise
+    finally:
+        if old: old.close() # Before the replace, which Windows refuses while the old file is mapped
+    os.replace(temp_filename, filename)
+    rendered_words = set(rendered)
+    return len(rendered), len(reused), [word for word in todo if word not in rendered_words]
+
+
+def _render_all(words, temp_dir, rate, voice, workers, f, index, progress):
+    """Renders words on a process pool, appending each clip to `f` and its entry to `index`. Returns the words rendered."""
+    if not words: return []
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    batches = [words[i:i + BAKE_BATCH] for i in range(0, len(words), BAKE_BATCH)]
+    rendered, done = [], 0
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_bake_worker, initargs=(rate, voice)) as pool:
+        futures = [pool.submit(_render_batch, batch, temp_dir, AudioCache.CLIP_EXTENSION) for batch in batches]
+        try:
+            for future in as_completed(futures):
+                for word, path in future.result():
+                    position = f.tell()
+                    with open(path, 'rb') as clip: shutil.copyfileobj(clip, f)
+                    os.remove(path)
+                    index.append((clip_key(word), position, f.tell() - position))
+                    rendered.append(word)
+                done += 1
+                if progress: progress(done, len(batches))
+        except BaseException:
+            for future in futures: future.cancel()
+            raise
+    return rendered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render word audio into a memory-mapped pack, so practice needs no speech synthesis.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    bake_parser = subparsers.add_parser("bake", help="render a word list into its audio pack (only new words if the pack exists)")
+    bake_parser.add_argument("list", help="name of the word list")
+    bake_parser.add_argument("--lists", help="word-list file (JSON, .pack or .db) to take the list from; defaults to the built-in lists")
+    bake_parser.add_argument("--output", help="pack file (default: the app's audio pack for the list)")
+    bake_parser.add_argument("--workers", type=int, default=None, help="synthesis processes (default: one per CPU)")
+    bake_parser.add_argument("--rate", type=int, default=DEFAULT_RATE, help=f"speech rate (default {DEFAULT_RATE}, as in the app)")
+    bake_parser.add_argument("--voice", help="voice id (default: the engine's default voice)")
+    info = subparsers.add_parser("info", help="show what an audio pack holds")
+    info.add_argument("pack")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        pack = AudioPack(args.pack)
+        print(f"{pack.clip_count} clips, {os.path.getsize(args.pack) / 2**20:.1f} MB; {json.dumps(pack.metadata, ensure_ascii=False)}")
+        pack.close()
+        return
+    from word_lists import WordListManager
+    manager = WordListManager()
+    if args.lists and not manager.load_from_file(args.lists): raise SystemExit(f"Could not load word lists from {args.lists}")
+    words = manager.get_list(args.list)
+    if words is None: raise SystemExit(f"No list named '{args.list}'. Available: {', '.join(manager.get_available_lists())}")
+    output = args.output or pack_path(args.list)
+    report = lambda done, total: print(f"\rRendered {done}/{total} batches", end="", flush=True)
+    try: rendered, reused, failed = bake(words, output, args.list, args.rate, args.voice, args.workers, report)
+    except RuntimeError as e: raise SystemExit(f"\nError baking audio: {e}")
+    if rendered: print()
+    print(f"Baked {output}: {rendered} words rendered, {reused} reused" + (f", {len(failed)} failed: {', '.join(failed[:10])}" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_MS = 50 # How often finished tasks and progress are checked from the Tk thread
+IO_CHUNK_BYTES = 1 << 20 # Files are read and written a chunk at a time, so progress moves and cancel is noticed
+ENCODE_CHECK_CHUNKS = 4096 # JSON encoder fragments between cancellation checks
+DEFAULT_STALL_MS = 250
+STALL_STACK_FRAMES = 8 # Innermost frames of the main thread printed for a stall
+
+
+class IOCancelled(Exception):
+    """Raised inside a background task once it has been cancelled."""
+
+
+class IOTask:
+    """One operation running on an IOExecutor.
+
+    The worker sets `progress` (a fraction, or None while it is not known)
+    and `status`; the Tk thread reads them. Once `done` is set, `result`
+    holds the return value, or `error` says what went wrong and `cancelled`
+    whether that was a cancellation.
+    """
+
+    def __init__(self, description):
+        self.description = description
+        self.progress = None
+        self.status = ""
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Asks the task to stop at its next check."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        """Raises IOCancelled if the task has been cancelled; called by task functions between chunks."""
+        if self._cancel.is_set(): raise IOCancelled(f"{self.description} cancelled.")
+
+
+class IOExecutor:
+    """Runs file I/O off the Tk main loop and hands results back on it.
+
+    Task functions run one at a time on a single worker thread, which keeps
+    writes to the same file in the order they were submitted. Tk must only
+    be used from its own thread, so completion is delivered by polling with
+    `root.after`: `on_progress(task)` is called at each poll while a task
+    runs, and `on_done(task)` once it has finished, failed or been cancelled.
+    """
+
+    def __init__(self, root, poll_ms=POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-io")
+        self._pending = [] # (task, on_done, on_progress) in submission order
+        self._polling = False
+
+    def submit(self, description, fn, *args, on_done=None, on_progress=None):
+        """Runs fn(task, *args) on the worker thread. Returns the IOTask."""
+        task = IOTask(description)
+        self._pool.submit(self._run, task, fn, args)
+        self._pending.append((task, on_done, on_progress))
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return task
+
+    @staticmethod
+    def _run(task, fn, args):
+        try:
+            task.check() # Cancelled while queued
+            task.result = fn(task, *args)
+        except IOCancelled as e:
+            task.error = str(e)
+        except Exception as e: # Reported through on_done, never lost on the worker thread
+            task.error = str(e) or type(e).__name__
+        finally:
+            task.done.set()
+
+    def _poll(self):
+        finished = [entry for entry in self._pending if entry[0].done.is_set()]
+        self._pending = [entry for entry in self._pending if not entry[0].done.is_set()]
+        for task, on_done, on_progress in self._pending:
+            if on_progress: on_progress(task)
+        for task, on_done, on_progress in finished:
+            if on_done: on_done(task)
+            elif task.error and not task.cancelled: print(f"Error: {task.description} failed: {task.error}")
+        self._polling = bool(self._pending)
+        if self._polling: self.root.after(self.poll_ms, self._poll)
+
+    @property
+    def busy(self):
+        """Whether any submitted task has not been handed back yet."""
+        return bool(self._pending)
+
+    def shutdown(self, wait=True):
+        """Stops accepting tasks; with wait=True, finishes the queued ones first (e.g. saves on exit)."""
+        self._pool.shutdown(wait=wait)
+
+
+# --- Task functions ---
+def write_json(task, filename, data, indent=None, separators=None):
+    """Encodes data and writes it to filename through a temporary file, so a cancelled or failed save leaves the old file."""
+    task.status = "encoding"
+    chunks = []
+    for i, chunk in enumerate(json.JSONEncoder(ensure_ascii=False, indent=indent, separators=separators).iterencode(data)):
+        chunks.append(chunk)
+        if i % ENCODE_CHECK_CHUNKS == 0: task.check()
+    encoded = "".join(chunks).encode('utf-8')
+    del chunks
+    task.status, task.progress = "writing", 0.0
+    directory = os.path.dirname(os.path.abspath(filename))
+    os.makedirs(directory, exist_ok=True)
+    temp_filename = filename + ".tmp"
+    try:
+        with open(temp_filename, 'wb') as f:
+            for start in range(0, len(encoded), IO_CHUNK_BYTES):
+                task.check()
+                f.write(encoded[start:start + IO_CHUNK_BYTES])
+                task.progress = min(1.0, (start + IO_CHUNK_BYTES) / len(encoded))
+        os.replace(temp_filename, filename)
+    except BaseException:
+        try: os.remove(temp_filename)
+        except OSError: pass
+        raise
+    return len(encoded)
+
+
+def read_json(task, filename):
+    """Reads and parses a JSON file, a chunk at a time."""
+    total = os.path.getsize(filename)
+    task.status, task.progress = "reading", 0.0
+    chunks, done = [], 0
+    with open(filename, 'rb') as f:
+        while True:
+            task.check()
+            chunk = f.read(IO_CHUNK_BYTES)
+            if not chunk: break
+            chunks.append(chunk)
+            done += len(chunk)
+            task.progress = done / total if total else 1.0
+    task.status, task.progress = "parsing", None
+    return json.loads(b"".join(chunks).decode('utf-8-sig'))
+
+
+class StallWatchdog:
+    """Logs whenever the Tk main loop stays blocked for longer than `threshold_ms`.
+
+    The main loop bumps a heartbeat with `after`; a daemon thread notices
+    when the heartbeat is late and prints where the main thread is stuck,
+    then a second line with the full stall time once the loop is back.
+    """
+
+    def __init__(self, root, threshold_ms=DEFAULT_STALL_MS):
+        self.root = root
+        self.threshold = threshold_ms / 1000.0
+        self.beat_ms = max(10, threshold_ms // 4)
+        self.stall_count = 0
+        self.longest_stall = 0.0 # Seconds
+        self._last_beat = time.monotonic()
+        self._stalled = False
+        self._main_thread = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = None
+        self._after_id = None
+
+    def start(self):
+        """Starts the heartbeat; must be called from the Tk thread."""
+        self._last_beat = time.monotonic()
+        self._after_id = self.root.after(self.beat_ms, self._beat)
+        self._thread = threading.Thread(target=self._watch, daemon=True, name="stall-watchdog")
+        self._thread.start()
+
+    def stop(self):
+        """Stops the heartbeat and the watching thread."""
+        self._stop.set()
+        if self._after_id:
+            try: self.root.after_cancel(self._after_id)
+            except Exception: pass # The window is already gone
+            self._after_id = None
+
+    def _beat(self):
+        now = time.monotonic()
+        blocked = now - self._last_beat - self.beat_ms / 1000.0
+        if self._stalled:
+            self._stalled = False
+            self.longest_stall = max(self.longest_stall, blocked)
+            print(f"UI stall: main loop was blocked for {blocked * 1000:.0f} ms")
+        self._last_beat = now
+        if not self._stop.is_set(): self._after_id = self.root.after(self.beat_ms, self._beat)
+
+    def _watch(self):
+        while not self._stop.wait(self.beat_ms / 1000.0):
+            blocked = time.monotonic() - self._last_beat - self.beat_ms / 1000.0
+            if blocked <= self.threshold or self._stalled: continue
+            self._stalled = True
+            self.stall_count += 1
+            frame = sys._current_frames().get(self._main_thread)
+            where = "".join(traceback.format_stack(frame)[-STALL_STACK_FRAMES:]) if frame else ""
+            print(f"UI stall: main loop blocked for over {self.threshold * 1000:.0f} ms in:\n{where}", end="")
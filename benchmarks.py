@@ -0,0 +1,315 @@
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from practice_session import PracticeSession
+from word_lists import WordListManager
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+MAX_OPS = 50_000 # Per-operation benchmarks time at most this many calls
+REPEATS = 3 # Whole-file benchmarks run this many times
+RENDER_UPDATES = 2_000
+MAX_LOG_WORDS = 100_000 # Synthetic logs stop here; a million-entry log would take ~0.5 GB to build
+BENCH_LIST = "Benchmark"
+SEED = 1234
+BASELINE_VERSION = 1
+
+
+# --- Synthetic Data ---
+def make_words(n, rng):
+    """Returns n distinct random lowercase words of 4-14 letters."""
+    words = {}
+    letters = string.ascii_lowercase
+    while len(words) < n:
+        words.setdefault("".join(rng.choices(letters, k=rng.randint(4, 14))), None)
+    return list(words)
+
+
+def misspell(word, rng):
+    """Returns a plausible misspelling: two neighbouring letters swapped, or one dropped or doubled."""
+    i = rng.randrange(len(word) - 1)
+    kind = rng.randrange(3)
+    if kind == 0 and word[i] != word[i + 1]: return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if kind == 1: return word[:i] + word[i + 1:]
+    return word[:i] + word[i] + word[i:]
+
+
+def make_log(words, rng):
+    """Returns a misspelled-words log (the saved-log JSON layout) covering the first MAX_LOG_WORDS words."""
+    words = words[:MAX_LOG_WORDS]
+    tracking = {}
+    for word in words:
+        tracking[word] = {'incorrect_attempts': rng.randint(1, 6), 'correct_attempts': rng.randint(0, 3),
+                          'user_attempts': [misspell(word, rng) for _ in range(rng.randint(1, 5))]}
+    return {'saved_misspelled_words': list(words), 'saved_tracking_data': tracking}
+
+
+def make_manager(words):
+    """Returns a WordListManager whose active list is the given words."""
+    manager = WordListManager()
+    manager.add_custom_list(BENCH_LIST, list(words))
+    manager.set_active_list(BENCH_LIST)
+    return manager
+
+
+# --- Measurement ---
+class Probe:
+    """Times the measured section of one benchmark, op by op, and optionally its peak memory."""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.latencies = []
+        self.peak_bytes = None
+
+    def start(self):
+        """Marks the end of setup; only allocations from here on count towards peak memory."""
+        if self.trace_memory: tracemalloc.start()
+
+    def time(self, op, *args):
+        started = time.perf_counter()
+        result = op(*args)
+        self.latencies.append(time.perf_counter() - started)
+        return result
+
+    def stop(self):
+        if self.trace_memory:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+
+def percentile(sorted_values, fraction):
+    """Returns the nearest-rank percentile of already sorted values."""
+    if not sorted_values: return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(latencies, peak_bytes):
+    """Returns throughput, latency percentiles (seconds) and peak memory for one run."""
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    return {'ops': len(ordered), 'ops_per_sec': len(ordered) / total if total else 0.0,
+            'p50': percentile(ordered, 0.50), 'p95': percentile(ordered, 0.95), 'p99': percentile(ordered, 0.99),
+            'max': ordered[-1] if ordered else 0.0, 'peak_bytes': peak_bytes}
+
+
+# --- Benchmarks ---
+# Each takes (fixture, probe): it does its setup, calls probe.start(), times its operations with probe.time and calls probe.stop().
+
+def bench_select(fixture, probe):
+    """PracticeSession.select_next_word over a whole pass (the core of SpellingApp._select_next_random_word)."""
+    session = PracticeSession(make_manager(fixture['words']), rng=random.Random(SEED))
+    session.reset()
+    probe.start()
+    for _ in range(min(len(fixture['words']), MAX_OPS)): probe.time(session.select_next_word)
+    probe.stop()
+
+
+def bench_grade(fixture, probe):
+    """PracticeSession.grade on alternating right and wrong answers (the model side of SpellingApp.check_spelling)."""
+    session = PracticeSession(make_manager(fixture['words']), rng=random.Random(SEED))
+    session.reset()
+    rng = random.Random(SEED)
+    probe.start()
+    for i in range(min(len(fixture['words']), MAX_OPS)):
+        session.select_next_word()
+        word = session.get_current_word()
+        probe.time(session.grade, word if i % 2 else misspell(word, rng))
+    probe.stop()
+
+
+def bench_grade_batch(fixture, probe):
+    """PracticeSession.grade_batch over every word at once, recording the results."""
+    session = PracticeSession(make_manager(()), rng=random.Random(SEED))
+    rng = random.Random(SEED)
+    pairs = [(word, word if i % 2 else misspell(word, rng)) for i, word in enumerate(fixture['words'])]
+    probe.start()
+    for _ in range(REPEATS): probe.time(session.grade_batch, pairs, True)
+    probe.stop()
+
+
+def bench_render(fixture, probe):
+    """SpellingApp.update_misspelled_list_display: a full refresh of the log, then single-entry updates."""
+    import tkinter as tk
+    from log_view import MisspelledLogView
+    try: root = tk.Tk()
+    except tk.TclError as e: raise RuntimeError(f"no display ({e}); run under xvfb-run") from None
+    try:
+        text = tk.Text(root, width=60, height=20, state=tk.DISABLED)
+        scrollbar = tk.Scrollbar(root, command=text.yview)
+        text.pack()
+        view = MisspelledLogView(text, scrollbar)
+        log = fixture['log']
+        words, tracking = log['saved_misspelled_words'], log['saved_tracking_data']
+        rng = random.Random(SEED)
+        root.update()
+        probe.start()
+        for _ in range(REPEATS): probe.time(view.refresh, words, tracking)
+        for _ in range(min(len(words), RENDER_UPDATES)):
+            word = rng.choice(words)
+            tracking[word]['incorrect_attempts'] += 1
+            probe.time(view.update_word, word)
+        probe.stop()
+    finally: root.destroy()
+
+
+def bench_save_lists(fixture, probe):
+    """WordListManager.save_to_file writing the word lists as JSON."""
+    manager = make_manager(fixture['words'])
+    path = os.path.join(fixture['dir'], "lists.json")
+    probe.start()
+    for _ in range(REPEATS): probe.time(manager.save_to_file, path)
+    probe.stop()
+
+
+def bench_load_lists(fixture, probe):
+    """WordListManager.load_from_file reading the word lists from JSON."""
+    path = os.path.join(fixture['dir'], "lists.json")
+    make_manager(fixture['words']).save_to_file(path)
+    manager = WordListManager()
+    probe.start()
+    for _ in range(REPEATS): probe.time(manager.load_from_file, path)
+    probe.stop()
+
+
+def _load_log(session, path):
+    """The file-handling part of SpellingApp.load_misspelled_words, without its dialogs."""
+    with open(path, 'r', encoding='utf-8') as f: loaded_data = json.load(f)
+    return session.load_tracking(loaded_data['saved_misspelled_words'], loaded_data['saved_tracking_data'])
+
+
+def bench_load_log(fixture, probe):
+    """Loading a saved misspelled-words log (SpellingApp.load_misspelled_words)."""
+    path = os.path.join(fixture['dir'], "log.json")
+    with open(path, 'w', encoding='utf-8') as f: json.dump(fixture['log'], f, indent=2, ensure_ascii=False)
+    session = PracticeSession(make_manager(()))
+    probe.start()
+    for _ in range(REPEATS): probe.time(_load_log, session, path)
+    probe.stop()
+
+
+BENCHMARKS = {
+    "select": bench_select,
+    "grade": bench_grade,
+    "grade_batch": bench_grade_batch,
+    "render": bench_render,
+    "save_lists": bench_save_lists,
+    "load_lists": bench_load_lists,
+    "load_log": bench_load_log,
+}
+LOG_BENCHMARKS = {"render", "load_log"} # Benchmarks that need the synthetic misspelled-words log
+
+
+def run(names, sizes, trace_memory=True, progress=None):
+    """Runs the named benchmarks at the given sizes. Returns {'<name>@<size>': summary or {'skipped': reason}}.
+
+    Timings come from a plain run; peak memory from a second run under
+    tracemalloc, which would otherwise slow the timed run down.
+    """
+    results = {}
+    for size in sizes:
+        words = make_words(SIZES[size], random.Random(SEED))
+        fixture = {'words': words, 'log': None}
+        with tempfile.TemporaryDirectory() as directory:
+            fixture['dir'] = directory
+            for name in names:
+                key = f"{name}@{size}"
+                if progress: progress(key)
+                if name in LOG_BENCHMARKS and fixture['log'] is None: fixture['log'] = make_log(words, random.Random(SEED))
+                try:
+                    probe = Probe()
+                    BENCHMARKS[name](fixture, probe)
+                    if trace_memory:
+                        memory_probe = Probe(trace_memory=True)
+                        BENCHMARKS[name](fixture, memory_probe)
+                except RuntimeError as e:
+                    results[key] = {'skipped': str(e)}
+                    continue
+                results[key] = summarize(probe.latencies, memory_probe.peak_bytes if trace_memory else None)
+    return results
+
+
+# --- Reporting ---
+def _format_seconds(seconds):
+    if seconds >= 1: return f"{seconds:.2f} s"
+    if seconds >= 1e-3: return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def format_results(results, baseline=None):
+    """Returns the results as a table, with the change against a baseline where one was given."""
+    lines = [f"{'benchmark':<20} {'ops':>7} {'ops/s':>11} {'p50':>10} {'p95':>10} {'p99':>10} {'peak mem':>10}" + ("  vs baseline" if baseline else "")]
+    for key, result in results.items():
+        if 'skipped' in result:
+            lines.append(f"{key:<20} skipped: {result['skipped']}")
+            continue
+        peak = f"{result['peak_bytes'] / 2**20:.1f} MB" if result['peak_bytes'] is not None else "-"
+        line = (f"{key:<20} {result['ops']:>7} {result['ops_per_sec']:>11.1f} {_format_seconds(result['p50']):>10} "
+                f"{_format_seconds(result['p95']):>10} {_format_seconds(result['p99']):>10} {peak:>10}")
+        old = (baseline or {}).get(key)
+        if old and 'skipped' not in old and old['ops_per_sec']:
+            line += f"  {result['ops_per_sec'] / old['ops_per_sec'] - 1:+.0%} ops/s, p95 {_format_seconds(old['p95'])} -> {_format_seconds(result['p95'])}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def find_regressions(results, baseline, tolerance):
+    """Returns the keys whose throughput fell, or whose p95 latency rose, by more than `tolerance` (a fraction)."""
+    regressions = []
+    for key, result in results.items():
+        old = baseline.get(key)
+        if not old or 'skipped' in old or 'skipped' in result: continue
+        if result['ops_per_sec'] < old['ops_per_sec'] * (1 - tolerance) or result['p95'] > old['p95'] * (1 + tolerance):
+            regressions.append(key)
+    return regressions
+
+
+def save_baseline(results, filename):
+    data = {'version': BASELINE_VERSION, 'python': sys.version.split()[0], 'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'results': results}
+    with open(filename, 'w', encoding='utf-8') as f: json.dump(data, f, indent=2)
+
+
+def load_baseline(filename):
+    with open(filename, 'r', encoding='utf-8') as f: data = json.load(f)
+    if not isinstance(data, dict) or data.get('version') != BASELINE_VERSION: raise ValueError(f"{filename} is not a benchmark baseline.")
+    return data['results']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark word selection, grading, log rendering and persistence on synthetic data.")
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK", help=f"benchmarks to run (default all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--sizes", default="1k,100k,1M", help=f"comma-separated list sizes out of {', '.join(SIZES)} (default all)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass that measures peak memory")
+    parser.add_argument("--save", metavar="FILE", help="save the results as a baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a saved baseline; exits with status 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against the baseline, as a fraction (default 0.2)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown: parser.error(f"unknown benchmark(s) {', '.join(unknown)}; choose from {', '.join(BENCHMARKS)}")
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown: parser.error(f"unknown size(s) {', '.join(unknown)}; choose from {', '.join(SIZES)}")
+    baseline = None
+    if args.baseline:
+        try: baseline = load_baseline(args.baseline)
+        except (OSError, ValueError) as e: parser.error(f"cannot read baseline: {e}")
+
+    results = run(args.benchmarks or list(BENCHMARKS), sizes, trace_memory=not args.no_memory,
+                  progress=lambda key: print(f"Running {key}...", file=sys.stderr))
+    print(format_results(results, baseline))
+    if args.save: save_baseline(results, args.save)
+    if baseline:
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import re
+from bisect import bisect_right
+from itertools import accumulate, repeat
+
+from hints import FEATURE_DOUBLE_LETTER, FEATURE_IE_EI, SUFFIX_FEATURES, SUFFIX_PAIRS, get_hints
+
+# Filter keys offered for "practice only words with ..."; letter filters
+# ("first:a", "last:e") are also accepted and built the first time they are used.
+LENGTH_BUCKETS = {"length:1-4": (1, 4), "length:5-7": (5, 7), "length:8-10": (8, 10), "length:11+": (11, None)}
+FEATURE_FILTERS = {
+    "double": "Double letters",
+    "ie_ei": "'ie' / 'ei'",
+    **{f"suffix:{s1}": f"-{s1} / -{s2}" for s1, s2 in SUFFIX_PAIRS.items()},
+    **{key: f"{key[7:]} letters" for key in LENGTH_BUCKETS},
+}
+
+# Patterns run over a whole list at once, joined with newlines; they mirror the checks in hints.py
+_DOUBLE_LETTER = re.compile(r"(.)\1") # Matches are kept only for letters; scanning with a letter class is ~3x slower
+_IE_EI = re.compile("ie|ei")
+_SUFFIX = re.compile("(" + "|".join(s for pair in SUFFIX_PAIRS.items() for s in pair) + ")\n")
+_SUFFIX_BITS = {s: SUFFIX_FEATURES[s1] for s1, s2 in SUFFIX_PAIRS.items() for s in (s1, s2)}
+_BIT_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _bitset(flags):
+    """Packs bytes of 0/1 flags into an int whose bit i is flags[i]."""
+    if not flags: return 0
+    return int(bytes(flags)[::-1].translate(_BIT_CHARS), 2)
+
+
+def _bitset_where(values, test):
+    """Packs bytes into an int whose bit i is set when test(values[i]) holds; one table lookup per byte."""
+    if not values: return 0
+    table = bytes(0x31 if test(v) else 0x30 for v in range(256))
+    return int(values[::-1].translate(table), 2)
+
+
+def _bits_to_slots(bits, offset=0):
+    """Returns the positions of the set bits, plus `offset`, in ascending order."""
+    if not bits: return []
+    return [m.start() + offset for m in re.finditer("1", bin(bits)[:1:-1])]
+
+
+class FeatureIndex:
+    """Hint features of every word in an IndexedWordList, built once per list.
+
+    Each word's hint features are kept as a small bit mask per slot, so hints
+    are a lookup, and each filter key (see FEATURE_FILTERS) is kept as a
+    bitset over slots (an int with bit i set when slot i matches), so filters
+    are combined with a single AND however long the list is. The index is
+    kept in step with in-place edits through `add`, `remove` and `compact`.
+    """
+
+    def __init__(self, word_list):
+        self.word_list = word_list
+        self.rebuild()
+
+    def rebuild(self):
+        """Recomputes every feature from the list's current slots."""
+        self.masks = bytearray() # Feature bits per slot; hints.py defines fewer than eight
+        self._bitsets = dict.fromkeys(FEATURE_FILTERS, 0)
+        self._append(self.word_list.slot_words(), 0)
+
+    def _append(self, words, offset):
+        """Indexes words occupying slots offset..offset+len(words)-1."""
+        lowered = [w.lower() if w else "" for w in words]
+        text = "\n".join(lowered) + "\n"
+        lengths = list(map(len, lowered))
+        ends = list(accumulate(map((1).__add__, lengths))) # Text position just past each word
+        masks = bytearray(len(lowered))
+        for m in _DOUBLE_LETTER.finditer(text):
+            if m.group(1).isalpha(): masks[bisect_right(ends, m.start())] |= FEATURE_DOUBLE_LETTER
+        for m in _IE_EI.finditer(text): masks[bisect_right(ends, m.start())] |= FEATURE_IE_EI
+        for m in _SUFFIX.finditer(text): masks[bisect_right(ends, m.start())] |= _SUFFIX_BITS[m.group(1)]
+        self.masks.extend(masks)
+
+        masks = bytes(masks)
+        lengths = bytes(map(min, [len(w) if w else 0 for w in words], repeat(255))) # Lowering can change a word's length
+        self._bitsets["double"] |= _bitset_where(masks, lambda m: m & FEATURE_DOUBLE_LETTER) << offset
+        self._bitsets["ie_ei"] |= _bitset_where(masks, lambda m: m & FEATURE_IE_EI) << offset
+        for s1, bit in SUFFIX_FEATURES.items():
+            self._bitsets[f"suffix:{s1}"] |= _bitset_where(masks, lambda m: m & bit) << offset
+        for key, (low, high) in LENGTH_BUCKETS.items():
+            self._bitsets[key] |= _bitset_where(lengths, lambda n: low <= n and (high is None or n <= high)) << offset
+        for key in [k for k in self._bitsets if k not in FEATURE_FILTERS]: # Letter filters are rebuilt on demand
+            del self._bitsets[key]
+
+    # --- Edits ---
+    def add(self, slots):
+        """Indexes newly appended slots."""
+        if not slots: return
+        first = min(slots)
+        if first != len(self.masks): return self.rebuild() # Not a plain append
+        self._append([self.word_list[slot] for slot in range(first, self.word_list.slot_count)], first)
+
+    def remove(self, slots):
+        """Clears the features of tombstoned slots."""
+        if not slots: return
+        removed = bytearray(len(self.masks))
+        for slot in slots:
+            removed[slot] = 1
+            self.masks[slot] = 0
+        keep = ~_bitset(removed)
+        for key in self._bitsets: self._bitsets[key] &= keep
+
+    def compact(self, mapping):
+        """Follows a compaction of the list; renumbering every slot costs the same as a rebuild."""
+        self.rebuild()
+
+    # --- Lookups ---
+    def features(self, slot):
+        """Returns the hint feature bits of the word in a slot."""
+        return self.masks[slot]
+
+    def hints(self, slot):
+        """Returns the hints for the word in a slot without re-examining the word."""
+        return get_hints(self.word_list[slot], self.masks[slot])
+
+    def bitset(self, key):
+        """Returns the bitset of slots matching a filter key, building letter filters on first use."""
+        bits = self._bitsets.get(key)
+        if bits is not None: return bits
+        position, _, letter = key.partition(":")
+        if position not in ("first", "last") or len(letter) != 1 or not letter.isalpha(): raise KeyError(key)
+        words = self.word_list.slot_words()
+        ends = "".join([(w[:1] if position == "first" else w[-1:]) if w else " " for w in words]) # One character per slot
+        flags = re.sub("[^0]", "1", re.sub(f"[^{re.escape(letter)}]", "0", ends, flags=re.IGNORECASE))
+        bits = int(flags[::-1] or "0", 2)
+        self._bitsets[key] = bits
+        return bits
+
+    def matching(self, *keys):
+        """Returns the bitset of slots matching every given filter key."""
+        bits = self.bitset(keys[0]) if keys else _bitset(bytes(w is not None for w in self.word_list.slot_words()))
+        for key in keys[1:]: bits &= self.bitset(key)
+        return bits
+
+    def slots_matching(self, *keys):
+        """Returns the slots matching every given filter key, in slot order."""
+        return _bits_to_slots(self.matching(*keys))
+
+    def filter_slots(self, slots, *keys):
+        """Returns the given slots that match every filter key."""
+        if not slots: return []
+        first = min(slots)
+        matched = set(_bits_to_slots(self.matching(*keys) >> first, first))
+        return [slot for slot in slots if slot in matched]
+
+    def count(self, *keys):
+        """Returns how many words match every given filter key."""
+        return bin(self.matching(*keys)).count("1")
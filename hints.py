@@ -0,0 +1,55 @@
+import random
+
+# Commonly confused endings; each pair is checked in both directions.
+SUFFIX_PAIRS = {"tion":"sion", "able":"ible", "ance":"ence", "ary":"ery", "ify":"efy"}
+GENERIC_TIPS = ["Silent letters?", "Homophones?", "Syllables?", "Root/Prefix/Suffix?"]
+
+# Feature bits, as stored per word by the feature index
+FEATURE_DOUBLE_LETTER = 1
+FEATURE_IE_EI = 2
+SUFFIX_FEATURES = {s1: 4 << i for i, s1 in enumerate(SUFFIX_PAIRS)} # Keyed by the pair's first suffix
+
+
+def has_double_letter(word):
+    """Checks for two identical adjacent letters."""
+    w_lower = word.lower()
+    return any(w_lower[i] == w_lower[i+1] and w_lower[i].isalpha() for i in range(len(w_lower)-1))
+
+
+def has_ie_ei(word):
+    """Checks for an 'ie' or 'ei' vowel pair."""
+    w_lower = word.lower()
+    return 'ie' in w_lower or 'ei' in w_lower
+
+
+def find_suffix_pair(word):
+    """Returns the (suffix, confusable suffix) pair the word ends with, or None."""
+    w_lower = word.lower()
+    for s1, s2 in SUFFIX_PAIRS.items():
+        if w_lower.endswith(s1) or w_lower.endswith(s2):
+            return s1, s2
+    return None
+
+
+def word_features(word):
+    """Returns the feature bits of a word."""
+    features = 0
+    if has_double_letter(word): features |= FEATURE_DOUBLE_LETTER
+    if has_ie_ei(word): features |= FEATURE_IE_EI
+    suffix_pair = find_suffix_pair(word)
+    if suffix_pair: features |= SUFFIX_FEATURES[suffix_pair[0]]
+    return features
+
+
+def get_hints(word, features=None):
+    """Returns every hint that applies to a word; pass precomputed `features` to skip the checks."""
+    if features is None: features = word_features(word)
+    hints = []
+    if features & FEATURE_DOUBLE_LETTER: hints.append("Watch for double letters.")
+    if features & FEATURE_IE_EI: hints.append("Check the 'i' before 'e' rule.")
+    for s1, s2 in SUFFIX_PAIRS.items():
+        if features & SUFFIX_FEATURES[s1]: hints.append(f"Ending: '-{s1}' or '-{s2}'?")
+    if not hints: hints.append(f"{len(word)} letters.")
+    if len(hints) < 2 and len(word) > 1: hints.append(f"Starts '{word[0]}', ends '{word[-1]}'.")
+    if not hints: hints.append(f"Tip: {random.choice(GENERIC_TIPS)}")
+    return hints
@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+from array import array
+from collections import Counter
+
+from misspelling_analysis import classify_error
+
+try:
+    import numpy as np
+except ImportError: # Aggregation works without it; only .npz output needs it
+    np = None
+
+CHUNKS_PER_WORKER = 4 # Smaller chunks even out the work when log sizes vary
+TOP_ATTEMPTS = 3
+
+
+def _aggregate_logs(paths):
+    """Merges a chunk of saved logs. Returns ({word: [learners, incorrect, correct]}, Counter of (word, attempt), logs read, skipped paths)."""
+    totals, attempts, read, skipped = {}, Counter(), 0, []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f: loaded_data = json.load(f)
+            tracking = loaded_data.get('saved_tracking_data') if isinstance(loaded_data, dict) else None
+            if not isinstance(tracking, dict): raise ValueError("not a misspelled-words log")
+            missed = loaded_data.get('saved_misspelled_words') or []
+            if not isinstance(missed, list): raise ValueError("saved_misspelled_words is not a list")
+        except (OSError, ValueError) as e:
+            skipped.append(f"{path}: {e}")
+            continue
+        read += 1
+        for word, info in tracking.items():
+            if not isinstance(info, dict): continue
+            row = totals.get(word)
+            if row is None: row = totals[word] = [0, 0, 0]
+            row[0] += 1
+            row[1] += _count(info.get('incorrect_attempts'))
+            row[2] += _count(info.get('correct_attempts'))
+            user_attempts = info.get('user_attempts')
+            if isinstance(user_attempts, list):
+                for attempt in set(map(str, user_attempts)): attempts[word, attempt] += 1 # Learners who tried this spelling
+        for word in missed: # Missed, but saved before any attempts were tracked
+            if isinstance(word, str) and word not in tracking:
+                row = totals.get(word)
+                if row is None: row = totals[word] = [0, 0, 0]
+                row[0] += 1
+    return totals, attempts, read, skipped
+
+
+def _count(value):
+    return value if isinstance(value, int) and value > 0 else 0
+
+
+class LogStats:
+    """Per-word difficulty statistics merged from many saved misspelled-word logs.
+
+    Columns are parallel arrays indexed like `words` (sorted): how many logs
+    (learners) tracked the word, and their summed incorrect and correct
+    attempts. Misspellings are kept as (word index, attempt, learners) rows.
+    """
+
+    def __init__(self, words, learners, incorrect, correct, attempt_words, attempt_texts, attempt_counts, log_count):
+        self.words = words
+        self.learners = learners
+        self.incorrect = incorrect
+        self.correct = correct
+        self.attempt_words = attempt_words
+        self.attempt_texts = attempt_texts
+        self.attempt_counts = attempt_counts
+        self.log_count = log_count
+        self.skipped = [] # "path: reason" for logs that could not be read
+
+    def __len__(self):
+        return len(self.words)
+
+    def miss_rate(self, i):
+        """Share of attempts at word i that were wrong, smoothed so a single attempt is not 0% or 100%."""
+        return (self.incorrect[i] + 1) / (self.incorrect[i] + self.correct[i] + 2)
+
+    def difficulty(self, i):
+        """How hard word i is across the class: its smoothed miss rate, weighted by the share of learners who struggled with it."""
+        return self.miss_rate(i) * self.learners[i] / self.log_count if self.log_count else 0.0
+
+    def ranked(self):
+        """Returns word indexes, hardest first."""
+        return sorted(range(len(self.words)), key=lambda i: (-self.difficulty(i), self.words[i]))
+
+    def common_attempts(self, i, limit=TOP_ATTEMPTS):
+        """Returns the most common (attempt, learners) misspellings of word i."""
+        if not hasattr(self, '_attempt_rows'):
+            self._attempt_rows = {}
+            for row, word_index in enumerate(self.attempt_words): self._attempt_rows.setdefault(word_index, []).append(row)
+        rows = sorted(self._attempt_rows.get(i, ()), key=lambda row: (-self.attempt_counts[row], self.attempt_texts[row]))
+        return [(self.attempt_texts[row], self.attempt_counts[row]) for row in rows[:limit]]
+
+    # --- Persistence ---
+    def save_npz(self, filename):
+        """Writes the tables as a compressed NumPy archive."""
+        if np is None: raise RuntimeError("NumPy is required to write .npz files.")
+        np.savez_compressed(filename, words=np.array(self.words, dtype=str), learners=np.asarray(self.learners, dtype=np.int64),
+                            incorrect=np.asarray(self.incorrect, dtype=np.int64), correct=np.asarray(self.correct, dtype=np.int64),
+                            attempt_words=np.asarray(self.attempt_words, dtype=np.int64), attempt_texts=np.array(self.attempt_texts, dtype=str),
+                            attempt_counts=np.asarray(self.attempt_counts, dtype=np.int64), log_count=np.int64(self.log_count))
+
+    @classmethod
+    def load_npz(cls, filename):
+        """Reads tables written by `save_npz`."""
+        if np is None: raise RuntimeError("NumPy is required to read .npz files.")
+        with np.load(filename) as data:
+            return cls(data['words'].tolist(), array('q', data['learners'].tolist()), array('q', data['incorrect'].tolist()),
+                       array('q', data['correct'].tolist()), array('q', data['attempt_words'].tolist()), data['attempt_texts'].tolist(),
+                       array('q', data['attempt_counts'].tolist()), int(data['log_count']))
+
+    def report(self, limit=50):
+        """Returns the hardest words as printable text."""
+        lines = [f"{len(self.words)} words from {self.log_count} logs" + (f" ({len(self.skipped)} unreadable logs skipped)" if self.skipped else ""),
+                 f"{'rank':>4}  {'word':<20} {'learners':>8} {'wrong':>7} {'right':>7} {'miss %':>7} {'difficulty':>10}  common misspellings"]
+        for rank, i in enumerate(self.ranked()[:limit], 1):
+            attempts = self.common_attempts(i)
+            kind = f" [{classify_error(self.words[i], attempts[0][0])}]" if attempts else ""
+            spelled = ", ".join(f"{text} ({count})" for text, count in attempts)
+            lines.append(f"{rank:>4}  {self.words[i]:<20} {self.learners[i]:>8} {self.incorrect[i]:>7} {self.correct[i]:>7} "
+                         f"{self.miss_rate(i) * 100:>6.1f}% {self.difficulty(i):>10.3f}  {spelled}{kind}")
+        return "\n".join(lines)
+
+
+def aggregate_logs(paths, workers=None):
+    """Merges many saved logs into a LogStats, parsing them on a process pool.
+
+    Each worker parses and merges a chunk of logs on its own, so the only
+    serial work is combining one partial table per chunk.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    chunk_count = min(len(paths), workers * CHUNKS_PER_WORKER) or 1
+    chunks = [paths[i::chunk_count] for i in range(chunk_count)]
+    if workers == 1 or len(chunks) == 1:
+        partials = map(_aggregate_logs, chunks)
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        partials = pool.map(_aggregate_logs, chunks)
+    totals, attempts, log_count, skipped = {}, Counter(), 0, []
+    try:
+        for chunk_totals, chunk_attempts, read, chunk_skipped in partials:
+            for word, (learners, incorrect, correct) in chunk_totals.items():
+                row = totals.get(word)
+                if row is None: totals[word] = [learners, incorrect, correct]
+                else:
+                    row[0] += learners
+                    row[1] += incorrect
+                    row[2] += correct
+            attempts.update(chunk_attempts)
+            log_count += read
+            skipped += chunk_skipped
+    finally:
+        if workers != 1 and len(chunks) != 1: pool.shutdown()
+
+    words = sorted(totals)
+    position = {word: i for i, word in enumerate(words)}
+    columns = list(zip(*(totals[word] for word in words))) or [(), (), ()]
+    attempt_rows = sorted((position[word], attempt, count) for (word, attempt), count in attempts.items())
+    stats = LogStats(words, array('q', columns[0]), array('q', columns[1]), array('q', columns[2]),
+                     array('q', (row[0] for row in attempt_rows)), [row[1] for row in attempt_rows],
+                     array('q', (row[2] for row in attempt_rows)), log_count)
+    stats.skipped = skipped
+    return stats
+
+
+def _expand_paths(paths):
+    """Replaces directories with the .json files inside them."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                yield from (os.path.join(root, name) for name in sorted(files) if name.endswith(".json"))
+        else: yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge many saved misspelled-word logs into per-word difficulty statistics.")
+    parser.add_argument("logs", nargs="+", help="JSON logs written by 'Save Misspelled', or directories of them")
+    parser.add_argument("--workers", type=int, default=None, help="parsing processes (default: one per CPU)")
+    parser.add_argument("--output", metavar="FILE", help="write the merged tables to a .npz file (needs NumPy)")
+    parser.add_argument("--top", type=int, default=50, help="number of words in the ranked report (default 50)")
+    args = parser.parse_args()
+
+    if args.output and np is None: parser.error("--output needs NumPy, which is not installed")
+    stats = aggregate_logs(_expand_paths(args.logs), args.workers)
+    for reason in stats.skipped: print(f"Skipping {reason}")
+    print(stats.report(args.top))
+    if args.output:
+        stats.save_npz(args.output)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import tkinter as tk
+from tkinter import font
+
+
+class MisspelledLogView:
+    """Renders the misspelled-words log into a Text widget, redrawing only what changed.
+
+    Every entry is a tagged range ("entry<position>"), so a changed word is
+    rewritten in place. Logs longer than VIRTUAL_THRESHOLD switch to a
+    virtual mode that only renders the rows currently in view and drives the
+    scrollbar itself, keeping the per-answer cost constant.
+    """
+
+    VIRTUAL_THRESHOLD = 1000
+    SCROLL_UNITS = 3 # Entries moved per mouse-wheel step in virtual mode
+    EMPTY_MESSAGE = "No words misspelled yet."
+
+    def __init__(self, text, scrollbar):
+        self.text = text
+        self.scrollbar = scrollbar
+        self.words = []
+        self.tracking = {}
+        self._positions = {} # Word -> position in self.words
+        self._virtual = False
+        self._first = 0 # First entry rendered in virtual mode
+        self._rendered_tags = []
+        self._connect_native_scrolling()
+        self.text.bind("<MouseWheel>", lambda e: self._on_wheel(-1 if e.delta > 0 else 1))
+        self.text.bind("<Button-4>", lambda e: self._on_wheel(-1))
+        self.text.bind("<Button-5>", lambda e: self._on_wheel(1))
+        self.text.bind("<Configure>", lambda e: self._render_window() if self._virtual else None, add="+")
+
+    @staticmethod
+    def format_entry(word, info):
+        """Formats one log entry: the word, its counts, its last 3 attempts and the real words they were mistaken for."""
+        inc = info.get('incorrect_attempts', 0)
+        cor = info.get('correct_attempts', 0)
+        atts = info.get('user_attempts', [])[-3:] # Last 3 attempts
+        entry = f"• {word} (Inc: {inc}, Cor: {cor})"
+        if atts: entry += f"\n   Attempts: {', '.join([f'{a}' for a in atts])}"
+        if atts and info.get('confused_with'): entry += f" (other words: {', '.join(info['confused_with'])})" # Same line, so entries keep their height
+        return entry
+
+    def refresh(self, words, tracking):
+        """Redraws the whole log from the given word list and tracking dict."""
+        self.words, self.tracking = words, tracking
+        self._positions = {word: i for i, word in enumerate(words)}
+        self._set_virtual(len(words) > self.VIRTUAL_THRESHOLD)
+        if self._virtual: self._render_window()
+        else: self._render_all()
+
+    def update_word(self, word):
+        """Redraws the entry for one word, appending it if it is new to the log."""
+        position = self._positions.get(word)
+        if position is None:
+            position = len(self._positions)
+            if position >= len(self.words) or self.words[position] != word: # Not a plain append
+                return self.refresh(self.words, self.tracking)
+            self._positions[word] = position
+            if not self._virtual and len(self.words) > self.VIRTUAL_THRESHOLD:
+                return self.refresh(self.words, self.tracking)
+            if not self._virtual: self._append_entry(position, word)
+            elif position < self._first + self._visible_rows(): self._render_window()
+            else: self._update_scrollbar()
+            return
+        self._replace_entry(position, word)
+
+    # --- Rendering ---
+    def _edit(self, action):
+        """Runs an edit with the (normally read-only) widget temporarily enabled."""
+        try:
+            self.text.config(state=tk.NORMAL)
+            action()
+            self.text.config(state=tk.DISABLED)
+        except tk.TclError as e: print(f"Error updating misspelled list: {e}")
+
+    def _entry_args(self, start, stop):
+        """Builds Text.insert arguments for entries start..stop-1, each under its own tag."""
+        args = []
+        for position in range(start, stop):
+            word = self.words[position]
+            tag = f"entry{position}"
+            if position > start: args += ["\n", ()]
+            args += [self.format_entry(word, self.tracking.get(word, {})), (tag,)]
+            self._rendered_tags.append(tag)
+        return args
+
+    def _clear(self):
+        self.text.delete("1.0", tk.END)
+        if self._rendered_tags: self.text.tag_delete(*self._rendered_tags) # Keeps Tk's tag table small
+        self._rendered_tags = []
+
+    def _render_all(self):
+        def action():
+            last_pos = self.text.yview()
+            self._clear()
+            if not self.words: self.text.insert(tk.END, self.EMPTY_MESSAGE)
+            else: self.text.insert(tk.END, *self._entry_args(0, len(self.words)))
+            self.text.yview_moveto(last_pos[0])
+        self._edit(action)
+
+    def _append_entry(self, position, word):
+        def action():
+            if position == 0: self.text.delete("1.0", tk.END) # Drop the empty-log message
+            else: self.text.insert(tk.END, "\n")
+            self.text.insert(tk.END, *self._entry_args(position, position + 1))
+        self._edit(action)
+
+    def _replace_entry(self, position, word):
+        tag = f"entry{position}"
+        ranges = self.text.tag_ranges(tag)
+        if not ranges: return # Not rendered (outside the virtual window)
+        def action():
+            start = self.text.index(ranges[0])
+            self.text.delete(start, ranges[1])
+            self.text.insert(start, self.format_entry(word, self.tracking.get(word, {})), (tag,))
+        self._edit(action)
+
+    # --- Virtual Mode ---
+    def _connect_native_scrolling(self):
+        self.scrollbar.config(command=self.text.yview)
+        self.text.config(yscrollcommand=self.scrollbar.set)
+
+    def _set_virtual(self, virtual):
+        if virtual == self._virtual: return
+        self._virtual = virtual
+        self._first = 0
+        if virtual:
+            self.scrollbar.config(command=self._on_scrollbar)
+            self.text.config(yscrollcommand="")
+        else:
+            self._connect_native_scrolling()
+
+    def _visible_rows(self):
+        """Entries that fit in the widget (each takes at most two lines)."""
+        try:
+            line_height = max(1, font.nametofont(self.text.cget("font")).metrics("linespace"))
+            lines = self.text.winfo_height() // line_height
+        except (tk.TclError, AttributeError):
+            lines = int(self.text.cget("height"))
+        return max(1, lines)
+
+    def _render_window(self):
+        rows = self._visible_rows()
+        self._first = max(0, min(self._first, len(self.words) - rows))
+        stop = min(len(self.words), self._first + rows)
+        def action():
+            self._clear()
+            self.text.insert(tk.END, *self._entry_args(self._first, stop))
+        self._edit(action)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = max(1, len(self.words))
+        self.scrollbar.set(self._first / total, min(1.0, (self._first + self._visible_rows()) / total))
+
+    def _scroll_to(self, first):
+        first = max(0, min(int(first), len(self.words) - self._visible_rows()))
+        if first != self._first:
+            self._first = first
+            self._render_window()
+
+    def _on_scrollbar(self, command, *args):
+        """Scrollbar callback in virtual mode: 'moveto <fraction>' or 'scroll <n> units|pages'."""
+        if command == "moveto":
+            self._scroll_to(float(args[0]) * len(self.words))
+        elif command == "scroll":
+            step = self._visible_rows() if args[1] == "pages" else 1
+            self._scroll_to(self._first + int(args[0]) * step)
+
+    def _on_wheel(self, direction):
+        if not self._virtual: return None # Native scrolling
+        self._scroll_to(self._first + direction * self.SCROLL_UNITS)
+        return "break"
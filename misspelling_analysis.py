@@ -0,0 +1,173 @@
+import argparse
+import json
+from collections import Counter
+
+from hints import SUFFIX_PAIRS
+
+try:
+    import numpy as np
+except ImportError: # Batched distances fall back to the pure-Python DP
+    np = None
+
+# Error types reported by classify_error, most specific first.
+ERROR_TYPES = ["correct", "empty", "ie_ei_swap", "transposition", "dropped_double", "doubled_letter",
+               "suffix_confusion", "missing_letter", "extra_letter", "substitution", "other"]
+BATCH_CHUNK_SIZE = 8192
+
+
+def damerau_levenshtein(a, b):
+    """Edit distance with insertions, deletions, substitutions and adjacent transpositions (optimal string alignment)."""
+    if a == b: return 0
+    if not a: return len(b)
+    if not b: return len(a)
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i-1] == b[j-1] else 1
+            best = min(previous[j] + 1, current[j-1] + 1, previous[j-1] + cost)
+            if i > 1 and j > 1 and a[i-1] == b[j-2] and a[i-2] == b[j-1]:
+                best = min(best, previous_previous[j-2] + 1)
+            current[j] = best
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def _encode(strings, width, pad):
+    """Packs strings into a (len(strings), width) array of code points, padded with `pad`."""
+    codes = np.full((len(strings), width), pad, dtype=np.int32)
+    for row, text in enumerate(strings):
+        if text: codes[row, :len(text)] = [ord(c) for c in text]
+    return codes
+
+
+def _batch_distances_numpy(words, attempts):
+    """Runs the optimal-string-alignment DP for a whole chunk at once, one cell per step across every pair."""
+    count = len(words)
+    len_a = np.fromiter((len(w) for w in words), dtype=np.int32, count=count)
+    len_b = np.fromiter((len(a) for a in attempts), dtype=np.int32, count=count)
+    width_a, width_b = int(len_a.max(initial=0)), int(len_b.max(initial=0))
+    a = _encode(words, width_a, -1)
+    b = _encode(attempts, width_b, -2) # Different pads so padding never matches
+    result = len_b.copy() # Distance when the word is empty
+    columns = np.arange(width_b + 1, dtype=np.int32)
+    previous_previous = None
+    previous = np.broadcast_to(columns, (count, width_b + 1)).copy()
+    for i in range(1, width_a + 1):
+        current = np.empty_like(previous)
+        current[:, 0] = i
+        a_char = a[:, i-1]
+        for j in range(1, width_b + 1):
+            cost = (a_char != b[:, j-1]).astype(np.int32)
+            best = np.minimum(np.minimum(previous[:, j] + 1, current[:, j-1] + 1), previous[:, j-1] + cost)
+            if i > 1 and j > 1:
+                swapped = (a_char == b[:, j-2]) & (a[:, i-2] == b[:, j-1])
+                best = np.where(swapped, np.minimum(best, previous_previous[:, j-2] + 1), best)
+            current[:, j] = best
+        finished = len_a == i
+        result[finished] = current[finished, len_b[finished]]
+        previous_previous, previous = previous, current
+    return result.tolist()
+
+
+def batch_distances(words, attempts):
+    """Returns the Damerau-Levenshtein distance for each (word, attempt) pair, vectorized with NumPy when available.
+
+    Pairs are sorted by length and processed in chunks so short words are not
+    padded out to the longest word in the batch.
+    """
+    if len(words) != len(attempts): raise ValueError("words and attempts must have the same length")
+    if np is None:
+        return [damerau_levenshtein(w, a) for w, a in zip(words, attempts)]
+    order = sorted(range(len(words)), key=lambda k: (len(words[k]), len(attempts[k])))
+    distances = [0] * len(words)
+    for start in range(0, len(order), BATCH_CHUNK_SIZE):
+        chunk = order[start:start + BATCH_CHUNK_SIZE]
+        chunk_distances = _batch_distances_numpy([words[k] for k in chunk], [attempts[k] for k in chunk])
+        for k, distance in zip(chunk, chunk_distances):
+            distances[k] = distance
+    return distances
+
+
+def _single_edit(longer, shorter):
+    """Returns the index of the one character deleted from `longer` to give `shorter`, or -1."""
+    if len(longer) != len(shorter) + 1: return -1
+    i = 0
+    while i < len(shorter) and longer[i] == shorter[i]: i += 1
+    return i if longer[i+1:] == shorter[i:] else -1
+
+
+def classify_error(word, attempt, distance=None):
+    """Names the kind of misspelling `attempt` is for `word`; see ERROR_TYPES."""
+    w, a = word.lower(), attempt.strip().lower()
+    if w == a: return "correct"
+    if not a: return "empty"
+
+    if len(w) == len(a):
+        diff = [i for i in range(len(w)) if w[i] != a[i]]
+        if len(diff) == 2 and diff[1] == diff[0] + 1 and w[diff[0]] == a[diff[1]] and w[diff[1]] == a[diff[0]]:
+            return "ie_ei_swap" if w[diff[0]:diff[1]+1] in ("ie", "ei") else "transposition"
+
+    dropped = _single_edit(w, a)
+    if dropped != -1:
+        neighbors = w[dropped-1:dropped] + w[dropped+1:dropped+2]
+        return "dropped_double" if w[dropped] in neighbors else "missing_letter"
+    added = _single_edit(a, w)
+    if added != -1:
+        neighbors = a[added-1:added] + a[added+1:added+2]
+        return "doubled_letter" if a[added] in neighbors else "extra_letter"
+
+    for s1, s2 in SUFFIX_PAIRS.items():
+        for correct_suffix, wrong_suffix in ((s1, s2), (s2, s1)):
+            if w.endswith(correct_suffix) and a.endswith(wrong_suffix) and w[:-len(correct_suffix)] == a[:-len(wrong_suffix)]:
+                return "suffix_confusion"
+
+    if distance is None: distance = damerau_levenshtein(w, a)
+    return "substitution" if distance == 1 else "other"
+
+
+def analyze_attempts(pairs):
+    """Returns (distance, error_type) for every (word, attempt) pair, computing distances in one batch."""
+    if not pairs: return []
+    words = [w.lower() for w, _ in pairs]
+    attempts = [a.strip().lower() for _, a in pairs]
+    distances = batch_distances(words, attempts)
+    return [(d, classify_error(w, a, d)) for w, a, d in zip(words, attempts, distances)]
+
+
+def summarize_attempts(pairs):
+    """Counts error types over a batch of (word, attempt) pairs."""
+    return Counter(error_type for _, error_type in analyze_attempts(pairs))
+
+
+def pairs_from_saved_log(file_path):
+    """Reads (word, attempt) pairs from a log written by 'Save Misspelled'."""
+    with open(file_path, 'r', encoding='utf-8') as f: loaded_data = json.load(f)
+    tracking = loaded_data.get('saved_tracking_data', {}) if isinstance(loaded_data, dict) else {}
+    pairs = []
+    for word, info in tracking.items():
+        for attempt in info.get('user_attempts', []):
+            pairs.append((word, "" if attempt == "(empty)" else str(attempt)))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify misspellings recorded in saved misspelled-word logs.")
+    parser.add_argument("logs", nargs="+", help="JSON logs written by 'Save Misspelled'")
+    args = parser.parse_args()
+
+    pairs = []
+    for file_path in args.logs:
+        try: pairs.extend(pairs_from_saved_log(file_path))
+        except (OSError, ValueError) as e: print(f"Skipping {file_path}: {e}")
+    results = analyze_attempts(pairs)
+    counts = Counter(error_type for _, error_type in results)
+    print(f"Analyzed {len(results)} attempts from {len(args.logs)} log(s).")
+    for error_type in ERROR_TYPES:
+        if counts[error_type]: print(f"  {error_type:<18} {counts[error_type]}")
+    if results: print(f"  Mean edit distance: {sum(d for d, _ in results) / len(results):.2f}")
+
+
+if __name__ == "__main__":
+    main()
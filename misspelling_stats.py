@@ -0,0 +1,138 @@
+import sys
+from array import array
+
+MAX_ATTEMPTS = 5
+
+
+def _count(value):
+    return value if isinstance(value, int) and value > 0 else 0
+
+
+class MisspellingStats:
+    """Per-word misspelling counters for every missed word, stored in slots.
+
+    Each tracked word gets an id, its position in `words` (the order the
+    words were first missed). Incorrect and correct counts are array
+    columns indexed by id. The last `max_attempts` distinct attempts of
+    each word live in one flat list of fixed-size ring buffers, and the
+    rare real words an attempt was confused with sit in a sparse dict.
+    Membership and updates are O(1), and a word costs a small fraction
+    of a dict of dicts. It reads like the saved log's {word: entry} dict
+    (`in`, `len`, iteration, `get`, `items`); entries are built on demand,
+    so change counts through the methods, never through an entry.
+    """
+
+    def __init__(self, max_attempts=MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+        self.words = [] # Id -> word
+        self._ids = {} # Word -> id
+        self.incorrect = array('I')
+        self.correct = array('I')
+        self._attempts = [] # max_attempts slots per id; the ring of id i starts at i * max_attempts
+        self._attempt_start = array('B') # Ring position of each id's oldest attempt
+        self._attempt_count = array('B')
+        self._confused_with = {} # Id -> real words its attempts were mistaken for
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self._ids
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def id_of(self, word):
+        """Returns a word's id, or -1 if it is not tracked."""
+        return self._ids.get(word, -1)
+
+    def add(self, word):
+        """Starts tracking a word with zero counts, if it is not tracked yet. Returns its id."""
+        word_id = self._ids.get(word)
+        if word_id is not None: return word_id
+        word = sys.intern(word)
+        word_id = self._ids[word] = len(self.words)
+        self.words.append(word)
+        self.incorrect.append(0)
+        self.correct.append(0)
+        self._attempts.extend([None] * self.max_attempts)
+        self._attempt_start.append(0)
+        self._attempt_count.append(0)
+        return word_id
+
+    # --- Updates ---
+    def record_incorrect(self, word, attempt, confused_with=()):
+        """Counts a wrong attempt, tracking the word if it is new; keeps the attempt unless it is already among the recent ones."""
+        word_id = self.add(word)
+        self.incorrect[word_id] += 1
+        if confused_with:
+            kept = [other for other in self._confused_with.get(word_id, ()) if other not in confused_with]
+            self._confused_with[word_id] = (kept + list(confused_with))[-self.max_attempts:]
+        if attempt not in self.attempts(word_id): self._push_attempt(word_id, attempt)
+        return word_id
+
+    def record_correct(self, word):
+        """Counts a right attempt at a tracked word. Returns its id, or -1 if the word is not tracked."""
+        word_id = self._ids.get(word, -1)
+        if word_id != -1: self.correct[word_id] += 1
+        return word_id
+
+    def reset_correct(self):
+        """Zeroes every word's correct count."""
+        self.correct = array('I', bytes(4 * len(self.words)))
+
+    def _push_attempt(self, word_id, attempt):
+        size, start, count = self.max_attempts, self._attempt_start[word_id], self._attempt_count[word_id]
+        if count < size:
+            self._attempts[word_id * size + (start + count) % size] = attempt
+            self._attempt_count[word_id] = count + 1
+        else: # Full: overwrite the oldest
+            self._attempts[word_id * size + start] = attempt
+            self._attempt_start[word_id] = (start + 1) % size
+
+    # --- Reading ---
+    def attempts(self, word_id):
+        """Returns an id's recent distinct attempts, oldest first."""
+        size, start = self.max_attempts, self._attempt_start[word_id]
+        base = word_id * size
+        return [self._attempts[base + (start + i) % size] for i in range(self._attempt_count[word_id])]
+
+    def counts(self, word):
+        """Returns (incorrect, correct) for a word, or None if it is not tracked."""
+        word_id = self._ids.get(word)
+        return None if word_id is None else (self.incorrect[word_id], self.correct[word_id])
+
+    def count_correct(self):
+        """Number of words with at least one correct attempt."""
+        return len(self.correct) - self.correct.count(0)
+
+    def entry(self, word_id):
+        """Builds the saved-log entry of an id."""
+        entry = {'incorrect_attempts': self.incorrect[word_id], 'correct_attempts': self.correct[word_id], 'user_attempts': self.attempts(word_id)}
+        if word_id in self._confused_with: entry['confused_with'] = list(self._confused_with[word_id])
+        return entry
+
+    def get(self, word, default=None):
+        """Returns a word's saved-log entry, or default if it is not tracked."""
+        word_id = self._ids.get(word)
+        return default if word_id is None else self.entry(word_id)
+
+    def items(self):
+        """Yields (word, entry) in id order."""
+        for word_id, word in enumerate(self.words): yield word, self.entry(word_id)
+
+    # --- Saved Log ---
+    def to_dict(self):
+        """Returns the tracking data in the saved-log layout ({word: entry})."""
+        return dict(self.items())
+
+    def load_entry(self, word, info):
+        """Tracks a word from its saved-log entry, replacing any counts it had. Returns its id."""
+        word_id = self.add(word)
+        self.incorrect[word_id] = _count(info.get('incorrect_attempts'))
+        self.correct[word_id] = _count(info.get('correct_attempts'))
+        self._attempt_start[word_id] = self._attempt_count[word_id] = 0
+        for attempt in list(info.get('user_attempts') or ())[-self.max_attempts:]: self._push_attempt(word_id, str(attempt))
+        if info.get('confused_with'): self._confused_with[word_id] = list(info['confused_with'])[-self.max_attempts:]
+        else: self._confused_with.pop(word_id, None)
+        return word_id
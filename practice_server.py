@@ -0,0 +1,321 @@
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from practice_session import PracticeSession
+from tts_cache import AudioCache
+from word_lists import WordListManager
+
+SESSION_IDLE_SECONDS = 3600
+SWEEP_SECONDS = 60
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+CLIP_MEMORY_BYTES = 64 * 1024 * 1024 # Hot clips kept in memory, shared by every learner
+TTS_RATE = 150
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class SharedListView:
+    """One learner's read-only view of the shared vocabulary.
+
+    Provides the part of the WordListManager API that PracticeSession uses,
+    so hundreds of sessions can practice different lists over one set of
+    word lists and feature indexes without copying them.
+    """
+
+    def __init__(self, manager, list_name):
+        self.manager = manager
+        self.list_name = list_name
+        self.word_list = manager.get_list(list_name)
+        if self.word_list is None: raise KeyError(list_name)
+
+    def get_active_list_name(self):
+        return self.list_name
+
+    def get_active_list(self):
+        return self.word_list
+
+    def get_feature_index(self):
+        return self.manager.get_feature_index(self.list_name)
+
+    def add_change_listener(self, callback):
+        """Shared lists never change while the server runs."""
+
+    def compact_active_list(self):
+        """Shared lists never have tombstones."""
+
+
+class ClipStore:
+    """Serves word audio as bytes from the shared on-disk AudioCache, rendering missing clips on one TTS thread."""
+
+    def __init__(self, cache_dir=None, rate=TTS_RATE, memory_bytes=CLIP_MEMORY_BYTES):
+        self.cache = AudioCache(cache_dir)
+        self.rate = rate
+        self.memory_bytes = memory_bytes
+        self._memory = OrderedDict() # Word -> clip bytes, least recently used first
+        self._memory_total = 0
+        self._tts = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts") # pyttsx3 engines are not thread-safe
+        self._engine = None
+        self.voice = None
+        self.failed = None # Why the engine could not start, if it could not
+
+    @property
+    def content_type(self):
+        return "audio/aiff" if self.cache.CLIP_EXTENSION == ".aiff" else "audio/wav"
+
+    def _render(self, word):
+        """Runs on the TTS thread: returns the clip's bytes, rendering it first if needed."""
+        if self._engine is None and self.failed is None:
+            try:
+                import pyttsx3
+                self._engine = pyttsx3.init()
+                self._engine.setProperty('rate', self.rate)
+                self.voice = self._engine.getProperty('voice')
+            except Exception as e: self.failed = str(e)
+        path = self.cache.get(word, self.voice, self.rate) if self.voice else None
+        if path is None and self._engine: path = self.cache.render(self._engine, word, self.voice, self.rate)
+        if path is None: return None
+        with open(path, 'rb') as f: return f.read()
+
+    async def clip(self, word):
+        """Returns the clip for a word, or None if it cannot be synthesized."""
+        data = self._memory.get(word)
+        if data is not None:
+            self._memory.move_to_end(word)
+            return data
+        data = await asyncio.get_running_loop().run_in_executor(self._tts, self._render, word)
+        if data is not None:
+            self._memory[word] = data
+            self._memory_total += len(data)
+            while self._memory_total > self.memory_bytes and len(self._memory) > 1:
+                self._memory_total -= len(self._memory.popitem(last=False)[1])
+        return data
+
+    def close(self):
+        self._tts.shutdown(wait=False)
+
+
+class PracticeServer:
+    """Asyncio HTTP server hosting many practice sessions over one shared vocabulary.
+
+    Endpoints (JSON in and out, except audio):
+      GET    /lists                      available lists and their sizes
+      POST   /sessions                   {"list": name, "focus": [filter keys], "weighted": bool} -> {"session": id, ...}
+      POST   /sessions/<id>/next         moves to the next word -> progress, or {"done": true}
+      GET    /sessions/<id>/audio        the current word as audio bytes
+      GET    /sessions/<id>/hint         a hint for the current word
+      POST   /sessions/<id>/answer       {"answer": text} -> {"correct": bool, "word": correct spelling}
+      DELETE /sessions/<id>              ends a session
+    Sessions idle for SESSION_IDLE_SECONDS are dropped.
+    """
+
+    def __init__(self, manager=None, clips=None, rng=None):
+        self.manager = manager or WordListManager()
+        self.clips = clips
+        self.rng = rng if rng is not None else random.Random()
+        self.sessions = {} # Id -> (PracticeSession, last used)
+        self._server = None
+        self._sweeper = None
+        self._connections = {} # Handler task -> its writer, so close() can end keep-alive connections cleanly
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """Starts listening. Returns the bound (host, port); pass port 0 to pick a free one."""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self._sweeper = asyncio.create_task(self._sweep_idle_sessions())
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._sweeper: self._sweeper.cancel()
+        if self._server:
+            self._server.close()
+            for writer in self._connections.values(): writer.close() # Idle handlers see EOF and return
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self.clips: self.clips.close()
+
+    async def _sweep_idle_sessions(self):
+        while True:
+            await asyncio.sleep(SWEEP_SECONDS)
+            cutoff = time.monotonic() - SESSION_IDLE_SECONDS
+            for session_id in [sid for sid, (_, last_used) in self.sessions.items() if last_used < cutoff]:
+                del self.sessions[session_id]
+
+    # --- HTTP ---
+    async def _handle_connection(self, reader, writer):
+        """Serves requests on one connection until the client closes it (HTTP/1.1 keep-alive)."""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try: request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._send(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None: break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                try: status, payload = await self._route(method, path, body)
+                except HTTPError as e: status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    print(f"Error handling {method} {path}: {e}")
+                    status, payload = 500, {'error': "Internal error."}
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError): pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        """Returns (method, path, headers, body), or None when the client has closed the connection."""
+        try: head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial: return None
+            raise HTTPError(400, "Incomplete request.")
+        except asyncio.LimitOverrunError: raise HTTPError(413, "Headers too large.")
+        if len(head) > MAX_HEADER_BYTES: raise HTTPError(413, "Headers too large.")
+        lines = head.decode('latin-1').split("\r\n")
+        try: method, path, _ = lines[0].split(" ", 2)
+        except ValueError: raise HTTPError(400, "Malformed request line.")
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep: headers[name.strip().lower()] = value.strip()
+        try: length = int(headers.get('content-length', 0))
+        except ValueError: raise HTTPError(400, "Bad Content-Length.")
+        if length > MAX_BODY_BYTES: raise HTTPError(413, "Body too large.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path, headers, body
+
+    @staticmethod
+    async def _send(writer, status, payload, keep_alive=True):
+        if isinstance(payload, tuple): content_type, body = payload
+        else: content_type, body = "application/json", json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    @staticmethod
+    def _json_body(body):
+        if not body: return {}
+        try: data = json.loads(body)
+        except ValueError: raise HTTPError(400, "Body is not valid JSON.")
+        if not isinstance(data, dict): raise HTTPError(400, "Body must be a JSON object.")
+        return data
+
+    # --- Routes ---
+    async def _route(self, method, path, body):
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+        if parts == ["lists"] and method == "GET":
+            return 200, {'lists': [{'name': name, 'words': self.manager.get_word_count(name)} for name in self.manager.get_available_lists()]}
+        if parts == ["sessions"] and method == "POST":
+            return self._create_session(self._json_body(body))
+        if len(parts) in (2, 3) and parts[0] == "sessions":
+            session = self._session(parts[1])
+            action = parts[2] if len(parts) == 3 else None
+            if action is None and method == "DELETE":
+                del self.sessions[parts[1]]
+                return 200, {'deleted': True}
+            if action == "next" and method == "POST": return 200, self._next_word(session)
+            if action == "answer" and method == "POST": return 200, self._answer(session, self._json_body(body))
+            if action == "hint" and method == "GET": return 200, self._hint(session)
+            if action == "audio" and method == "GET": return 200, await self._audio(session)
+            raise HTTPError(405, f"{method} is not supported on {path}.")
+        raise HTTPError(404, f"No route for {path}.")
+
+    def _session(self, session_id):
+        entry = self.sessions.get(session_id)
+        if entry is None: raise HTTPError(404, "Unknown or expired session.")
+        self.sessions[session_id] = (entry[0], time.monotonic())
+        return entry[0]
+
+    def _create_session(self, data):
+        list_name = data.get('list')
+        if list_name is not None and not isinstance(list_name, str): raise HTTPError(400, "List must be a list name.")
+        list_name = list_name or self.manager.get_active_list_name()
+        try: view = SharedListView(self.manager, list_name)
+        except KeyError: raise HTTPError(404, f"No list named {list_name!r}.")
+        session = PracticeSession(view, rng=random.Random(self.rng.getrandbits(64)))
+        focus = data.get('focus') or []
+        if isinstance(focus, str): focus = [focus]
+        if not isinstance(focus, list) or not all(isinstance(key, str) for key in focus): raise HTTPError(400, "Focus must be a list of filter keys.")
+        weighted = data.get('weighted', False)
+        if not isinstance(weighted, bool): raise HTTPError(400, "Weighted must be true or false.")
+        session.weighted = weighted # Applied by the fresh pass set_feature_filter starts
+        try: session.set_feature_filter(*focus)
+        except KeyError as e: raise HTTPError(400, f"Unknown focus filter {e}.")
+        session_id = secrets.token_urlsafe(12)
+        self.sessions[session_id] = (session, time.monotonic())
+        return 201, {'session': session_id, 'list': list_name, 'total': session.total_words}
+
+    @staticmethod
+    def _progress(session):
+        return {'presented': session.presented_count, 'total': session.total_words}
+
+    def _next_word(self, session):
+        if not session.select_next_word(): return dict(self._progress(session), done=True)
+        return dict(self._progress(session), done=False, letters=len(session.get_current_word()))
+
+    def _answer(self, session, data):
+        answer = data.get('answer')
+        if not isinstance(answer, str): raise HTTPError(400, "Expected {\"answer\": text}.")
+        is_correct, correct_spelling = session.grade(answer)
+        if correct_spelling is None: raise HTTPError(400, "No current word; call next first.")
+        return dict(self._progress(session), correct=is_correct, word=correct_spelling)
+
+    def _hint(self, session):
+        if session.get_current_word() is None: raise HTTPError(400, "No current word; call next first.")
+        return {'hint': self.rng.choice(session.word_manager.get_feature_index().hints(session.current_word_index))}
+
+    async def _audio(self, session):
+        word = session.get_current_word()
+        if word is None: raise HTTPError(400, "No current word; call next first.")
+        if self.clips is None: raise HTTPError(503, "Audio is disabled on this server.")
+        data = await self.clips.clip(word)
+        if data is None: raise HTTPError(503, f"Speech synthesis unavailable: {self.clips.failed or 'rendering failed'}")
+        return self.clips.content_type, data
+
+
+async def _run(args):
+    manager = WordListManager()
+    if args.lists and not manager.load_from_file(args.lists): raise SystemExit(f"Could not load word lists from {args.lists}")
+    for name in manager.get_available_lists(): manager.get_feature_index(name) # Shared by every session, so built up front
+    clips = None if args.no_audio else ClipStore(args.audio_cache)
+    server = PracticeServer(manager, clips)
+    host, port = await server.start(args.host, args.port)
+    print(f"Serving {len(manager.get_available_lists())} lists on http://{host}:{port}")
+    try: await server.serve_forever()
+    finally: await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host practice sessions for many learners over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--lists", help="word lists to serve (JSON, .pack or .db); defaults to the built-in lists")
+    parser.add_argument("--audio-cache", default=None, help="directory of pre-rendered clips (default: the app's audio cache)")
+    parser.add_argument("--no-audio", action="store_true", help="disable the audio endpoint")
+    args = parser.parse_args()
+    try: asyncio.run(_run(args))
+    except KeyboardInterrupt: pass
+
+
+if __name__ == "__main__":
+    main()
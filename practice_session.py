@@ -0,0 +1,307 @@
+from array import array
+
+from misspelling_stats import MisspellingStats
+from word_selection import WeightedSelector, WordSelector
+
+
+class PracticeSession:
+    """GUI-free practice state: word selection, grading and misspelling tracking.
+
+    `SpellingApp` drives one of these from its Tk callbacks; the classroom
+    backend and regression scripts can use it directly, including the bulk
+    `grade_batch` API.
+    """
+
+    MAX_TRACKED_ATTEMPTS = 5
+    UNMISSED_WEIGHT = 0.05 # Weak-word drill weight of a word never missed; a missed word weighs its smoothed error rate
+
+    def __init__(self, word_manager, rng=None):
+        self.word_manager = word_manager
+        self.misspelled = MisspellingStats(self.MAX_TRACKED_ATTEMPTS) # Counts and recent attempts of every missed word
+        self.current_word_index = -1
+        self.practicing_misspelled = False
+        self.review_scheduler = None # Set while reviewing due words of the active list
+        self._reviews_presented = 0
+        self._reviews_due = 0 # Words due when the review started
+        self._awaiting_review = False # The current review word has been handed out but not graded yet
+        self.journal = None # Optional AttemptJournal that records every change to the misspelled log
+        self.attempt_store = None # Optional WordStore that keeps the full attempt history
+        self.real_words = None # Optional SymSpellIndex for noticing wrong answers that are (close to) other real words
+        self.last_confused_with = [] # Real words the last wrong answer was closest to, instead of the word asked for
+        self.feature_filter = () # Filter keys (see feature_index.FEATURE_FILTERS) a pass over the active list is limited to
+        self.weighted = False # Drill the active list in proportion to error rates instead of one pass in random order
+        self._shuffled_selector = WordSelector(rng=rng)
+        self._weighted_selector = WeightedSelector(self._index_weight, rng=rng)
+        self.word_manager.add_change_listener(self.on_word_list_changed)
+
+    @property
+    def misspelled_words(self):
+        """Tracked words, in the order they were first missed; the list misspelled practice draws from."""
+        return self.misspelled.words
+
+    # --- Selection ---
+    @property
+    def word_selector(self):
+        """The selector of the current pass; misspelled-word rounds are always one shuffled pass."""
+        return self._weighted_selector if self.weighted and not self.practicing_misspelled else self._shuffled_selector
+
+    def get_practice_list(self):
+        """Returns the list being practiced: the misspelled words or the active list."""
+        return self.misspelled_words if self.practicing_misspelled else self.word_manager.get_active_list()
+
+    @staticmethod
+    def _index_count(word_list):
+        """Number of indices a list hands out: slots for indexed word lists, length for plain lists."""
+        return getattr(word_list, 'slot_count', len(word_list))
+
+    def reset(self):
+        """Starts a fresh pass over the active list."""
+        self.current_word_index = -1
+        self.practicing_misspelled = False
+        self.review_scheduler = None
+        self.word_manager.compact_active_list() # No pass holds slots yet, so renumbering is free
+        if self.feature_filter:
+            self.word_selector.reset_to(self.word_manager.get_feature_index().slots_matching(*self.feature_filter))
+        elif self.weighted:
+            self._weighted_selector.reset_weights(self._drill_weights())
+        else:
+            self.word_selector.reset(self.word_manager.get_active_list().slot_count)
+
+    def set_feature_filter(self, *keys):
+        """Limits passes over the active list to words matching every filter key (none for all words) and starts a fresh pass."""
+        self.feature_filter = keys
+        self.reset()
+
+    def start_misspelled_practice(self):
+        """Starts a pass over the misspelled words, clearing this round's correct counts."""
+        self.practicing_misspelled = True
+        self.review_scheduler = None
+        self.current_word_index = -1
+        self.word_selector.reset(len(self.misspelled_words))
+        self.reset_round_counts()
+
+    def set_weighted(self, weighted):
+        """Switches the active list between one shuffled pass and a weak-word drill, and starts a fresh pass."""
+        self.weighted = weighted
+        self.reset()
+
+    def word_weight(self, word):
+        """Weak-word drill weight: the word's error rate, smoothed so one attempt does not decide it."""
+        counts = self.misspelled.counts(word)
+        if counts is None: return self.UNMISSED_WEIGHT
+        incorrect, correct = counts
+        return (incorrect + 1) / (incorrect + correct + 2)
+
+    def _drill_weights(self):
+        """Returns the weight of every active-list slot, touching only tracked words and tombstones one by one."""
+        active_list = self.word_manager.get_active_list()
+        weights = array('d', [self.UNMISSED_WEIGHT]) * self._index_count(active_list)
+        if getattr(active_list, 'tombstone_count', 0):
+            for slot, word in enumerate(active_list.slot_words()):
+                if word is None: weights[slot] = 0.0
+        for word in self.misspelled:
+            slot = active_list.slot_of(word)
+            if slot != -1: weights[slot] = self.word_weight(word)
+        return weights
+
+    def _index_weight(self, index):
+        word_list = self.word_manager.get_active_list()
+        word = word_list[index] if index < self._index_count(word_list) else None
+        return self.word_weight(word) if word is not None else 0.0
+
+    def _reweigh(self, word):
+        """Updates the drill weight of a word after its tracking changed."""
+        if not self.practicing_misspelled: self._weighted_selector.update(self.word_manager.get_active_list().slot_of(word))
+
+    def reset_round_counts(self):
+        """Zeroes every tracked word's correct count at the start of a misspelled-practice round."""
+        self.misspelled.reset_correct()
+        if self.journal: self.journal.append_round_reset()
+
+    def start_review(self, scheduler, now=None):
+        """Starts reviewing the active list's due words, adding any words the deck has not seen yet."""
+        self.reset()
+        scheduler.add_words(self.word_manager.get_active_list(), now)
+        self.review_scheduler = scheduler
+        self._reviews_presented = 0
+        self._reviews_due = scheduler.due_count(now)
+        self._awaiting_review = False
+
+    def _select_next_review(self, now=None):
+        """Moves to the most overdue word still in the active list."""
+        scheduler, active_list = self.review_scheduler, self.word_manager.get_active_list()
+        while True:
+            word = scheduler.next_due(now)
+            slot = active_list.slot_of(word) if word is not None else -1
+            if word is None or slot != -1: break
+            scheduler.remove(word) # Removed from the list since it was added to the deck
+        self.current_word_index = slot
+        self._awaiting_review = slot != -1
+        if self._awaiting_review: self._reviews_presented += 1
+        return self._awaiting_review
+
+    def select_next_word(self):
+        """Moves to a random unpresented word. Returns False if the list is empty or finished."""
+        if self.review_scheduler: return self._select_next_review()
+        next_index = self.word_selector.next() if self.get_practice_list() else -1
+        self.current_word_index = next_index
+        return next_index != -1
+
+    def peek_next_word(self):
+        """Returns the word `select_next_word` will pick next, or None."""
+        if self.review_scheduler: return None # Depends on the answer to the current word
+        upcoming_index = self.word_selector.peek()
+        return self.get_practice_list()[upcoming_index] if upcoming_index != -1 else None
+
+    def get_current_word(self):
+        """Safely gets the current word based on index and mode."""
+        if self.current_word_index == -1: return None
+        word_list = self.get_practice_list()
+        word = word_list[self.current_word_index] if 0 <= self.current_word_index < self._index_count(word_list) else None
+        if word is None: self.current_word_index = -1 # Invalid state or removed word
+        return word
+
+    @property
+    def total_words(self):
+        """Number of words in the list being practiced."""
+        if self.review_scheduler: return max(self._reviews_due, self._reviews_presented) # Missed words may come round again
+        if (self.weighted or self.feature_filter) and not self.practicing_misspelled: return self.word_selector.total
+        return len(self.get_practice_list())
+
+    @property
+    def presented_count(self):
+        """Number of words presented so far in this pass."""
+        if self.review_scheduler: return self._reviews_presented
+        return self.word_selector.presented_count
+
+    def on_word_list_changed(self, list_name, action, detail):
+        """Keeps the current pass in step when the active list is edited mid-pass."""
+        if self.practicing_misspelled or list_name != self.word_manager.get_active_list_name(): return
+        if action == "add":
+            if self.feature_filter: detail = self.word_manager.get_feature_index().filter_slots(detail, *self.feature_filter)
+            for slot in detail: self.word_selector.add(slot)
+        elif action == "remove":
+            for slot in detail: self.word_selector.discard(slot)
+            if self.current_word_index in detail: self.current_word_index = -1
+        elif action == "compact":
+            self.word_selector.remap(detail.__getitem__)
+            if self.current_word_index != -1: self.current_word_index = detail[self.current_word_index]
+
+    # --- Progress Snapshots ---
+    def progress_state(self):
+        """Returns where the current pass stands, for `restore_progress` after a restart; None during a review or with no current word."""
+        word = self.get_current_word()
+        if self.review_scheduler or word is None: return None
+        return {'list': self.word_manager.get_active_list_name(), 'misspelled': self.practicing_misspelled, 'weighted': self.weighted,
+                'feature_filter': list(self.feature_filter), 'index_count': self._index_count(self.get_practice_list()),
+                'current': self.current_word_index, 'current_word': word, 'selector': self.word_selector.snapshot()}
+
+    def restore_progress(self, state):
+        """Resumes a pass saved by `progress_state` if it still matches the active list (or the misspelled log). Returns whether it did."""
+        word_list = self.misspelled_words if state.get('misspelled') else self.word_manager.get_active_list()
+        current = state.get('current', -1)
+        if (state.get('list') != self.word_manager.get_active_list_name() or state.get('index_count') != self._index_count(word_list)
+                or not 0 <= current < state['index_count'] or word_list[current] != state.get('current_word')):
+            return False
+        self.weighted, self.feature_filter = bool(state.get('weighted')), tuple(state.get('feature_filter') or ())
+        self.reset() # Sets up the pass's selector (drill weights, filtered slots) before its position is restored
+        self.practicing_misspelled = bool(state.get('misspelled'))
+        try: self.word_selector.restore(state['selector'])
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Error restoring practice progress: {e}")
+            self.practicing_misspelled = False
+            self.reset()
+            return False
+        self.current_word_index = current
+        return True
+
+    # --- Grading ---
+    @staticmethod
+    def is_correct(correct_spelling, user_spelling):
+        """Compares an attempt with the correct spelling, ignoring case and surrounding whitespace."""
+        return user_spelling.strip().lower() == correct_spelling.lower()
+
+    def grade(self, user_spelling):
+        """Grades an attempt at the current word and records it. Returns (is_correct, correct_spelling)."""
+        correct_spelling = self.get_current_word()
+        if not correct_spelling: return False, None
+        is_correct = self.is_correct(correct_spelling, user_spelling)
+        self.record_result(correct_spelling, user_spelling.strip(), is_correct)
+        if self.review_scheduler and self._awaiting_review:
+            self.review_scheduler.review(correct_spelling, is_correct)
+            self._awaiting_review = False
+        return is_correct, correct_spelling
+
+    def record_result(self, correct_spelling, user_spelling, is_correct, confused_with=None):
+        """Updates misspelling tracking for one graded attempt; confused_with, if given, replaces the real-word lookup (journal replay)."""
+        if is_correct: self.last_confused_with = []
+        elif confused_with is not None: self.last_confused_with = list(confused_with)
+        else: self.last_confused_with = self.real_words.closest_other_words(user_spelling, correct_spelling) if self.real_words and user_spelling else []
+        if self.journal: self.journal.append_attempt(correct_spelling, user_spelling, is_correct, self.last_confused_with)
+        if self.attempt_store: self.attempt_store.record_attempt(correct_spelling, user_spelling, is_correct, self.word_manager.get_active_list_name())
+        if is_correct:
+            if self.misspelled.record_correct(correct_spelling) != -1 and self.weighted: self._reweigh(correct_spelling)
+            return
+        is_new = correct_spelling not in self.misspelled
+        word_id = self.misspelled.record_incorrect(correct_spelling, user_spelling if user_spelling else "(empty)", self.last_confused_with)
+        if is_new and self.practicing_misspelled: self.word_selector.add(word_id)
+        if self.weighted: self._reweigh(correct_spelling)
+
+    def grade_batch(self, pairs, record=False):
+        """Grades many (correct_spelling, user_spelling) pairs at once. Returns a list of booleans.
+
+        With record=True every result is also applied to the misspelling
+        tracking, exactly as if each attempt had been submitted in order.
+        """
+        if not pairs: return []
+        words, attempts = zip(*pairs)
+        attempts = [attempt.strip() for attempt in attempts]
+        results = list(map(str.__eq__, map(str.lower, attempts), map(str.lower, words)))
+        if record:
+            record_result = self.record_result
+            for word, attempt, is_correct in zip(words, attempts, results):
+                record_result(word, attempt, is_correct)
+        return results
+
+    # --- Misspelled Log ---
+    def clear_misspelled(self):
+        """Forgets all tracked misspellings."""
+        cleared = self.misspelled
+        self.misspelled = MisspellingStats(self.MAX_TRACKED_ATTEMPTS)
+        if self.journal: self.journal.compact(self, force=True) # Replaced wholesale, so start a fresh snapshot
+        if self.weighted:
+            for word in cleared: self._reweigh(word)
+
+    def load_tracking(self, words, tracking):
+        """Replaces tracked misspellings with saved data. Returns (loaded_count, skipped_count)."""
+        self.clear_misspelled()
+        loaded_count, skipped_count = 0, 0
+        for word in words:
+             if isinstance(word, str) and word:
+                 word_tracking = tracking.get(word)
+                 self.misspelled.load_entry(word, word_tracking if isinstance(word_tracking, dict) else {})
+                 loaded_count += 1
+             else: skipped_count += 1
+        if self.journal: self.journal.compact(self, force=True)
+        if self.practicing_misspelled: # The old pass indexed the replaced list
+            self.current_word_index = -1
+            self.word_selector.reset(len(self.misspelled_words))
+        elif self.weighted:
+            for word in self.misspelled: self._reweigh(word)
+        return loaded_count, skipped_count
+
+    def to_saved_data(self):
+        """Returns the tracked misspellings in the saved-log JSON layout."""
+        return {'saved_misspelled_words': list(self.misspelled.words), 'saved_tracking_data': self.misspelled.to_dict()}
+
+    def snapshot_saved_data(self):
+        """Returns a copy of `to_saved_data` that later attempts do not change, e.g. to save on another thread."""
+        return self.to_saved_data() # Built fresh from the store, so it already shares nothing with it
+
+    def count_misspelled_in(self, word_list):
+        """Counts tracked misspellings that belong to the given list."""
+        return len([w for w in self.misspelled_words if w in word_list])
+
+    def count_practiced_correct(self):
+        """Counts tracked words answered correctly at least once this round."""
+        return self.misspelled.count_correct()
@@ -0,0 +1,62 @@
+from bisect import bisect_left, insort
+
+_AFTER_ALL = "\U0010ffff" # Sorts after any character a word continues with
+
+
+class PrefixIndex:
+    """Case-insensitive prefix lookups over an IndexedWordList, for live feedback while typing.
+
+    The trie is laid out as one sorted array of lowered words: every trie
+    node is the contiguous run of words sharing its prefix, and stepping to a
+    child narrows that run with two bisects inside it. This keeps memory at
+    one reference per word (a dict-per-node trie costs hundreds of bytes per
+    node) while a keystroke still costs only a few comparisons. Kept in step
+    with in-place edits through `add`, `remove` and `compact`.
+    """
+
+    def __init__(self, word_list):
+        self.word_list = word_list
+        self.rebuild()
+
+    def rebuild(self):
+        """Recomputes the index from the list's current slots."""
+        self._slot_keys = [w.lower() if w is not None else None for w in self.word_list.slot_words()]
+        self._sorted = sorted(key for key in self._slot_keys if key is not None)
+
+    # --- Edits ---
+    def add(self, slots):
+        """Indexes newly appended slots."""
+        for slot in slots:
+            key = self.word_list[slot].lower()
+            self._slot_keys.extend([None] * (slot + 1 - len(self._slot_keys)))
+            self._slot_keys[slot] = key
+            insort(self._sorted, key)
+
+    def remove(self, slots):
+        """Drops tombstoned slots."""
+        for slot in slots:
+            key = self._slot_keys[slot]
+            if key is None: continue
+            self._slot_keys[slot] = None
+            del self._sorted[bisect_left(self._sorted, key)]
+
+    def compact(self, mapping):
+        """Follows a compaction of the list; the sorted words are unchanged."""
+        self._slot_keys = [key for key in self._slot_keys if key is not None]
+
+    # --- Lookups ---
+    def first_mismatch(self, text):
+        """Returns the position of the first character no word in the list continues with, or -1 if none."""
+        words = self._sorted
+        lo, hi = 0, len(words)
+        prefix = ""
+        for i, char in enumerate(text):
+            prefix += char.lower()
+            lo = bisect_left(words, prefix, lo, hi)
+            hi = bisect_left(words, prefix + _AFTER_ALL, lo, hi)
+            if lo == hi: return i
+        return -1
+
+    def is_prefix(self, text):
+        """Checks whether some word in the list starts with `text`, ignoring case."""
+        return self.first_mismatch(text) == -1
@@ -0,0 +1,170 @@
+import heapq
+import json
+import os
+import random
+import time
+from itertools import islice
+from operator import itemgetter, le
+from urllib.parse import quote
+
+DAY_SECONDS = 86400
+RELEARN_SECONDS = 600 # A missed word comes back after ten minutes
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+QUALITY_CORRECT = 4 # SM-2 answer quality for a correct / incorrect attempt
+QUALITY_INCORRECT = 1
+DECK_VERSION = 1
+
+
+def default_deck_dir():
+    """Returns the per-user directory holding saved review decks."""
+    return os.path.join(os.path.expanduser("~"), ".spelling_app", "review_decks")
+
+
+def deck_path(list_name, deck_dir=None):
+    """Returns the deck file for a word list."""
+    return os.path.join(deck_dir or default_deck_dir(), quote(list_name, safe="") + ".json")
+
+
+class Card:
+    """SM-2 state of one word."""
+    __slots__ = ("due", "ease", "interval", "repetitions", "lapses", "seq")
+
+    def __init__(self, due, ease=DEFAULT_EASE, interval=0.0, repetitions=0, lapses=0, seq=0):
+        self.due = due
+        self.ease = ease
+        self.interval = interval # Days
+        self.repetitions = repetitions
+        self.lapses = lapses
+        self.seq = seq # Matches the card's live heap entry; older entries for the word are stale
+
+
+class ReviewScheduler:
+    """Spaced-repetition deck (SM-2) that hands out due words from a min-heap.
+
+    The heap holds (due, seq, word) entries. Rescheduling a word pushes a new
+    entry and leaves the old one to be skipped when it surfaces, so both
+    picking and rescheduling are O(log n). Decks are saved in due order, and
+    a sorted list is already a valid heap, so loading never re-sorts.
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+        self.cards = {} # Word -> Card
+        self._heap = []
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __contains__(self, word):
+        return word in self.cards
+
+    def _push(self, word, card):
+        card.seq = self._next_seq
+        self._next_seq += 1
+        heapq.heappush(self._heap, (card.due, card.seq, word))
+
+    def _prune(self):
+        """Drops stale entries from the top of the heap."""
+        heap, cards = self._heap, self.cards
+        while heap:
+            due, seq, word = heap[0]
+            card = cards.get(word)
+            if card is not None and card.seq == seq: return
+            heapq.heappop(heap)
+
+    # --- Deck Edits ---
+    def add_words(self, words, now=None):
+        """Adds unseen words as new cards, due now, in random order. Returns the number added."""
+        now = time.time() if now is None else now
+        new_words = [word for word in dict.fromkeys(words) if word not in self.cards]
+        self.rng.shuffle(new_words)
+        if len(new_words) < len(self._heap):
+            for word in new_words: self._push(word, self.cards.setdefault(word, Card(now)))
+            return len(new_words)
+        for seq, word in enumerate(new_words, self._next_seq): # Bulk add: one heapify instead of a push per word
+            self.cards[word] = Card(now, seq=seq)
+            self._heap.append((now, seq, word))
+        self._next_seq += len(new_words)
+        heapq.heapify(self._heap)
+        return len(new_words)
+
+    def remove(self, word):
+        """Drops a word's card; its heap entry goes stale."""
+        return self.cards.pop(word, None) is not None
+
+    # --- Scheduling ---
+    def next_due(self, now=None):
+        """Returns the most overdue word, or None if nothing is due."""
+        self._prune()
+        if not self._heap: return None
+        due, _, word = self._heap[0]
+        return word if due <= (time.time() if now is None else now) else None
+
+    def next_due_time(self):
+        """Returns when the next word falls due, or None for an empty deck."""
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def due_count(self, now=None):
+        """Counts the words that are due. O(n), so callers take it once per review rather than per answer."""
+        now = time.time() if now is None else now
+        return sum(card.due <= now for card in self.cards.values())
+
+    def review(self, word, correct, now=None):
+        """Applies the SM-2 update for one answer and reschedules the word. Returns its new due time."""
+        now = time.time() if now is None else now
+        card = self.cards.get(word)
+        if card is None: card = self.cards[word] = Card(now)
+        quality = QUALITY_CORRECT if correct else QUALITY_INCORRECT
+        card.ease = max(MIN_EASE, card.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        if quality < 3:
+            card.repetitions = 0
+            card.lapses += 1
+            card.interval = 0.0
+            card.due = now + RELEARN_SECONDS
+        else:
+            card.repetitions += 1
+            if card.repetitions == 1: card.interval = 1.0
+            elif card.repetitions == 2: card.interval = 6.0
+            else: card.interval = round(card.interval * card.ease, 2)
+            card.due = now + card.interval * DAY_SECONDS
+        self._push(word, card)
+        return card.due
+
+    # --- Persistence ---
+    def to_saved_data(self):
+        """Returns the deck in its saved layout, cards in due order."""
+        rows = [[word, card.due, card.ease, card.interval, card.repetitions, card.lapses, card.seq] for word, card in self.cards.items()]
+        rows.sort(key=itemgetter(1, 6))
+        for row in rows: del row[6]
+        return {'version': DECK_VERSION, 'cards': rows}
+
+    def save(self, filename):
+        """Writes the deck to a JSON file, atomically replacing it."""
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        temp_filename = filename + ".tmp"
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.to_saved_data(), ensure_ascii=False, separators=(",", ":"))) # dumps is much faster than dump
+        os.replace(temp_filename, filename)
+
+    def load_saved_data(self, data):
+        """Replaces the deck with saved data; the saved due order becomes the heap as is."""
+        if not isinstance(data, dict) or data.get('version') != DECK_VERSION: raise ValueError("Unsupported review deck format.")
+        self.cards, self._heap = {}, []
+        for seq, (word, due, ease, interval, repetitions, lapses) in enumerate(data.get('cards', [])):
+            self.cards[word] = Card(due, ease, interval, repetitions, lapses, seq)
+            self._heap.append((due, seq, word))
+        self._next_seq = len(self._heap)
+        if not all(map(le, self._heap, islice(self._heap, 1, None))): # Not in due order, e.g. hand-edited
+            heapq.heapify(self._heap)
+
+    @classmethod
+    def load(cls, filename, rng=None):
+        """Loads a saved deck, or returns an empty one if the file does not exist."""
+        scheduler = cls(rng=rng)
+        if not os.path.exists(filename): return scheduler
+        with open(filename, 'r', encoding='utf-8') as f:
+            scheduler.load_saved_data(json.load(f))
+        return scheduler
@@ -0,0 +1,68 @@
+import json
+import os
+import struct
+
+# File layout: MAGIC, uint32 length of the JSON header, the JSON header, then the binary blobs it refers to.
+# Bytes values (progress bitmaps, RNG state) are stored as blobs and replaced in the header by {"$blob": [offset, length]}.
+MAGIC = b"SPSNAP\x00\x01"
+HEADER = struct.Struct("<8sI")
+BLOB_KEY = "$blob"
+
+
+def default_snapshot_path():
+    """Returns the per-user file the practice position is kept in between runs."""
+    return os.path.join(os.path.expanduser("~"), ".spelling_app", "progress.snapshot")
+
+
+def _split_blobs(value, blobs, offset):
+    """Replaces the bytes inside a nested dict with blob references. Returns (value, offset after its blobs)."""
+    if isinstance(value, (bytes, bytearray)):
+        blobs.append(value)
+        return {BLOB_KEY: [offset, len(value)]}, offset + len(value)
+    if isinstance(value, dict):
+        split = {}
+        for key, item in value.items(): split[key], offset = _split_blobs(item, blobs, offset)
+        return split, offset
+    return value, offset
+
+
+def _join_blobs(value, data, start):
+    if isinstance(value, dict):
+        if BLOB_KEY in value:
+            offset, length = value[BLOB_KEY]
+            if start + offset + length > len(data): raise ValueError("Snapshot is truncated.")
+            return data[start + offset:start + offset + length]
+        return {key: _join_blobs(item, data, start) for key, item in value.items()}
+    return value
+
+
+def write_snapshot(filename, state):
+    """Writes a state dict (JSON values plus bytes) through a temporary file, so a crash leaves the previous snapshot."""
+    blobs = []
+    header, _ = _split_blobs(state, blobs, 0)
+    encoded = json.dumps(header, separators=(",", ":")).encode('utf-8')
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+        for blob in blobs: f.write(blob)
+    os.replace(temp_filename, filename)
+
+
+def read_snapshot(filename):
+    """Reads a snapshot written by `write_snapshot`, or returns None if there is none or it cannot be read."""
+    try:
+        with open(filename, 'rb') as f: data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"Error reading progress snapshot: {e}")
+        return None
+    try:
+        magic, length = HEADER.unpack_from(data, 0)
+        if magic != MAGIC: raise ValueError("Not a progress snapshot.")
+        start = HEADER.size + length
+        return _join_blobs(json.loads(data[HEADER.size:start].decode('utf-8')), data, start)
+    except (struct.error, ValueError) as e:
+        print(f"Error reading progress snapshot: {e}")
+        return None
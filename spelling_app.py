@@ -1,16 +1,28 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, StringVar, filedialog, font
-import pyttsx3
-import threading
 import time
-import json
+_IMPORT_START = time.perf_counter() # Start of the "imports" phase in the startup timing report
+
+import argparse
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog, StringVar, filedialog, font
 import os
 import random
 
+# Only what the first window needs; modules used by a flag or a later action (database, import,
+# review, real-word index) are imported where they are used, so startup does not pay for them.
 try:
     from word_lists import WordListManager
-except ImportError:
-    messagebox.showerror("Error", "Could not find word_lists.py. Make sure it's in the same directory.")
+    from practice_session import PracticeSession
+    from hints import get_hints
+    from feature_index import FEATURE_FILTERS
+    from attempt_journal import AttemptJournal
+    from log_view import MisspelledLogView
+    from tts_worker import SpeechWorker
+    from audio_pack import pack_path
+    from timing import StartupTimer, LatencyTracer
+    from background_io import DEFAULT_STALL_MS, IOExecutor, StallWatchdog, read_json, write_json
+    from session_snapshot import default_snapshot_path, read_snapshot, write_snapshot
+except ImportError as e:
+    messagebox.showerror("Error", f"Could not import {e.name or 'a module'} ({e}). Make sure the app's modules are in the same directory.")
     exit()
 
 
@@ -28,36 +40,58 @@ class SpellingApp:
     DEFAULT_FONT_FAMILY = "Arial"
     MIN_FONT_SIZE = 8
     MAX_FONT_SIZE = 24
-
-    def __init__(self, root):
+    TTS_RATE = 150
+    SPEECH_POLL_MS = 50
+    ALL_WORDS_FOCUS = "All words"
+    AUTOSAVE_MS = 2000 # How often journaled attempts are fsynced, stored ones committed and the progress snapshot updated
+    LATENCY_PANEL_MS = 1000 # Refresh interval of the latency debug panel
+    IMPORT_POLL_MS = 100 # How often a running import reports progress
+
+    def __init__(self, root, startup_timer=None, show_startup_timing=False, database=None, latency_dump=None, stall_threshold_ms=DEFAULT_STALL_MS, dictionary=None):
         self.root = root
+        self.dictionary = dictionary # Word file whose words also count as real words when checking wrong answers
+        self.io = IOExecutor(root) # Saves and loads run on its thread so large files never freeze the window
+        self.watchdog = StallWatchdog(root, stall_threshold_ms) if stall_threshold_ms > 0 else None
+        if self.watchdog: self.watchdog.start()
+        self.startup_timer = startup_timer or StartupTimer()
+        self.latency = LatencyTracer(milestones=("audio 1 start",)) # Answer-to-audio stages of every word
+        self.latency_dump = latency_dump # File the latency histograms are written to on close
+        self.latency_panel = None
+        self.show_startup_timing = show_startup_timing
+        self._startup_pending = {"word list", "speech engine"} # Background phases the timing report waits for
         self.root.title("Spelling Practice App")
         self.root.geometry("850x700")
         self.root.configure(bg=self.BG_COLOR)
         self.root.minsize(700, 550)
 
-        self.base_font_size = 12
-        self.update_fonts()
-        self.style = ttk.Style() # Initialize style object early
-        self.configure_styles()
-
-        try:
-            self.engine = pyttsx3.init()
-            self.engine.setProperty('rate', 150)
-        except Exception as e:
-            self.engine = None
-            print(f"TTS Initialization Warning: {e}")
-            messagebox.showwarning("TTS Warning", f"Text-to-speech engine failed.\nError: {e}\nPlayback disabled.")
-
-        self.word_manager = WordListManager()
-        self.misspelled_words = []
-        self.misspelled_tracking = {}
-        self.current_word_index = -1
-        self.practicing_misspelled = False
-        self.presented_indices = set()
-
-        self._create_widgets()
+        with self.startup_timer.phase("fonts and styles"):
+            self.base_font_size = 12
+            self.update_fonts()
+            self.style = ttk.Style() # Initialize style object early
+            self.configure_styles()
+
+        self.speech = SpeechWorker(rate=self.TTS_RATE) # Owns the TTS engine in a separate process, started once the window is up
+        self.speech_request = None
+        self._pending_prefetch = None # Next word to render into the audio cache once the current word has been spoken
+
+        with self.startup_timer.phase("word lists"):
+            self.word_manager = WordListManager()
+            self.session = PracticeSession(self.word_manager)
+            self.word_manager.add_change_listener(lambda *change: self.update_progress_label())
+            self.store = self._open_store(database) if database else None
+            self.review_decks = {} # List name -> ReviewScheduler, loaded when first reviewed
+            self.journal = None # AttemptJournal, opened once the first list is loaded
+            self.importer = None # WordImporter while a list is being imported
+            self.progress_path = default_snapshot_path() # Where the current pass is saved, to resume it after a restart
+            self._saved_progress = None # Position last written there, so unchanged progress is not rewritten
+            self._real_word_build = None # vocabulary_version of the latest real-word index build
+
+        with self.startup_timer.phase("widget construction"):
+            self._create_widgets()
+        self.root.after_idle(self._start_speech)
         self._initial_setup()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<F12>", lambda event: self.show_latency_panel())
 
 
     def _create_widgets(self):
@@ -93,6 +127,12 @@ class SpellingApp:
             if default_list in available_lists: self.word_list_dropdown.set(default_list)
             else: self.word_list_dropdown.current(0)
         self.word_list_dropdown.bind("<<ComboboxSelected>>", self.change_word_list)
+        self.focus_label = ttk.Label(list_frame, text="Focus:", font=self.normal_font, style='TLabel')
+        self.focus_label.grid(row=0, column=2, padx=(10, 5), sticky="w")
+        self.focus_var = StringVar(value=self.ALL_WORDS_FOCUS)
+        self.focus_dropdown = ttk.Combobox(list_frame, textvariable=self.focus_var, values=[self.ALL_WORDS_FOCUS] + list(FEATURE_FILTERS.values()), state="readonly", width=14, style='TCombobox')
+        self.focus_dropdown.grid(row=0, column=3, sticky="e")
+        self.focus_dropdown.bind("<<ComboboxSelected>>", self.change_focus)
 
         # --- Word Interaction ---
         interaction_frame = ttk.Frame(self.main_frame, style='TFrame')
@@ -100,7 +140,7 @@ class SpellingApp:
         interaction_frame.columnconfigure(1, weight=1)
         self.play_button = ttk.Button(interaction_frame, text="🔊 Play Word", command=self.play_word, style='TButton')
         self.play_button.grid(row=0, column=0, padx=(0,10))
-        if not self.engine: self.play_button.config(state=tk.DISABLED)
+        self.play_button.config(state=tk.DISABLED) # Enabled once the speech worker is ready
         self.user_input = ttk.Entry(interaction_frame, font=self.entry_font, style='TEntry')
         self.user_input.grid(row=0, column=1, sticky="ew", ipady=5)
         self.user_input.bind("<Return>", lambda event: self.check_spelling())
@@ -109,6 +149,14 @@ class SpellingApp:
         self.submit_button.grid(row=0, column=2, padx=(10, 5))
         self.hint_button = ttk.Button(interaction_frame, text="Hint", command=self.show_hint, style='TButton')
         self.hint_button.grid(row=0, column=3, padx=(0, 0))
+        self.live_check_var = tk.BooleanVar(value=False)
+        self.live_check_box = ttk.Checkbutton(interaction_frame, text="Live check", variable=self.live_check_var, command=self.toggle_live_check, style='TCheckbutton')
+        self.live_check_box.grid(row=1, column=1, pady=(5, 0), sticky="w")
+        self.weak_words_var = tk.BooleanVar(value=False)
+        self.weak_words_box = ttk.Checkbutton(interaction_frame, text="Focus on weak words", variable=self.weak_words_var, command=self.toggle_weak_words, style='TCheckbutton')
+        self.weak_words_box.grid(row=1, column=1, pady=(5, 0), sticky="e")
+        self._live_feedback_shown = False
+        self.user_input.bind("<KeyRelease>", self._on_input_changed, add="+")
 
         # --- Feedback & Progress ---
         self.feedback_label = ttk.Label(self.main_frame, text="Select a list to begin.", font=self.feedback_font, anchor="center", style='TLabel')
@@ -122,12 +170,18 @@ class SpellingApp:
         action_button_frame.columnconfigure(0, weight=1)
         action_button_frame.columnconfigure(1, weight=1)
         action_button_frame.columnconfigure(2, weight=1)
+        action_button_frame.columnconfigure(3, weight=1)
         self.save_button = ttk.Button(action_button_frame, text="Save Misspelled", command=self.save_misspelled_words, style='TButton')
         self.save_button.grid(row=0, column=0, padx=5, sticky="ew")
         self.load_button = ttk.Button(action_button_frame, text="Load Misspelled", command=self.load_misspelled_words, style='TButton')
         self.load_button.grid(row=0, column=1, padx=5, sticky="ew")
         self.practice_button = ttk.Button(action_button_frame, text="Practice Misspelled", command=self.practice_misspelled_words, style='TButton')
         self.practice_button.grid(row=0, column=2, padx=5, sticky="ew")
+        self.review_button = ttk.Button(action_button_frame, text="Review Due", command=self.review_due_words, style='TButton')
+        self.review_button.grid(row=0, column=3, padx=5, sticky="ew")
+        action_button_frame.columnconfigure(4, weight=1)
+        self.import_button = ttk.Button(action_button_frame, text="Import List...", command=self.import_word_list, style='TButton')
+        self.import_button.grid(row=0, column=4, padx=5, sticky="ew")
 
         # --- Misspelled Log ---
         misspelled_frame = ttk.Frame(self.main_frame, style='TFrame')
@@ -141,7 +195,7 @@ class SpellingApp:
         self.misspelled_list.config(state=tk.DISABLED)
         scrollbar = ttk.Scrollbar(misspelled_frame, orient=tk.VERTICAL, command=self.misspelled_list.yview, style='TScrollbar')
         scrollbar.grid(row=1, column=1, sticky="ns")
-        self.misspelled_list['yscrollcommand'] = scrollbar.set
+        self.misspelled_log_view = MisspelledLogView(self.misspelled_list, scrollbar)
 
     def _initial_setup(self):
         """Sets initial focus and loads the first word if lists exist."""
@@ -149,9 +203,128 @@ class SpellingApp:
         self.update_widget_fonts() # Apply fonts after widgets created
 
         if self.word_manager.get_available_lists():
-            self.root.after(100, lambda: self.change_word_list(event=None))
+            self.root.after_idle(self._load_first_list)
         else:
             self.feedback_label.config(text="No word lists found.", foreground=self.INCORRECT_COLOR)
+            self.session.attempt_store = self.store
+            self._startup_phase_done("word list")
+
+    def _load_first_list(self):
+        """Loads the first list once the window has been drawn."""
+        self.startup_timer.record("window shown (since launch)", self.startup_timer.elapsed())
+        with self.startup_timer.phase("first list load"):
+            progress = read_snapshot(self.progress_path)
+            if progress and progress.get('list') in self.word_manager.get_available_lists(): self.word_list_var.set(progress['list'])
+            self.change_word_list(event=None)
+        with self.startup_timer.phase("session restore"):
+            self._restore_session()
+            if progress: self._resume_progress(progress)
+        self._rebuild_real_word_index()
+        self._autosave()
+        self._startup_phase_done("word list")
+
+    def _restore_session(self):
+        """Replays the attempt journal into the session, then journals (and stores) every new attempt."""
+        try:
+            journal = AttemptJournal()
+            journal.replay(self.session)
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            print(f"Error opening attempt journal: {e}")
+            return
+        finally:
+            self.session.attempt_store = self.store # Only now: replayed attempts are already in the database
+        self.journal = self.session.journal = journal
+        if self.session.misspelled_words: self.update_misspelled_list_display()
+
+    def _resume_progress(self, progress):
+        """Puts the learner back on the word the last run stopped at, if the snapshot still matches the list."""
+        if not self.session.restore_progress(progress): return
+        self._saved_progress = self._progress_key()
+        self.weak_words_var.set(self.session.weighted)
+        self.focus_var.set(next((FEATURE_FILTERS[key] for key in self.session.feature_filter if key in FEATURE_FILTERS), self.ALL_WORDS_FOCUS))
+        self._pending_prefetch = self.session.peek_next_word()
+        self.update_progress_label()
+        self.feedback_label.config(text=f"Resumed where you left off ({self.session.presented_count}/{self.session.total_words}). Listen...", foreground=self.FG_COLOR)
+        self.schedule_double_play()
+
+    def _progress_key(self):
+        session = self.session
+        return (self.word_manager.get_active_list_name(), session.practicing_misspelled, session.weighted, session.feature_filter, session.presented_count, session.total_words, session.current_word_index)
+
+    def _save_progress(self):
+        """Writes the current pass to the progress snapshot if it moved since the last write."""
+        key = self._progress_key()
+        if key == self._saved_progress: return
+        state = self.session.progress_state()
+        if state is None: return
+        try:
+            os.makedirs(os.path.dirname(self.progress_path), exist_ok=True)
+            write_snapshot(self.progress_path, state)
+            self._saved_progress = key
+        except OSError as e: print(f"Error saving practice progress: {e}")
+
+    def _rebuild_real_word_index(self):
+        """Reads the --dictionary file (first time only), then loads or rebuilds the index of every list's words, both on the I/O thread."""
+        self.session.real_words = None
+        if not self.dictionary or self.word_manager.dictionary_words: return self._build_real_word_index()
+        def read_dictionary(task):
+            from word_import import WordImporter
+            importer = WordImporter(self.dictionary)
+            importer.run()
+            if importer.error: raise ValueError(importer.error)
+            return importer.word_list
+        def read(task):
+            if task.error: print(f"Error reading dictionary {self.dictionary}: {task.error}")
+            else: self.word_manager.set_dictionary(task.result)
+            self._build_real_word_index()
+        self.io.submit("Reading dictionary", read_dictionary, on_done=read)
+
+    def _build_real_word_index(self):
+        """Builds the real-word index on the I/O thread from words read here; wrong answers are checked against it once it is ready."""
+        from symspell_index import build_real_word_index, default_index_path
+        version = self.word_manager.vocabulary_version
+        words = self.word_manager.real_word_vocabulary() # Read on this thread: stored lists use a connection tied to it
+        self._real_word_build = version
+        def build(task):
+            return build_real_word_index(words, default_index_path())
+        def built(task):
+            if task.error: print(f"Error building real-word index: {task.error}")
+            elif self.word_manager.set_real_word_index(task.result, version): self.session.real_words = task.result
+            elif version == self._real_word_build: self._build_real_word_index() # Lists changed during the build, and no newer build is running
+        self.io.submit("Building real-word index", build, on_done=built)
+
+    def _open_store(self, path):
+        """Opens the SQLite backend: lists come from it (seeded with the current lists if empty) and, once the journal is replayed, attempts go to it."""
+        import sqlite3
+        from word_store import WordStore
+        try:
+            store = WordStore(path)
+            if store.list_names(): self.word_manager.load_from_store(store)
+            else: self.word_manager.save_to_store(store)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error opening database {path}: {e}")
+            return None
+        return store
+
+    def _autosave(self):
+        """Fsyncs journaled attempts and commits stored ones in batches, then reschedules itself."""
+        if self.journal: self.journal.sync(self.session)
+        if self.store: self.store.flush()
+        self._save_progress()
+        self.root.after(self.AUTOSAVE_MS, self._autosave)
+
+    def _start_speech(self):
+        """Starts the speech worker in the background; the Play button enables itself when it is ready."""
+        self._speech_start_time = time.perf_counter()
+        self.speech.start()
+        self._poll_speech()
+
+    def _startup_phase_done(self, name):
+        """Prints the startup timing report once every background phase has finished."""
+        if name not in self._startup_pending: return
+        self._startup_pending.discard(name)
+        if not self._startup_pending and self.show_startup_timing:
+            print(self.startup_timer.report())
 
     def update_fonts(self):
         """Updates font objects based on base_font_size."""
@@ -170,8 +343,10 @@ class SpellingApp:
         self.style.configure('TLabel', font=self.normal_font)
         self.style.configure('TEntry', font=self.entry_font)
         self.style.configure('TCombobox', font=self.normal_font)
+        self.style.configure('TCheckbutton', font=self.small_font)
         self.header_label.config(font=self.header_font)
         self.list_label.config(font=self.normal_font)
+        self.focus_label.config(font=self.normal_font)
         self.feedback_label.config(font=self.feedback_font)
         self.progress_label.config(font=self.small_font)
         self.misspelled_label.config(font=self.normal_bold_font)
@@ -200,6 +375,9 @@ class SpellingApp:
         self.style.configure('TButton', background=self.BUTTON_BG_COLOR, foreground=self.FG_COLOR, font = self.button_font, borderwidth=1, relief=tk.RAISED, padding=(10, 5), anchor=tk.CENTER)
         self.style.map('TButton', background=[('active', self.BUTTON_ACTIVE_BG_COLOR), ('pressed', self.BUTTON_ACTIVE_BG_COLOR), ('disabled', '#555')], foreground=[('disabled', '#999')], relief=[('pressed', tk.SUNKEN), ('!pressed', tk.RAISED)])
         self.style.configure('TEntry', fieldbackground=self.INPUT_BG_COLOR, foreground=self.FG_COLOR, insertcolor=self.FG_COLOR, borderwidth=1, relief=tk.SUNKEN, padding=(5, 5))
+        self.style.configure('Invalid.TEntry', foreground=self.INCORRECT_COLOR)
+        self.style.configure('TCheckbutton', background=self.BG_COLOR, foreground=self.FG_COLOR, indicatorbackground=self.INPUT_BG_COLOR, indicatorforeground=self.FG_COLOR)
+        self.style.map('TCheckbutton', background=[('active', self.BG_COLOR)], indicatorbackground=[('selected', self.BUTTON_ACTIVE_BG_COLOR)])
         self.root.option_add('*TCombobox*Listbox.background', self.INPUT_BG_COLOR)
         self.root.option_add('*TCombobox*Listbox.foreground', self.FG_COLOR)
         self.root.option_add('*TCombobox*Listbox.selectBackground', self.BUTTON_ACTIVE_BG_COLOR)
@@ -211,68 +389,78 @@ class SpellingApp:
 
     # --- Word Playback ---
     def schedule_double_play(self):
-        """Plays the current word twice with a delay, using threads."""
-        if not self.engine or self.play_button['state'] == tk.DISABLED: return
+        """Plays the current word twice with a delay, superseding any word still playing."""
+        if not self.speech.ready: return
         current_word = self.get_current_word()
         if not current_word: return
 
         self.play_button.config(state=tk.DISABLED)
-        thread1 = threading.Thread(target=self._speak_word_and_schedule_next, args=(current_word,), daemon=True)
-        thread1.start()
-
-    def _speak_word_and_schedule_next(self, word_to_speak):
-        """TTS helper: Speaks once, schedules second play."""
-        try:
-            self.engine.say(word_to_speak)
-            self.engine.runAndWait()
-            self.root.after(1000, lambda: self._schedule_second_play(word_to_speak))
-        except Exception as e:
-            print(f"TTS Error (1st play): {e}")
-            self.root.after(0, self._enable_play_button)
-
-    def _schedule_second_play(self, word_to_speak):
-        """TTS helper: Schedules the second speak in a thread."""
-        if not self.engine:
-             self._enable_play_button()
-             return
-        thread2 = threading.Thread(target=self._speak_second_time, args=(word_to_speak,), daemon=True)
-        thread2.start()
-
-    def _speak_second_time(self, word_to_speak):
-        """TTS helper: Speaks second time, re-enables button."""
-        try:
-             self.engine.say(word_to_speak)
-             self.engine.runAndWait()
-        except Exception as e:
-             print(f"TTS Error (2nd play): {e}")
-        finally:
-            self.root.after(0, self._enable_play_button)
+        if not self.latency.active: self.latency.begin(current_word, "play") # A replay rather than a new word after an answer
+        self.speech_request = self.speech.speak(current_word, repeat=2, gap=1.0)
+        self.latency.mark("speak queued")
+        self.latency.bind_request(self.speech_request, current_word)
+
+    def _poll_speech(self):
+        """Handles events from the speech worker, then polls again."""
+        for kind, request_id, detail in self.speech.poll():
+            if kind == "mark":
+                self.latency.mark(*detail, request_id=request_id)
+                continue
+            if kind in ("ready", "failed") and "speech engine" in self._startup_pending:
+                self.startup_timer.record("speech engine (background)", time.perf_counter() - self._speech_start_time)
+                self._startup_phase_done("speech engine")
+            if kind == "ready":
+                if self.speech_request is None and self.get_current_word(): self.schedule_double_play() # First word was chosen before the engine was up
+                else: self._enable_play_button()
+            elif kind == "failed":
+                print(f"TTS Initialization Warning: {detail}")
+                try: self.play_button.config(state=tk.DISABLED)
+                except tk.TclError: pass
+                messagebox.showwarning("TTS Warning", f"Text-to-speech engine failed.\nError: {detail}\nPlayback disabled.")
+            elif kind == "error":
+                print(f"TTS Error: {detail}")
+            if kind in ("done", "cancelled", "error", "restarted") and request_id == self.speech_request:
+                self.latency.finish(request_id)
+                self._enable_play_button()
+                self._send_prefetch()
+        if not self.speech.failed:
+            self.root.after(self.SPEECH_POLL_MS, self._poll_speech)
+
+    def _send_prefetch(self):
+        """Hands the pending next word to the worker; only sent once a speak has finished, since the worker renders it before anything queued after it."""
+        upcoming_word, self._pending_prefetch = self._pending_prefetch, None
+        if upcoming_word and self.speech.ready: self.speech.prefetch(upcoming_word)
 
     def _enable_play_button(self):
         """Safely enables the play button."""
-        if self.engine:
+        if self.speech.ready:
             try: self.play_button.config(state=tk.NORMAL)
             except tk.TclError: pass # Ignore if window closing
 
+    def on_close(self):
+        """Saves review decks, stops the speech worker and closes the window."""
+        if self.importer: self.importer.cancel()
+        if self.watchdog: self.watchdog.stop()
+        self.io.shutdown(wait=True) # Lets saves already under way finish
+        self.save_review_decks()
+        self._save_progress()
+        if self.journal: self.journal.close(self.session)
+        if self.store: self.store.close()
+        if self.latency_dump:
+            try: self.latency.dump(self.latency_dump)
+            except OSError as e: print(f"Error writing latency dump: {e}")
+        self.speech.stop()
+        self.root.destroy()
+
     # --- Word/List Management ---
     def _select_next_random_word(self):
         """Selects a random, unpresented word from the current list."""
-        word_list = self.misspelled_words if self.practicing_misspelled else self.word_manager.get_active_list()
-        total_words = len(word_list)
-        if total_words == 0:
-            self.current_word_index = -1
+        if not self.session.select_next_word():
             self.update_progress_label()
-            self.feedback_label.config(text="List is empty.", foreground=self.FG_COLOR)
-            return False
+            if self.session.total_words == 0: self.feedback_label.config(text="List is empty.", foreground=self.FG_COLOR)
+            return False # List empty or finished
 
-        available_indices = [i for i in range(total_words) if i not in self.presented_indices]
-        if not available_indices:
-            self.current_word_index = -1
-            self.update_progress_label()
-            return False # List finished
-
-        self.current_word_index = random.choice(available_indices)
-        self.presented_indices.add(self.current_word_index)
+        self._pending_prefetch = self.session.peek_next_word() # Rendered into the audio cache while the learner types
         self.update_progress_label()
         self.feedback_label.config(text="") # Clear previous feedback
         return True
@@ -292,6 +480,10 @@ class SpellingApp:
                  return
 
         if self.word_manager.set_active_list(selected_list):
+            baked = pack_path(selected_list)
+            self.speech.set_audio_pack(baked if os.path.exists(baked) else None)
+            self.word_manager.get_feature_index() # Built once per list so hints and focus filters are lookups
+            if self.live_check_var.get(): self.word_manager.get_prefix_index()
             self.reset_practice_state()
             if self._select_next_random_word():
                 self.schedule_double_play()
@@ -299,38 +491,44 @@ class SpellingApp:
             else:
                 self.feedback_label.config(text=f"Switched to '{selected_list}' (List is empty).", foreground=self.INCORRECT_COLOR)
                 self.update_progress_label()
-            self.misspelled_words = []
-            self.misspelled_tracking = {}
+            self.session.clear_misspelled()
             self.update_misspelled_list_display()
         else:
             messagebox.showerror("Error", f"Could not switch to list: {selected_list}")
         self.user_input.focus_set()
 
+    def change_focus(self, event=None):
+        """Restarts the current list limited to words with the selected pitfall."""
+        selected = self.focus_var.get()
+        keys = [key for key, label in FEATURE_FILTERS.items() if label == selected]
+        self.session.set_feature_filter(*keys)
+        self.switch_to_regular_mode()
+        if not self.session.total_words:
+            self.feedback_label.config(text=f"No words in this list match '{selected}'.", foreground=self.INCORRECT_COLOR)
+
+    def toggle_weak_words(self):
+        """Switches the active list between one shuffled pass and a drill weighted towards often-missed words."""
+        self.session.set_weighted(self.weak_words_var.get())
+        self.switch_to_regular_mode()
+
     def reset_practice_state(self):
         """Resets state variables for a new practice session or list change."""
-        self.current_word_index = -1
-        self.practicing_misspelled = False
-        self.presented_indices.clear()
+        self.session.reset()
         try:
             self.user_input.delete(0, tk.END)
+            self._clear_live_feedback()
             self.user_input.focus_set()
         except tk.TclError: pass
 
     def get_current_word(self):
         """Safely gets the current word based on index and mode."""
-        if self.current_word_index == -1: return None
-        word_list = self.misspelled_words if self.practicing_misspelled else self.word_manager.get_active_list()
-        if word_list and 0 <= self.current_word_index < len(word_list):
-            return word_list[self.current_word_index]
-        else:
-            self.current_word_index = -1 # Invalid state
-            return None
+        return self.session.get_current_word()
 
     def play_word(self):
         """Plays the current word (triggered by button)."""
-        if not self.engine:
+        if not self.speech.ready:
              self.feedback_label.config(text="TTS engine not available.", foreground=self.INCORRECT_COLOR)
-             if not self.engine: self.play_button.config(state=tk.DISABLED)
+             self.play_button.config(state=tk.DISABLED)
              return
         current_word = self.get_current_word()
         if current_word:
@@ -342,63 +540,83 @@ class SpellingApp:
     # --- Spelling Check & Progression ---
     def check_spelling(self):
         """Checks the user's input against the correct spelling."""
-        current_word = self.get_current_word()
-        if not current_word:
+        if not self.get_current_word():
             self.feedback_label.config(text="No spelling word to check.", foreground=self.INCORRECT_COLOR)
             return
 
-        user_spelling = self.user_input.get().strip()
-        correct_spelling = current_word
-        is_correct = (user_spelling.lower() == correct_spelling.lower())
-
+        self.latency.begin(self.get_current_word(), "enter")
+        self._clear_live_feedback()
+        is_correct, correct_spelling = self.session.grade(self.user_input.get())
+        self.latency.mark("graded")
         if is_correct:
             self.feedback_label.config(text="Correct! ✓", foreground=self.CORRECT_COLOR)
-            if correct_spelling in self.misspelled_tracking:
-                 self.misspelled_tracking[correct_spelling]['correct_attempts'] = self.misspelled_tracking[correct_spelling].get('correct_attempts', 0) + 1
-                 self.update_misspelled_list_display()
+            if correct_spelling in self.session.misspelled:
+                 self.update_misspelled_list_display(correct_spelling)
         else:
-            self.feedback_label.config(text=f"Incorrect! Correct: '{correct_spelling}'", foreground=self.INCORRECT_COLOR)
-            if correct_spelling not in self.misspelled_words:
-                 self.misspelled_words.append(correct_spelling)
-            if correct_spelling not in self.misspelled_tracking:
-                self.misspelled_tracking[correct_spelling] = {'incorrect_attempts': 0, 'correct_attempts': 0, 'user_attempts': []}
-
-            tracking_entry = self.misspelled_tracking[correct_spelling]
-            tracking_entry['incorrect_attempts'] = tracking_entry.get('incorrect_attempts', 0) + 1
-            attempt = user_spelling if user_spelling else "(empty)"
-            if attempt not in tracking_entry.get('user_attempts', []):
-                tracking_entry['user_attempts'] = tracking_entry.get('user_attempts', [])[-4:] + [attempt] # Keep last 5 attempts
-
-            self.update_misspelled_list_display()
-
+            other_words = self.session.last_confused_with
+            if other_words and other_words[0].lower() == self.user_input.get().strip().lower(): message = f"Incorrect! '{other_words[0]}' is a different word. Correct: '{correct_spelling}'"
+            elif other_words: message = f"Incorrect! Did you mean '{other_words[0]}'? Correct: '{correct_spelling}'"
+            else: message = f"Incorrect! Correct: '{correct_spelling}'"
+            self.feedback_label.config(text=message, foreground=self.INCORRECT_COLOR)
+            self.update_misspelled_list_display(correct_spelling)
+        self.latency.mark("feedback shown")
+
+        self.speech.cancel() # The learner has moved on; stop any playback still running
+        self._enable_play_button()
         self.user_input.delete(0, tk.END)
         self.root.after(1500, self.next_word)
 
+    # --- Live Feedback ---
+    def toggle_live_check(self):
+        """Turns per-keystroke prefix feedback on or off."""
+        if self.live_check_var.get(): self.word_manager.get_prefix_index() # Build now rather than on the first keystroke
+        self._on_input_changed()
+
+    def _on_input_changed(self, event=None):
+        """Flags the first typed letter that no word in the active list continues with."""
+        text = self.user_input.get().lstrip()
+        mismatch = self.word_manager.get_prefix_index().first_mismatch(text) if self.live_check_var.get() and text else -1
+        if mismatch == -1: return self._clear_live_feedback()
+        self.user_input.config(style='Invalid.TEntry')
+        self.feedback_label.config(text=f"Check letter {mismatch + 1}: no word starts with '{text[:mismatch + 1]}'.", foreground=self.INCORRECT_COLOR)
+        self._live_feedback_shown = True
+
+    def _clear_live_feedback(self):
+        """Removes the live-feedback highlight and message, leaving other feedback alone."""
+        if not self._live_feedback_shown: return
+        self.user_input.config(style='TEntry')
+        self.feedback_label.config(text="")
+        self._live_feedback_shown = False
+
     def next_word(self):
         """Moves to the next word or shows results if finished."""
+        self.latency.mark("next word")
         word_selected = self._select_next_random_word()
+        self.latency.mark("selected")
         if word_selected:
             self.schedule_double_play()
             self.user_input.focus_set()
         else:
-            if self.practicing_misspelled: self.show_practice_results()
+            self.latency.finish()
+            if self.session.review_scheduler: self.show_review_results()
+            elif self.session.practicing_misspelled: self.show_practice_results()
             else: self.show_results()
 
     def update_progress_label(self):
         """Updates the label showing current progress."""
-        word_list = self.misspelled_words if self.practicing_misspelled else self.word_manager.get_active_list()
-        word_list = word_list if isinstance(word_list, list) else []
-        total_words = len(word_list)
-        presented_count = len(self.presented_indices)
+        total_words = self.session.total_words
+        presented_count = self.session.presented_count
         list_name = self.word_manager.get_active_list_name()
-        mode = "Practicing Misspelled" if self.practicing_misspelled else f"List: '{list_name}'" if list_name else "List: (None)"
+        mode = "Reviewing Due Words" if self.session.review_scheduler else "Practicing Misspelled" if self.session.practicing_misspelled else f"List: '{list_name}'" if list_name else "List: (None)"
 
         progress_text = f"{mode} - "
         if total_words == 0:
              progress_text += "List is empty" if list_name else "No list selected"
+        elif self.session.weighted and not (self.session.review_scheduler or self.session.practicing_misspelled):
+             progress_text += f"Weak-word drill: word {presented_count} ({total_words} words)"
         elif presented_count >= total_words:
              progress_text += f"Completed ({total_words}/{total_words})"
-        elif self.current_word_index == -1 and presented_count == 0:
+        elif self.session.current_word_index == -1 and presented_count == 0:
              progress_text += f"0/{total_words} (Ready)"
         else:
             progress_text += f"Word {presented_count}/{total_words}"
@@ -409,12 +627,12 @@ class SpellingApp:
         """Displays results after finishing a regular list."""
         active_list_name = self.word_manager.get_active_list_name()
         active_list = self.word_manager.get_active_list()
-        total_words = len(active_list) if isinstance(active_list, list) else 0
+        total_words = self.session.total_words
 
         if total_words == 0:
             messagebox.showinfo("Practice Complete", f"The list '{active_list_name}' is empty.")
         else:
-            session_misspelled_count = len([w for w in self.misspelled_words if w in active_list])
+            session_misspelled_count = self.session.count_misspelled_in(active_list)
             messagebox.showinfo("Practice Complete", f"Finished '{active_list_name}' list!\n\nTotal Words: {total_words}\nMisspelled this session: {session_misspelled_count}")
 
         self.reset_practice_state()
@@ -424,12 +642,11 @@ class SpellingApp:
 
     def show_practice_results(self):
         """Displays results after practicing misspelled words."""
-        practiced_words = list(self.misspelled_tracking.keys())
-        total_practiced = len(practiced_words)
+        total_practiced = len(self.session.misspelled)
         if total_practiced == 0:
              messagebox.showinfo("Practice Complete", "No misspelled words were practiced.")
         else:
-            correct_this_round = sum(1 for word in practiced_words if self.misspelled_tracking[word].get('correct_attempts', 0) > 0)
+            correct_this_round = self.session.count_practiced_correct()
             messagebox.showinfo("Practice Complete", f"Finished practicing {total_practiced} words!\nCorrect this round: {correct_this_round}/{total_practiced}")
 
         self.switch_to_regular_mode()
@@ -437,10 +654,10 @@ class SpellingApp:
 
     def switch_to_regular_mode(self):
         """Switches back to regular mode after practice or load."""
-        self.practicing_misspelled = False
-        self.reset_practice_state()
         current_dropdown_list = self.word_list_var.get()
-        if self.word_manager.set_active_list(current_dropdown_list):
+        list_selected = self.word_manager.set_active_list(current_dropdown_list)
+        self.reset_practice_state()
+        if list_selected:
              if self._select_next_random_word():
                  self.schedule_double_play()
                  self.feedback_label.config(text=f"Resumed list '{current_dropdown_list}'. Listen...", fg=self.FG_COLOR)
@@ -453,73 +670,50 @@ class SpellingApp:
         self.user_input.focus_set()
 
     # --- Misspelled Log & Persistence ---
-    def update_misspelled_list_display(self):
-        """Updates the text area showing misspelled words and stats."""
+    def update_misspelled_list_display(self, word=None):
+        """Updates the text area showing misspelled words and stats; only `word`'s entry if given."""
         try:
-            last_pos = self.misspelled_list.yview()
-            self.misspelled_list.config(state=tk.NORMAL)
-            self.misspelled_list.delete(1.0, tk.END)
-            if not self.misspelled_words:
-                self.misspelled_list.insert(tk.END, "No words misspelled yet.")
-            else:
-                lines = []
-                for word in self.misspelled_words:
-                    info = self.misspelled_tracking.get(word, {})
-                    inc = info.get('incorrect_attempts', 0)
-                    cor = info.get('correct_attempts', 0)
-                    atts = info.get('user_attempts', [])[-3:] # Last 3 attempts
-                    entry = f"• {word} (Inc: {inc}, Cor: {cor})"
-                    if atts: entry += f"\n   Attempts: {', '.join([f'{a}' for a in atts])}"
-                    lines.append(entry)
-                self.misspelled_list.insert(tk.END, "\n".join(lines))
-            self.misspelled_list.config(state=tk.DISABLED)
-            self.misspelled_list.yview_moveto(last_pos[0])
+            if word is None: self.misspelled_log_view.refresh(self.session.misspelled_words, self.session.misspelled)
+            else: self.misspelled_log_view.update_word(word)
         except Exception as e: print(f"Error updating misspelled list: {e}")
 
     def save_misspelled_words(self):
         """Saves current misspelled words and tracking to JSON."""
-        if not self.misspelled_words:
+        if not self.session.misspelled_words:
             messagebox.showwarning("No Data", "No misspelled words to save.")
             return
         file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Log", "*.json"), ("All", "*.*")], title="Save Misspelled Log")
         if not file_path: return
-        data_to_save = {'saved_misspelled_words': self.misspelled_words, 'saved_tracking_data': self.misspelled_tracking}
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data_to_save, f, indent=2, ensure_ascii=False)
-            messagebox.showinfo("Success", f"Log saved to:\n{file_path}")
-        except Exception as e: messagebox.showerror("Save Error", f"Failed to save:\n{e}")
+        def saved(task):
+            if task.error: messagebox.showerror("Save Error", f"Failed to save:\n{task.error}")
+            else:
+                self.feedback_label.config(text="", foreground=self.FG_COLOR)
+                messagebox.showinfo("Success", f"Log saved to:\n{file_path}")
+        self._run_file_task(self.save_button, self.save_misspelled_words, "Saving log", write_json, file_path, self.session.snapshot_saved_data(), 2, on_done=saved)
 
     def load_misspelled_words(self):
         """Loads misspelled words and tracking from JSON."""
         file_path = filedialog.askopenfilename(filetypes=[("JSON Log", "*.json"), ("All", "*.*")], title="Load Misspelled Log")
         if not file_path: return
+        self._run_file_task(self.load_button, self.load_misspelled_words, "Loading log", read_json, file_path, on_done=self._apply_loaded_log)
+
+    def _apply_loaded_log(self, task):
+        """Replaces the tracked misspellings with a log read by load_misspelled_words."""
+        self.feedback_label.config(text="", foreground=self.FG_COLOR)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f: loaded_data = json.load(f)
+            if task.error: raise ValueError(task.error)
+            loaded_data = task.result
             if not isinstance(loaded_data, dict): raise ValueError("Invalid format.")
             words = loaded_data.get('saved_misspelled_words')
             tracking = loaded_data.get('saved_tracking_data')
             if not isinstance(words, list) or not isinstance(tracking, dict): raise ValueError("Invalid data types.")
 
-            self.misspelled_words = []
-            self.misspelled_tracking = {}
-            loaded_count, skipped_count = 0, 0
-            for word in words:
-                 if isinstance(word, str) and word:
-                     self.misspelled_words.append(word)
-                     loaded_count += 1
-                     word_tracking = tracking.get(word, {})
-                     self.misspelled_tracking[word] = {
-                         'incorrect_attempts': word_tracking.get('incorrect_attempts', 0),
-                         'correct_attempts': word_tracking.get('correct_attempts', 0),
-                         'user_attempts': word_tracking.get('user_attempts', []) }
-                 else: skipped_count += 1
-
+            loaded_count, skipped_count = self.session.load_tracking(words, tracking)
             self.update_misspelled_list_display()
             info_msg = f"Loaded {loaded_count} words." + (f" Skipped {skipped_count} invalid." if skipped_count else "")
             messagebox.showinfo("Load Successful", info_msg)
 
-            if self.misspelled_words:
+            if self.session.misspelled_words:
                  if messagebox.askyesno("Practice Loaded?", "Practice these words now?"):
                      self.practice_misspelled_words()
                  else:
@@ -530,16 +724,68 @@ class SpellingApp:
                  self.switch_to_regular_mode()
         except Exception as e: messagebox.showerror("Load Error", f"{e}")
 
+    def _run_file_task(self, button, command, description, fn, *args, on_done):
+        """Runs fn(task, *args) on the I/O thread, showing progress; `button` cancels it until on_done(task) runs on the Tk thread."""
+        def show_progress(task):
+            amount = f" {task.progress:.0%}" if task.progress is not None else ""
+            self.feedback_label.config(text=f"{description}... {task.status}{amount} (click Cancel to stop)", foreground=self.FG_COLOR)
+        def finished(task):
+            try: button.config(text=label, command=command)
+            except tk.TclError: return # Window closing
+            if task.cancelled: self.feedback_label.config(text=f"{description} cancelled.", foreground=self.FG_COLOR)
+            else: on_done(task)
+        label = button.cget('text')
+        task = self.io.submit(description, fn, *args, on_done=finished, on_progress=show_progress)
+        button.config(text="Cancel", command=task.cancel)
+
+    # --- List Import ---
+    def import_word_list(self):
+        """Imports a large text, CSV or JSON word file as a new list, on a background thread."""
+        if self.importer: return
+        file_path = filedialog.askopenfilename(filetypes=[("Word Files", "*.txt *.csv *.tsv *.json *.jsonl"), ("All", "*.*")], title="Import Word List")
+        if not file_path: return
+        list_name = simpledialog.askstring("List Name", "Name for the imported list:", initialvalue=os.path.splitext(os.path.basename(file_path))[0], parent=self.root)
+        if not list_name: return
+        if list_name in self.word_manager.get_available_lists() and not messagebox.askyesno("Replace List?", f"Replace the existing list '{list_name}'?"): return
+        from word_import import WordImporter
+        try: self.importer = WordImporter(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import Error", f"{e}")
+            return
+        self.import_button.config(state=tk.DISABLED)
+        self.importer.start()
+        self._poll_import(list_name)
+
+    def _poll_import(self, list_name):
+        """Shows import progress, and adds the list once the worker thread has finished."""
+        importer = self.importer
+        if not importer.done.is_set():
+            self.feedback_label.config(text=f"Importing '{list_name}'... {importer.progress:.0%} ({len(importer.word_list):,} words)", foreground=self.FG_COLOR)
+            self.root.after(self.IMPORT_POLL_MS, self._poll_import, list_name)
+            return
+        self.importer = None
+        self.import_button.config(state=tk.NORMAL)
+        if importer.error:
+            self.feedback_label.config(text="")
+            messagebox.showerror("Import Error", f"Failed to import:\n{importer.error}")
+            return
+        self.word_manager.add_custom_list(list_name, importer.word_list) # Handed over as is, not copied
+        self._rebuild_real_word_index()
+        if self.store:
+            import sqlite3
+            try: self.store.save_list(list_name, importer.word_list)
+            except sqlite3.Error as e: print(f"Error saving imported list to the database: {e}")
+        self.word_list_dropdown.config(values=self.word_manager.get_available_lists())
+        if list_name == self.word_manager.get_active_list_name(): self.change_word_list() # The list being practiced was replaced
+        self.feedback_label.config(text=f"Imported {len(importer.word_list):,} words into '{list_name}' ({importer.duplicates:,} duplicates, {importer.skipped:,} blank or invalid lines skipped).", foreground=self.FG_COLOR)
+
     def practice_misspelled_words(self):
         """Initiates practice mode for the current misspelled words."""
-        if not self.misspelled_words:
+        if not self.session.misspelled_words:
             messagebox.showinfo("No Data", "No misspelled words to practice.")
             return
-        self.practicing_misspelled = True
-        self.current_word_index = -1
-        self.presented_indices.clear()
-        for word in self.misspelled_tracking: # Reset counts for this round
-            self.misspelled_tracking[word]['correct_attempts'] = 0
+        self.session.start_misspelled_practice()
+        self.update_misspelled_list_display() # Correct counts were reset for this round
 
         if self._select_next_random_word():
              self.schedule_double_play()
@@ -551,6 +797,81 @@ class SpellingApp:
         self.user_input.delete(0, tk.END)
         self.user_input.focus_set()
 
+    # --- Spaced Repetition ---
+    def _review_deck(self, list_name):
+        """Returns the review deck for a list, loading it from disk the first time."""
+        if list_name not in self.review_decks:
+            from review_scheduler import ReviewScheduler, deck_path
+            try: self.review_decks[list_name] = ReviewScheduler.load(deck_path(list_name))
+            except (OSError, ValueError) as e:
+                print(f"Error loading review deck for {list_name}: {e}")
+                self.review_decks[list_name] = ReviewScheduler()
+        return self.review_decks[list_name]
+
+    def save_review_decks(self, background=False):
+        """Writes every deck opened this run back to disk, on the I/O thread if background is set."""
+        if not self.review_decks: return
+        from review_scheduler import deck_path
+        for list_name, scheduler in self.review_decks.items():
+            if background:
+                self.io.submit(f"Saving review deck for {list_name}", write_json, deck_path(list_name), scheduler.to_saved_data(), None, (",", ":"))
+                continue
+            try: scheduler.save(deck_path(list_name))
+            except OSError as e: print(f"Error saving review deck for {list_name}: {e}")
+
+    def review_due_words(self):
+        """Starts a spaced-repetition review of the active list's due words."""
+        self.session.start_review(self._review_deck(self.word_manager.get_active_list_name()))
+        if self._select_next_random_word():
+            self.schedule_double_play()
+            self.feedback_label.config(text="Reviewing due words...", fg=self.FG_COLOR)
+            self.user_input.delete(0, tk.END)
+            self.user_input.focus_set()
+        else:
+            self.show_review_results()
+
+    def show_review_results(self):
+        """Reports the end of a review, with when the next word falls due, and saves the deck."""
+        reviewed = self.session.presented_count
+        next_due = self.session.review_scheduler.next_due_time()
+        self.save_review_decks(background=True)
+        message = f"Reviewed {reviewed} words." if reviewed else "No words are due for review."
+        if next_due: message += f"\nNext review due: {time.strftime('%Y-%m-%d %H:%M', time.localtime(next_due))}"
+        messagebox.showinfo("Review Complete", message)
+        self.switch_to_regular_mode()
+
+    # --- Latency Debug Panel ---
+    def show_latency_panel(self):
+        """Opens (or raises) a window with live answer-to-audio latency percentiles for each stage."""
+        if self.latency_panel and self.latency_panel.winfo_exists():
+            self.latency_panel.lift()
+            return
+        panel = self.latency_panel = tk.Toplevel(self.root, bg=self.BG_COLOR)
+        panel.title("Latency")
+        text = tk.Text(panel, width=90, height=24, font=("Courier", 10), bg=self.INPUT_BG_COLOR, fg=self.FG_COLOR, relief=tk.FLAT, state=tk.DISABLED)
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        ttk.Button(panel, text="Save JSON...", command=self.save_latency_dump, style='TButton').pack(pady=(0, 10))
+
+        def refresh():
+            if not panel.winfo_exists(): return
+            lines = [self.latency.report()]
+            if self.latency.recent:
+                trace = self.latency.recent[-1]
+                lines += ["", f"Last word: {trace['word']}"] + [f"  {offset * 1000:9.1f} ms  {stage}" for stage, offset in trace['marks']]
+            text.config(state=tk.NORMAL)
+            text.delete("1.0", tk.END)
+            text.insert("1.0", "\n".join(lines))
+            text.config(state=tk.DISABLED)
+            panel.after(self.LATENCY_PANEL_MS, refresh)
+        refresh()
+
+    def save_latency_dump(self):
+        """Saves the latency histograms and recent traces as JSON."""
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json"), ("All", "*.*")], title="Save Latency Data")
+        if not file_path: return
+        try: self.latency.dump(file_path)
+        except OSError as e: messagebox.showerror("Save Error", f"Failed to save:\n{e}")
+
     # --- Hint Feature ---
     def show_hint(self):
         """Displays a contextual hint for the current word."""
@@ -559,29 +880,38 @@ class SpellingApp:
             self.feedback_label.config(text="No word active for hint.", fg=self.INCORRECT_COLOR)
             return
 
-        hints = []
-        w_lower = current_word.lower()
-        has_double = any(w_lower[i] == w_lower[i+1] and w_lower[i].isalpha() for i in range(len(w_lower)-1))
-        if has_double: hints.append("Watch for double letters.")
-        if 'ie' in w_lower or 'ei' in w_lower: hints.append("Check the 'i' before 'e' rule.")
-        sfx = {"tion":"sion", "able":"ible", "ance":"ence", "ary":"ery", "ify":"efy"}
-        for s1, s2 in sfx.items():
-            if w_lower.endswith(s1) or w_lower.endswith(s2):
-                hints.append(f"Ending: '-{s1}' or '-{s2}'?")
-                break
-        if not hints: hints.append(f"{len(current_word)} letters.")
-        if len(hints) < 2 and len(w_lower) > 1: hints.append(f"Starts '{current_word[0]}', ends '{current_word[-1]}'.")
-        if not hints:
-             generic = ["Silent letters?", "Homophones?", "Syllables?", "Root/Prefix/Suffix?"]
-             hints.append(f"Tip: {random.choice(generic)}")
-
+        if self.session.practicing_misspelled: hints = get_hints(current_word)
+        else: hints = self.word_manager.get_feature_index().hints(self.session.current_word_index)
         if hints: self.feedback_label.config(text=f"Hint: {random.choice(hints)}", fg=self.HINT_COLOR)
         else: self.feedback_label.config(text="Hint unavailable.", fg=self.HINT_COLOR)
         self.user_input.focus_set()
 
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    root.configure(bg=SpellingApp.BG_COLOR) # Set root BG early
-    app = SpellingApp(root)
+    parser = argparse.ArgumentParser(description="Spelling practice app.")
+    parser.add_argument("--startup-timing", action="store_true", help="print a breakdown of startup time")
+    parser.add_argument("--database", metavar="PATH", help="keep word lists and the full attempt history in this SQLite database")
+    parser.add_argument("--latency-dump", metavar="PATH", help="write answer-to-audio latency histograms to this JSON file on exit")
+    parser.add_argument("--profile", metavar="PATH", help="profile the whole session with cProfile and save the stats to this file")
+    parser.add_argument("--stall-threshold", type=int, default=DEFAULT_STALL_MS, metavar="MS", help=f"log whenever the window is blocked for longer than this (default {DEFAULT_STALL_MS} ms, 0 to turn off)")
+    parser.add_argument("--dictionary", metavar="PATH", help="word file (text, CSV or JSON) of extra real words for spotting answers that are a different word")
+    args = parser.parse_args()
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    startup_timer = StartupTimer(start=_IMPORT_START)
+    startup_timer.record("imports", startup_timer.elapsed())
+
+    with startup_timer.phase("Tk root"):
+        root = tk.Tk()
+        root.configure(bg=SpellingApp.BG_COLOR) # Set root BG early
+    app = SpellingApp(root, startup_timer=startup_timer, show_startup_timing=args.startup_timing, database=args.database, latency_dump=args.latency_dump, stall_threshold_ms=args.stall_threshold, dictionary=args.dictionary)
     root.mainloop()
+    if profiler:
+        import pstats
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+        print(f"Profile saved to {args.profile}; explore it with python -m pstats {args.profile}")
@@ -0,0 +1,271 @@
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7 # Deletes are generated from this many leading characters, which bounds the index size
+
+# Cache layout (little-endian):
+#   header    MAGIC, uint32 max distance, uint32 prefix length, 20-byte vocabulary signature,
+#             uint32 word count, uint32 delete count, uint32 words length, uint32 deletes length, uint32 posting count
+#   words     UTF-8 words separated by NUL, in id order
+#   deletes   uint32 offsets (delete count + 1) into a blob of UTF-8 deletes sorted by their bytes
+#   postings  uint32 offsets (delete count + 1) into uint32 word ids, one run per delete
+MAGIC = b"SPSYMS\x00\x01"
+HEADER = struct.Struct("<8sII20sIIIII")
+
+
+def default_index_path():
+    """Returns the per-user file the real-word index is cached in between runs."""
+    return os.path.join(os.path.expanduser("~"), ".spelling_app", "real_word_index.cache")
+
+
+def _deletes(key, max_distance, prefix_length):
+    """Returns every string made by deleting up to max_distance characters from the key's prefix, the prefix included."""
+    found = {key[:prefix_length]}
+    edge = found
+    for _ in range(max_distance):
+        edge = {term[:i] + term[i + 1:] for term in edge for i in range(len(term))} - found
+        found |= edge
+    return found
+
+
+def bounded_distance(a, b, limit):
+    """Optimal-string-alignment distance of a and b (as misspelling_analysis.damerau_levenshtein), or limit + 1 once it must exceed limit.
+
+    A common prefix and suffix cost nothing and are skipped, only the band of
+    cells within `limit` of the diagonal is filled, and the loop stops at
+    the first row whose every cell is already over the limit.
+    """
+    if abs(len(a) - len(b)) > limit: return limit + 1
+    start, end_a, end_b = 0, len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]: start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b: return min(max(len(a), len(b)), limit + 1)
+    over, width = limit + 1, len(b)
+    a, b = "\0" + a, "\1" + b # 1-based, with sentinels that never match, so the transposition test needs no bounds checks
+    blank = [over] * (width + 1)
+    previous_previous = blank
+    previous = [j if j <= limit else over for j in range(width + 1)]
+    for i in range(1, len(a)):
+        current = blank[:]
+        if i <= limit: current[0] = i
+        row_best = current[0]
+        char, before = a[i], a[i - 1]
+        first = i - limit if i > limit else 1
+        last = i + limit if i + limit < width else width
+        for j in range(first, last + 1):
+            best = previous[j - 1] if char == b[j] else previous[j - 1] + 1
+            if previous[j] < best: best = previous[j] + 1
+            if current[j - 1] < best: best = current[j - 1] + 1
+            if char == b[j - 1] and before == b[j] and previous_previous[j - 2] < best: best = previous_previous[j - 2] + 1
+            if best > over: best = over
+            current[j] = best
+            if best < row_best: row_best = best
+        if row_best > limit: return over
+        previous_previous, previous = previous, current
+    return previous[width] if previous[width] < over else over
+
+
+def vocabulary_signature(words):
+    """Fingerprints a vocabulary, ignoring order and case, to tell whether a cached index still matches it."""
+    digest = hashlib.sha1()
+    for key in sorted({word.lower() for word in words}): digest.update(key.encode('utf-8') + b"\0")
+    return digest.hexdigest()
+
+
+def _uint32s(data, start, count):
+    values = array('I')
+    values.frombytes(data[start:start + 4 * count])
+    if sys.byteorder == "big": values.byteswap()
+    return values
+
+
+class _DeleteTable:
+    """Read-only delete -> word ids table loaded from a cache file; sorted, so a delete is found by bisecting it."""
+
+    def __init__(self, term_offsets, terms, posting_offsets, postings):
+        self._term_offsets = term_offsets
+        self._terms = terms
+        self._posting_offsets = posting_offsets
+        self._postings = postings
+
+    def __len__(self):
+        return len(self._term_offsets) - 1
+
+    def __getitem__(self, i):
+        return self._terms[self._term_offsets[i]:self._term_offsets[i + 1]]
+
+    def ids(self, term):
+        """Returns the ids stored under a delete (as UTF-8 bytes)."""
+        i = bisect_left(self, term)
+        if i == len(self) or self[i] != term: return ()
+        return self._postings[self._posting_offsets[i]:self._posting_offsets[i + 1]]
+
+    def items(self):
+        """Yields (delete, ids) for every delete."""
+        for i in range(len(self)):
+            yield self[i].decode('utf-8'), self._postings[self._posting_offsets[i]:self._posting_offsets[i + 1]]
+
+
+class SymSpellIndex:
+    """Finds the real words within a small edit distance of a typed word (symmetric delete).
+
+    Every word is stored under each string obtained by deleting up to
+    `max_distance` characters from its first `prefix_length` characters.
+    A lookup generates the same deletes of the typed word, so the only
+    candidates it has to check with a real edit distance are the few words
+    sharing a delete, never the whole vocabulary. Matching ignores case.
+    An index loaded from its cache keeps the saved deletes as flat sorted
+    arrays, which load without rebuilding a dict entry per delete; words
+    added afterwards go into a small dict alongside them.
+    """
+
+    def __init__(self, words=(), max_distance=MAX_EDIT_DISTANCE, prefix_length=PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = [] # Id -> word as first added, None once discarded
+        self._ids = {} # Lowered word -> id
+        self._deletes = {} # Delete -> id, or a list of ids when several words share it
+        self._saved = None # _DeleteTable of an index loaded from its cache
+        self.add_words(words)
+
+    def __len__(self):
+        return len(self._ids) - self.words.count(None)
+
+    def __contains__(self, word):
+        word_id = self._ids.get(word.lower())
+        return word_id is not None and self.words[word_id] is not None
+
+    # --- Edits ---
+    def add_words(self, words):
+        """Indexes words not yet in the index."""
+        ids, deletes, entries = self._ids, self._deletes, self.words
+        for word in words:
+            key = word.lower()
+            word_id = ids.get(key)
+            if word_id is not None:
+                if entries[word_id] is None: entries[word_id] = word # Discarded earlier; its deletes are still indexed
+                continue
+            word_id = ids[key] = len(entries)
+            entries.append(word)
+            for term in _deletes(key, self.max_distance, self.prefix_length):
+                entry = deletes.get(term)
+                if entry is None: deletes[term] = word_id
+                elif isinstance(entry, int): deletes[term] = [entry, word_id]
+                else: entry.append(word_id)
+
+    def discard(self, word):
+        """Stops returning a word; its deletes are left in place, to be reused if it is added back."""
+        word_id = self._ids.get(word.lower())
+        if word_id is not None: self.words[word_id] = None
+
+    # --- Lookups ---
+    def _candidates(self, terms):
+        """Returns the ids of every word stored under any of the deletes."""
+        ids = set()
+        deletes, saved = self._deletes, self._saved
+        for term in terms:
+            entry = deletes.get(term)
+            if entry is not None:
+                if isinstance(entry, int): ids.add(entry)
+                else: ids.update(entry)
+            if saved: ids.update(saved.ids(term.encode('utf-8')))
+        return ids
+
+    def lookup(self, text, max_distance=None):
+        """Returns [(word, distance)] for every real word within max_distance edits of text, closest first."""
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        key = text.strip().lower()
+        if not key: return []
+        found, words, length = [], self.words, len(key)
+        for word_id in self._candidates(_deletes(key, max_distance, self.prefix_length)):
+            word = words[word_id]
+            if word is None or abs(len(word) - length) > max_distance: continue
+            distance = bounded_distance(key, word.lower(), max_distance)
+            if distance <= max_distance: found.append((word, distance))
+        found.sort(key=lambda match: (match[1], match[0]))
+        return found
+
+    def closest_other_words(self, text, correct_spelling):
+        """Returns the real words text is closest to, if correct_spelling is not among them (e.g. 'there' for 'their')."""
+        matches = self.lookup(text)
+        if not matches: return []
+        best = [word for word, distance in matches if distance == matches[0][1]]
+        return [] if correct_spelling.lower() in map(str.lower, best) else best
+
+    # --- Persistence ---
+    def save(self, filename, signature):
+        """Writes the index to a cache file, atomically replacing it."""
+        deletes = self._deletes
+        if self._saved:
+            deletes = {term: list(ids) for term, ids in self._saved.items()}
+            for term, entry in self._deletes.items(): deletes.setdefault(term, []).extend((entry,) if isinstance(entry, int) else entry)
+        terms = sorted(deletes) # Code point order is also UTF-8 byte order
+        blob = "".join(terms).encode('utf-8')
+        lengths = map(len, terms) if len(blob) == sum(map(len, terms)) else (len(term.encode('utf-8')) for term in terms)
+        term_offsets, posting_offsets, ids = array('I', [0]), array('I', [0]), array('I')
+        term_offsets.extend(accumulate(lengths))
+        for term in terms:
+            entry = deletes[term]
+            if isinstance(entry, int): ids.append(entry)
+            else: ids.extend(entry)
+            posting_offsets.append(len(ids))
+        words = "\0".join(word if word is not None else "" for word in self.words).encode('utf-8')
+        if sys.byteorder == "big":
+            for values in (term_offsets, posting_offsets, ids): values.byteswap()
+
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        temp_filename = filename + ".tmp"
+        with open(temp_filename, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.max_distance, self.prefix_length, bytes.fromhex(signature), len(self.words), len(terms), len(words), len(blob), len(ids)))
+            for section in (words, term_offsets.tobytes(), blob, posting_offsets.tobytes(), ids.tobytes()): f.write(section)
+        os.replace(temp_filename, filename)
+
+    @classmethod
+    def load(cls, filename, signature):
+        """Reads a cached index, or returns None if it is missing, unreadable or was built from another vocabulary."""
+        try:
+            with open(filename, 'rb') as f: data = f.read()
+            magic, max_distance, prefix_length, saved_signature, word_count, term_count, words_length, blob_length, posting_count = HEADER.unpack_from(data, 0)
+        except (OSError, struct.error):
+            return None
+        if magic != MAGIC or saved_signature != bytes.fromhex(signature): return None
+        position = HEADER.size
+        words = data[position:position + words_length].decode('utf-8').split("\0") if word_count else []
+        position += words_length
+        term_offsets = _uint32s(data, position, term_count + 1)
+        position += 4 * (term_count + 1)
+        blob = data[position:position + blob_length]
+        position += blob_length
+        posting_offsets = _uint32s(data, position, term_count + 1)
+        position += 4 * (term_count + 1)
+        postings = _uint32s(data, position, posting_count)
+        if len(words) != word_count or len(postings) != posting_count: return None # Truncated
+        index = cls(max_distance=max_distance, prefix_length=prefix_length)
+        index.words = [word or None for word in words]
+        index._ids = {word.lower(): word_id for word_id, word in enumerate(words) if word}
+        index._saved = _DeleteTable(term_offsets, blob, posting_offsets, postings)
+        return index
+
+
+def build_real_word_index(words, cache_file=None):
+    """Returns a SymSpellIndex over words, loaded from cache_file if it was saved there for the same words, else built (and saved there).
+
+    Touches nothing but its arguments, so it can run on a background thread.
+    """
+    signature = vocabulary_signature(words)
+    index = SymSpellIndex.load(cache_file, signature) if cache_file else None
+    if index is None:
+        index = SymSpellIndex(words)
+        if cache_file:
+            try: index.save(cache_file, signature)
+            except (OSError, ValueError) as e: print(f"Error caching real-word index: {e}")
+    return index
@@ -0,0 +1,144 @@
+import json
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Records how long each startup phase takes and prints a breakdown."""
+
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.phases = [] # (name, seconds) in completion order
+
+    @contextmanager
+    def phase(self, name):
+        """Times the body of a `with` block as one phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds):
+        """Adds a phase measured elsewhere."""
+        self.phases.append((name, seconds))
+
+    def elapsed(self):
+        """Seconds since the timer started."""
+        return time.perf_counter() - self.start
+
+    def report(self):
+        """Returns the breakdown as printable text."""
+        width = max([len(name) for name, _ in self.phases] + [len("Total")])
+        lines = ["Startup timing:"]
+        lines += [f"  {name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        lines.append(f"  {'Total':<{width}}  {self.elapsed() * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+class RollingHistogram:
+    """Latency samples for one stage over the last `window` words, with percentiles and log-scale buckets."""
+
+    BUCKET_EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self, window=500):
+        self.samples = deque(maxlen=window) # Seconds
+        self.count = 0 # All samples ever added, not just those in the window
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        """Returns count, mean and percentiles in milliseconds, plus bucket counts, for the current window."""
+        ordered = sorted(self.samples)
+        if not ordered: return {'count': 0}
+        pick = lambda fraction: round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 2)
+        buckets = [0] * (len(self.BUCKET_EDGES_MS) + 1)
+        for seconds in ordered: buckets[bisect_left(self.BUCKET_EDGES_MS, seconds * 1000)] += 1
+        return {'count': len(ordered), 'mean': round(sum(ordered) / len(ordered) * 1000, 2), 'p50': pick(0.5),
+                'p90': pick(0.9), 'p99': pick(0.99), 'max': round(ordered[-1] * 1000, 2),
+                'buckets': {f"<={edge}ms": n for edge, n in zip(self.BUCKET_EDGES_MS, buckets)} | {'more': buckets[-1]}}
+
+
+class LatencyTracer:
+    """Timestamps the stages between an answer and the next word's audio, and keeps rolling histograms of them.
+
+    A trace starts with `begin` and collects `mark(stage)` calls; stages
+    timed in the speech process arrive as marks for the trace's speech
+    request. `finish` turns the marks into per-stage durations (each stage
+    is timed from the mark before it) plus "total" from the first mark to
+    the last, and feeds them to one RollingHistogram per stage. Timestamps
+    are time.perf_counter() values, which are system-wide so they compare
+    across processes. Each of `milestones` reached also gets a stage timed
+    from the start of the trace, e.g. "enter -> audio 1 start".
+    """
+
+    def __init__(self, window=500, keep_traces=50, milestones=()):
+        self.window = window
+        self.milestones = milestones
+        self.histograms = {} # Stage ("previous -> stage") -> RollingHistogram, in first-seen order
+        self.recent = deque(maxlen=keep_traces) # Finished traces: {'word', 'marks': [(stage, offset seconds)]}
+        self._word = None
+        self._marks = None
+        self._request_id = None
+
+    @property
+    def active(self):
+        return self._marks is not None
+
+    def begin(self, word, stage="start", timestamp=None):
+        """Starts a trace, abandoning any unfinished one."""
+        self._word = word
+        self._marks = [(stage, time.perf_counter() if timestamp is None else timestamp)]
+        self._request_id = None
+
+    def mark(self, stage, timestamp=None, request_id=None):
+        """Timestamps a stage of the open trace; marks for another speech request are ignored."""
+        if self._marks is None or (request_id is not None and request_id != self._request_id): return
+        self._marks.append((stage, time.perf_counter() if timestamp is None else timestamp))
+
+    def bind_request(self, request_id, word=None):
+        """Ties the open trace to the speech request playing its word."""
+        if self._marks is None: return
+        self._request_id = request_id
+        if word is not None: self._word = word
+
+    def finish(self, request_id=None):
+        """Closes the open trace (only if it belongs to `request_id`, when given) and records its stage durations."""
+        if self._marks is None or (request_id is not None and request_id != self._request_id): return
+        marks = sorted(self._marks, key=lambda mark: mark[1]) # Marks from the speech process can arrive late
+        self._marks = None
+        if len(marks) < 2: return
+        for (previous, started), (stage, ended) in zip(marks, marks[1:]):
+            self._histogram(f"{previous} -> {stage}").add(ended - started)
+        for stage, t in marks:
+            if stage in self.milestones: self._histogram(f"{marks[0][0]} -> {stage}").add(t - marks[0][1])
+        self._histogram("total").add(marks[-1][1] - marks[0][1])
+        self.recent.append({'word': self._word, 'marks': [(stage, round(t - marks[0][1], 6)) for stage, t in marks]})
+
+    def _histogram(self, stage):
+        histogram = self.histograms.get(stage)
+        if histogram is None: histogram = self.histograms[stage] = RollingHistogram(self.window)
+        return histogram
+
+    def summary(self):
+        """Returns {stage: RollingHistogram.summary()}."""
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def report(self):
+        """Returns the stage percentiles as printable text."""
+        summary = self.summary()
+        if not summary: return "No words traced yet."
+        width = max(len(stage) for stage in summary)
+        lines = [f"{'stage':<{width}}  {'n':>5}  {'p50 ms':>9}  {'p90 ms':>9}  {'p99 ms':>9}  {'max ms':>9}"]
+        for stage, stats in summary.items():
+            lines.append(f"{stage:<{width}}  {stats['count']:>5}  {stats['p50']:>9.1f}  {stats['p90']:>9.1f}  {stats['p99']:>9.1f}  {stats['max']:>9.1f}")
+        return "\n".join(lines)
+
+    def dump(self, filename):
+        """Writes the histograms and the most recent traces as JSON."""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'stages': self.summary(), 'recent_traces': list(self.recent)}, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,215 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from collections import OrderedDict
+
+PLAYBACK_POLL_SECONDS = 0.05
+
+
+def default_cache_dir():
+    """Returns the per-user directory used for cached audio clips."""
+    return os.path.join(os.path.expanduser("~"), ".spelling_app", "audio_cache")
+
+
+def _player_commands(path):
+    if sys.platform == "darwin":
+        return [["afplay", path]]
+    return [["paplay", path], ["aplay", "-q", path], ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", path]]
+
+
+def _stdin_player_commands():
+    """Players that read a clip from standard input, so clips in memory need no temp file."""
+    if sys.platform == "darwin": return [] # afplay only plays files
+    return [["paplay"], ["aplay", "-q", "-"], ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-i", "pipe:0"]]
+
+
+def audio_player_available():
+    """Checks whether cached clips can be played back on this machine."""
+    return sys.platform.startswith("win") or any(shutil.which(command[0]) for command in _player_commands(""))
+
+
+def clip_duration(path):
+    """Returns the length of a WAV clip in seconds, or None if it cannot be read."""
+    try:
+        with wave.open(path, "rb") as clip:
+            return clip.getnframes() / float(clip.getframerate())
+    except (wave.Error, OSError, EOFError):
+        return None
+
+
+def play_audio_file(path, should_stop=None):
+    """Plays an audio file with the platform's player, blocking until it ends or should_stop() returns True.
+
+    Tries each player found on the PATH in turn until one succeeds. Returns
+    False if none is available or every one of them failed.
+    """
+    if sys.platform.startswith("win"):
+        import winsound
+        if should_stop is None:
+            winsound.PlaySound(path, winsound.SND_FILENAME)
+            return True
+        deadline = time.monotonic() + (clip_duration(path) or 0)
+        winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+        while time.monotonic() < deadline:
+            if should_stop():
+                winsound.PlaySound(None, 0) # Stops the asynchronous sound
+                break
+            time.sleep(PLAYBACK_POLL_SECONDS)
+        return True
+    for command in _player_commands(path):
+        if not shutil.which(command[0]): continue
+        try: process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError: continue
+        if _wait_for_player(process, should_stop): return True # e.g. paplay exits non-zero without a PulseAudio server; try the next
+    return False
+
+
+def _wait_for_player(process, should_stop):
+    """Waits for a player process to finish, terminating it early once should_stop() returns True."""
+    while True:
+        try:
+            return process.wait(timeout=PLAYBACK_POLL_SECONDS) == 0
+        except subprocess.TimeoutExpired:
+            if should_stop and should_stop():
+                process.terminate()
+                process.wait()
+                return True
+
+
+def play_audio_bytes(data, should_stop=None):
+    """Plays an audio file held in memory (e.g. a slice of an audio pack), like play_audio_file.
+
+    The clip is piped to the first player that reads standard input and
+    plays it; if there is none, or all of them fail, it goes through a
+    temporary file.
+    """
+    if sys.platform.startswith("win") and should_stop is None:
+        import winsound
+        winsound.PlaySound(bytes(data), winsound.SND_MEMORY)
+        return True
+    for command in _stdin_player_commands():
+        if not shutil.which(command[0]): continue
+        try: process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError: continue
+        feeder = threading.Thread(target=_feed_player, args=(process, data), daemon=True) # The pipe fills up faster than the clip plays
+        feeder.start()
+        if _wait_for_player(process, should_stop): return True
+    fd, path = tempfile.mkstemp(suffix=AudioCache.CLIP_EXTENSION)
+    try:
+        with os.fdopen(fd, 'wb') as f: f.write(data)
+        return play_audio_file(path, should_stop)
+    finally:
+        try: os.remove(path)
+        except OSError: pass
+
+
+def _feed_player(process, data):
+    try:
+        process.stdin.write(data)
+        process.stdin.close()
+    except OSError: pass # The player was stopped early
+
+
+class AudioCache:
+    """On-disk cache of synthesized word clips keyed by (word, voice, rate), evicted least-recently-used by total size."""
+
+    DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+    CLIP_EXTENSION = ".aiff" if sys.platform == "darwin" else ".wav" # Format written by pyttsx3's save_to_file
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # File name -> size in bytes, least recently used first
+        self._total_bytes = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        """Indexes clips already on disk, oldest access first."""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self.CLIP_EXTENSION): continue
+            if ".part" in name: # Left behind by an interrupted render
+                try: os.remove(os.path.join(self.cache_dir, name))
+                except OSError: pass
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                found.append((stat.st_mtime, name, stat.st_size))
+            except OSError: pass
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _file_name(self, word, voice, rate):
+        key = f"{voice}\0{rate}\0{word}".encode("utf-8")
+        return hashlib.sha1(key).hexdigest() + self.CLIP_EXTENSION
+
+    def get(self, word, voice, rate):
+        """Returns the path of a cached clip, or None if the word has not been rendered."""
+        name = self._file_name(word, voice, rate)
+        with self._lock:
+            if name not in self._entries: return None
+            self._entries.move_to_end(name)
+        path = os.path.join(self.cache_dir, name)
+        try: os.utime(path) # Keeps LRU order across restarts
+        except OSError:
+            self._forget(name)
+            return None
+        return path
+
+    def render(self, engine, word, voice, rate):
+        """Synthesizes a clip with the engine's save-to-file path and caches it. Returns the path, or None on failure.
+
+        The caller must hold whatever lock serializes access to `engine`.
+        """
+        cached = self.get(word, voice, rate)
+        if cached: return cached
+        name = self._file_name(word, voice, rate)
+        path = os.path.join(self.cache_dir, name)
+        temp_path = f"{path}.{threading.get_ident()}.part{self.CLIP_EXTENSION}"
+        try:
+            engine.save_to_file(word, temp_path)
+            engine.runAndWait()
+            size = os.path.getsize(temp_path)
+            if size == 0: raise OSError("engine wrote an empty clip")
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Audio cache: could not render '{word}': {e}")
+            try: os.remove(temp_path)
+            except OSError: pass
+            return None
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+            self._evict()
+        return path
+
+    def _forget(self, name):
+        with self._lock:
+            self._total_bytes -= self._entries.pop(name, 0)
+
+    def _evict(self):
+        """Removes least recently used clips until the cache fits in max_bytes. Caller holds the lock."""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try: os.remove(os.path.join(self.cache_dir, name))
+            except OSError: pass
+
+    def clear(self):
+        """Deletes every cached clip."""
+        with self._lock:
+            for name in self._entries:
+                try: os.remove(os.path.join(self.cache_dir, name))
+                except OSError: pass
+            self._entries.clear()
+            self._total_bytes = 0
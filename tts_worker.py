@@ -0,0 +1,210 @@
+import os
+import queue
+import time
+
+GAP_POLL_SECONDS = 0.05
+
+
+def _worker_main(requests, events, current_request, rate, cache_dir, audio_pack_path):
+    """Speech process entry point: owns the only TTS engine and serves requests one at a time."""
+    from tts_cache import AudioCache, audio_player_available, play_audio_bytes, play_audio_file
+    try:
+        import pyttsx3
+        engine = pyttsx3.init()
+        engine.setProperty('rate', rate)
+        voice = engine.getProperty('voice')
+    except Exception as e:
+        events.put(("failed", 0, str(e)))
+        return
+    audio_cache = None
+    if audio_player_available():
+        try: audio_cache = AudioCache(cache_dir)
+        except OSError as e: print(f"Audio cache disabled: {e}")
+    audio_pack = None # Baked clips of the active list, played without synthesis
+
+    def open_pack(path):
+        nonlocal audio_pack
+        if audio_pack: audio_pack.close()
+        audio_pack = None
+        if not path or audio_cache is None or not os.path.exists(path): return
+        from audio_pack import AudioPack
+        try: audio_pack = AudioPack(path)
+        except (OSError, ValueError) as e: print(f"Audio pack disabled: {e}")
+    open_pack(audio_pack_path)
+    events.put(("ready", 0, voice))
+
+    def mark(stage, request_id, timestamp=None):
+        """Reports when a stage of a request was reached (now, unless timestamp is given), for the app's latency tracing."""
+        events.put(("mark", request_id, (stage, time.perf_counter() if timestamp is None else timestamp)))
+
+    def speak_once(word, request_id, n):
+        """Plays a word once from the baked pack, the audio cache or the engine; the start is marked only for the one that played."""
+        is_superseded = lambda: current_request.value != request_id
+        baked = audio_pack.clip(word) if audio_pack else None
+        if baked:
+            started = time.perf_counter()
+            if play_audio_bytes(baked, should_stop=is_superseded):
+                if n == 1: mark("clip ready", request_id, started)
+                mark(f"audio {n} start", request_id, started)
+                mark(f"audio {n} end", request_id)
+                return
+        clip = audio_cache.render(engine, word, voice, rate) if audio_cache else None
+        started = time.perf_counter()
+        if clip and play_audio_file(clip, should_stop=is_superseded):
+            if n == 1: mark("clip ready", request_id, started)
+        else:
+            started = time.perf_counter() # After any failed player, so the engine's own start is timed
+            engine.say(word)
+            engine.runAndWait()
+        mark(f"audio {n} start", request_id, started)
+        mark(f"audio {n} end", request_id)
+
+    while True:
+        request = requests.get()
+        if request is None: break
+        kind, request_id, word = request[:3]
+        try:
+            if kind == "prefetch":
+                if audio_cache and not (audio_pack and word in audio_pack): audio_cache.render(engine, word, voice, rate)
+                continue
+            if kind == "pack":
+                open_pack(word) # The path of the new list's pack, or None
+                continue
+            repeat, gap = request[3:]
+            mark("worker received", request_id)
+            status = "done"
+            for i in range(repeat):
+                if i > 0: # Sleeps in slices so a newer request cuts the gap short
+                    gap_end = time.monotonic() + gap
+                    while time.monotonic() < gap_end and current_request.value == request_id:
+                        time.sleep(GAP_POLL_SECONDS)
+                if current_request.value != request_id:
+                    status = "cancelled"
+                    break
+                speak_once(word, request_id, i + 1)
+            events.put((status, request_id, word))
+        except Exception as e:
+            events.put(("error", request_id, f"{word}: {e}"))
+
+
+class SpeechWorker:
+    """Client for a single long-lived speech process fed through a request queue.
+
+    Every `speak` supersedes the previous one; the worker checks the shared
+    current-request id between and during utterances, so playback of an old
+    word stops as soon as the learner moves on. `poll` must be called
+    regularly (e.g. from Tk's `after`) to collect events, enforce per-request
+    timeouts and restart the process if the engine dies. Besides status
+    events, the worker sends ("mark", request_id, (stage, perf_counter time))
+    for each stage of a request, for latency tracing; a playback start is
+    sent once that playback succeeded, stamped with when it began.
+    """
+
+    REQUEST_TIMEOUT = 15.0 # Seconds a speak request may run before the worker is presumed hung
+    MAX_RESTARTS = 3
+
+    def __init__(self, rate=150, cache_dir=None):
+        self.rate = rate
+        self.cache_dir = cache_dir
+        self.audio_pack_path = None # Baked clips to play instead of synthesizing, if any
+        self.ready = False
+        self.failed = False
+        self.voice = None
+        self._context = None # Set up on first start so importing this module stays cheap
+        self._current_request = None
+        self._events = None
+        self._next_request_id = 0
+        self._deadline = None
+        self._restarts = 0
+        self._process = None
+
+    def start(self):
+        """Starts the speech process; a 'ready' or 'failed' event follows via `poll`."""
+        if self._context is None:
+            import multiprocessing
+            self._context = multiprocessing.get_context("spawn") # Never fork a process that holds Tk state
+            self._current_request = self._context.Value('q', 0)
+        self._requests = self._context.Queue()
+        self._events = self._context.Queue()
+        self.ready = False
+        self._deadline = None
+        self._process = self._context.Process(target=_worker_main, args=(self._requests, self._events, self._current_request, self.rate, self.cache_dir, self.audio_pack_path), daemon=True)
+        self._process.start()
+
+    def stop(self):
+        """Shuts the speech process down."""
+        if not self._process: return
+        self.cancel()
+        try: self._requests.put(None)
+        except (OSError, ValueError): pass
+        self._process.join(timeout=1)
+        if self._process.is_alive(): self._process.terminate()
+        self._process = None
+        self.ready = False
+
+    def restart(self):
+        """Kills the speech process and starts a fresh one."""
+        if self._process and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=1)
+        self._restarts += 1
+        self.start()
+
+    def speak(self, word, repeat=2, gap=1.0, timeout=REQUEST_TIMEOUT):
+        """Queues a word to be spoken `repeat` times, superseding anything still playing. Returns the request id."""
+        self._next_request_id += 1
+        request_id = self._next_request_id
+        self._current_request.value = request_id
+        self._deadline = time.monotonic() + timeout
+        self._requests.put(("speak", request_id, word, repeat, gap))
+        return request_id
+
+    def prefetch(self, word):
+        """Asks the worker to render a word into the audio cache once it is idle."""
+        if word: self._requests.put(("prefetch", 0, word))
+
+    def set_audio_pack(self, path):
+        """Plays words from a baked audio pack (see audio_pack.py) where it has them; None stops using one."""
+        self.audio_pack_path = path
+        if self._process: self._requests.put(("pack", 0, path))
+
+    def cancel(self):
+        """Stops the current request at the next safe point."""
+        if self._current_request is None: return
+        self._next_request_id += 1
+        self._current_request.value = self._next_request_id
+        self._deadline = None
+
+    def poll(self):
+        """Returns pending (kind, request_id, detail) events and handles timeouts and crashes."""
+        events = []
+        if self._events is None: return events
+        while True:
+            try: event = self._events.get_nowait()
+            except (queue.Empty, OSError, ValueError): break
+            kind, request_id = event[0], event[1]
+            if kind == "ready":
+                self.ready, self.voice = True, event[2]
+            elif kind == "failed":
+                self.failed = True
+            elif kind != "mark" and request_id == self._current_request.value: # The request has finished
+                self._deadline = None
+            events.append(event)
+        if self.failed or not self._process: return events
+
+        if not self._process.is_alive():
+            events.append(self._recover("Speech process exited unexpectedly."))
+        elif self._deadline is not None and time.monotonic() > self._deadline:
+            events.append(self._recover("Speech request timed out."))
+        return events
+
+    def _recover(self, reason):
+        """Restarts a dead or hung worker, giving up after MAX_RESTARTS."""
+        timed_out_request = self._current_request.value
+        print(f"TTS worker: {reason}")
+        if self._restarts >= self.MAX_RESTARTS:
+            self.stop()
+            self.failed = True
+            return ("failed", timed_out_request, f"{reason} Gave up after {self._restarts} restarts.")
+        self.restart()
+        return ("restarted", timed_out_request, reason)
@@ -0,0 +1,234 @@
+import argparse
+import codecs
+import csv
+import json
+import os
+import threading
+import unicodedata
+from itertools import chain, islice
+
+from word_lists import IndexedWordList
+
+IMPORT_FORMATS = ("text", "csv", "json")
+BATCH_SIZE = 10_000 # CSV and JSON entries handed to the list at a time; also how often cancellation is checked
+TEXT_CHUNK_BYTES = 1 << 18 # Plain text is split into lines a chunk at a time
+MAX_WORD_CHARS = 100 # Longer "words" are garbage lines, not vocabulary
+JSON_CHUNK_BYTES = 1 << 16
+MAX_JSON_ITEM_CHARS = 1 << 20 # A single JSON value (or JSON Lines line) larger than this is not a word
+WORD_HEADERS = ("word", "words", "term", "spelling") # A first CSV row with one of these in the word column is a header, not a word
+
+
+def detect_format(path):
+    """Guesses an import format from a file name: csv, json (arrays or JSON Lines) or plain text."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".csv", ".tsv"): return "csv"
+    if extension in (".json", ".jsonl", ".ndjson"): return "json"
+    return "text"
+
+
+def normalize_words(entries):
+    """Returns a batch of raw entries as words, stripped and in Unicode NFC form, dropping blank, over-long and non-string ones."""
+    try: words = list(map(str.strip, entries))
+    except TypeError: words = [entry.strip() for entry in entries if isinstance(entry, str)]
+    if not "".join(words).isascii(): # ASCII is already NFC, so most batches skip normalizing word by word
+        words = [word if word.isascii() else unicodedata.normalize("NFC", word) for word in words]
+    words = list(filter(None, words))
+    if words and max(map(len, words)) > MAX_WORD_CHARS: words = [word for word in words if len(word) <= MAX_WORD_CHARS]
+    return words
+
+
+class WordImporter:
+    """Streams a large word file into an IndexedWordList on a worker thread.
+
+    The file is read a chunk at a time, and words are normalized and
+    appended in batches; the list's own word -> slot dict is
+    the dedup hash set, so the words are held once, in the list being built.
+    Progress is exposed as plain attributes for the GUI to poll with `after`,
+    since Tk must not be touched from the worker thread. Once `done` is set,
+    `word_list` (or `error`) holds the result.
+    """
+
+    def __init__(self, path, fmt=None, column=None, delimiter=None):
+        self.path = path
+        self.format = fmt or detect_format(path)
+        if self.format not in IMPORT_FORMATS: raise ValueError(f"Unknown import format {self.format!r}.")
+        self.column = column # CSV column: a header name or a 0-based index; default "word" if the header has it, else the first
+        self.delimiter = delimiter or ("\t" if path.lower().endswith(".tsv") else ",")
+        self.total_bytes = os.path.getsize(path)
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.skipped = 0 # Blank, over-long or non-string entries
+        self.word_list = IndexedWordList()
+        self.error = None
+        self.done = threading.Event()
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    @property
+    def progress(self):
+        """Fraction of the file read so far."""
+        return min(1.0, self.bytes_read / self.total_bytes) if self.total_bytes else 1.0
+
+    @property
+    def duplicates(self):
+        """Usable entries dropped because the word was already imported."""
+        return self.lines_read - self.skipped - len(self.word_list)
+
+    def start(self):
+        """Starts importing on a daemon thread."""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stops the import at the next batch; `error` is set to say so."""
+        self._cancelled.set()
+
+    def wait(self, timeout=None):
+        """Waits for the import to finish. Returns True if it has."""
+        return self.done.wait(timeout)
+
+    def run(self):
+        """Imports the whole file in the calling thread."""
+        try:
+            for entries in self._batches():
+                words = normalize_words(entries)
+                self.lines_read += len(entries)
+                self.skipped += len(entries) - len(words)
+                self.word_list.extend(words)
+                if self._cancelled.is_set(): raise InterruptedError("Import cancelled.")
+        except (OSError, ValueError, csv.Error, InterruptedError) as e:
+            self.error = str(e)
+        finally:
+            self.done.set()
+
+    # --- Readers ---
+    def _batches(self):
+        """Yields the file's raw entries in lists of about BATCH_SIZE."""
+        with open(self.path, 'rb') as f:
+            if self.format == "text": yield from self._line_batches(f)
+            else:
+                entries = self._csv_entries(chain.from_iterable(self._line_batches(f))) if self.format == "csv" else self._json_entries(f)
+                while True:
+                    batch = list(islice(entries, BATCH_SIZE))
+                    if not batch: return
+                    yield batch
+
+    def _line_batches(self, f):
+        """Yields the lines of a UTF-8 file (ends kept) a chunk at a time, counting bytes for progress."""
+        chunks = _TextChunks(f, self, TEXT_CHUNK_BYTES)
+        rest = ""
+        while not chunks.exhausted:
+            lines = (rest + chunks.read()).splitlines(keepends=True)
+            rest = lines.pop() if lines and not chunks.exhausted else "" # Possibly cut off by the chunk
+            if lines: yield lines
+
+    def _csv_entries(self, lines):
+        rows = csv.reader(lines, delimiter=self.delimiter)
+        header = next(rows, None)
+        if header is None: return
+        column = self.column
+        if isinstance(column, str) and not column.isdigit():
+            names = [name.strip().lower() for name in header]
+            if column.lower() not in names: raise ValueError(f"No column named {column!r} in {self.path}.")
+            column = names.index(column.lower())
+        elif column is None and "word" in [name.strip().lower() for name in header]:
+            column = [name.strip().lower() for name in header].index("word")
+        else:
+            column = int(column or 0)
+            if column >= len(header) or header[column].strip().lower() not in WORD_HEADERS: rows = chain([header], rows) # No header row to skip
+        for row in rows:
+            yield row[column] if column < len(row) else None
+
+    def _json_entries(self, f):
+        """Yields the items of a top-level JSON array, or the values of a JSON Lines file, without loading the file."""
+        decoder = json.JSONDecoder()
+        chunks = _TextChunks(f, self)
+        buffer = chunks.read()
+        pos = _skip_space(buffer, 0)
+        if buffer[pos:pos + 1] == "{":
+            raise ValueError(f"{self.path} is a JSON object; word-list files are loaded with WordListManager.load_from_file, not imported.")
+        if buffer[pos:pos + 1] != "[":
+            yield from self._json_lines(buffer[pos:], chunks)
+            return
+        pos += 1
+        expect_item, first = True, True # Expecting an item (after '[' or ','), or a ',' or ']'
+        while True:
+            pos = _skip_space(buffer, pos)
+            if pos >= len(buffer):
+                if chunks.exhausted: raise ValueError(f"Unterminated JSON array in {self.path}.")
+                buffer, pos = chunks.read(), 0
+                continue
+            char = buffer[pos]
+            if char == "]" and (first or not expect_item): return
+            if not expect_item:
+                if char != ",": raise ValueError(f"Expected ',' in the JSON array in {self.path}.")
+                pos, expect_item = pos + 1, True
+                continue
+            try: item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if chunks.exhausted or len(buffer) - pos > MAX_JSON_ITEM_CHARS: raise ValueError(f"Malformed JSON array in {self.path}.")
+                buffer, pos = buffer[pos:] + chunks.read(), 0 # The item straddles a chunk boundary
+                continue
+            if end == len(buffer) and not chunks.exhausted: # A number at the end of a chunk may continue in the next
+                buffer, pos = buffer[pos:] + chunks.read(), 0
+                continue
+            yield item
+            pos, expect_item, first = end, False, False
+
+    def _json_lines(self, text, chunks):
+        while True:
+            lines = text.split("\n")
+            text = lines.pop() # Possibly incomplete
+            for line in lines:
+                if line.strip(): yield json.loads(line)
+            if chunks.exhausted: break
+            if len(text) > MAX_JSON_ITEM_CHARS: raise ValueError(f"{self.path} is neither a JSON array nor JSON Lines.")
+            text += chunks.read()
+        if text.strip(): yield json.loads(text)
+
+
+class _TextChunks:
+    """Reads a binary UTF-8 file as text in fixed-size chunks, counting bytes for the importer's progress."""
+
+    def __init__(self, f, importer, chunk_bytes=JSON_CHUNK_BYTES):
+        self.f = f
+        self.importer = importer
+        self.chunk_bytes = chunk_bytes
+        self.exhausted = False
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace') # Keeps characters split across chunks whole
+
+    def read(self):
+        raw = self.f.read(self.chunk_bytes)
+        self.importer.bytes_read += len(raw)
+        if not raw: self.exhausted = True
+        return self._decoder.decode(raw, final=not raw)
+
+
+def _skip_space(text, pos):
+    while pos < len(text) and text[pos] in " \t\r\n": pos += 1
+    return pos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a large word file (text, CSV or JSON) into a word-list file.")
+    parser.add_argument("source", help="one word per line, a CSV/TSV file, a JSON array of words or JSON Lines")
+    parser.add_argument("target", help="word-list file to add the list to (JSON, .pack or .db); created if missing")
+    parser.add_argument("--name", help="name of the new list (default: the source file name)")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="source format (default: from the file extension)")
+    parser.add_argument("--column", help="CSV column name or 0-based index (default: 'word' if present, else the first); with an index, a first row reading word, words, term or spelling there is skipped as a header")
+    args = parser.parse_args()
+
+    from word_lists import WordListManager
+    importer = WordImporter(args.source, args.format, args.column)
+    importer.run()
+    if importer.error: raise SystemExit(f"Error importing {args.source}: {importer.error}")
+    manager = WordListManager()
+    if os.path.exists(args.target) and not manager.load_from_file(args.target): raise SystemExit(f"Could not load {args.target}")
+    name = args.name or os.path.splitext(os.path.basename(args.source))[0]
+    manager.add_custom_list(name, importer.word_list)
+    if not manager.save_to_file(args.target): raise SystemExit(1)
+    print(f"Imported {len(importer.word_list)} words into '{name}' ({importer.duplicates} duplicates, {importer.skipped} skipped).")
+
+
+if __name__ == "__main__":
+    main()
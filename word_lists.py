@@ -1,4 +1,108 @@
 import json
+import os
+
+from feature_index import FeatureIndex
+from prefix_index import PrefixIndex
+# The pack and database backends (word_pack, word_store, sqlite3) are imported by the methods that use them,
+# so the built-in lists load without them.
+
+PACK_EXTENSION = ".pack"
+
+
+class IndexedWordList:
+    """Ordered, duplicate-free word collection with O(1) membership, append and removal.
+
+    Each word keeps a stable slot number for its lifetime, which practice
+    sessions use as the word's index. Removing a word leaves a tombstone
+    (None) in its slot; tombstones are squeezed out by `compact`, which runs
+    automatically once they make up most of the list.
+    """
+
+    COMPACT_MIN_TOMBSTONES = 64
+    COMPACT_RATIO = 0.5
+
+    def __init__(self, words=()):
+        self._slots = []
+        self._index = {} # Word -> slot
+        self.extend(words)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return (word for word in self._slots if word is not None)
+
+    def __contains__(self, word):
+        return word in self._index
+
+    def __getitem__(self, slot):
+        """Returns the word in a slot, or None if that word was removed."""
+        return self._slots[slot]
+
+    @property
+    def slot_count(self):
+        """Number of slots, including tombstones of removed words."""
+        return len(self._slots)
+
+    @property
+    def tombstone_count(self):
+        """Number of slots left behind by removed words."""
+        return len(self._slots) - len(self._index)
+
+    def slot_words(self):
+        """Returns the word in every slot, in slot order, with None for tombstones."""
+        return list(self._slots)
+
+    def slot_of(self, word):
+        """Returns the slot holding a word, or -1."""
+        return self._index.get(word, -1)
+
+    def append(self, word):
+        """Adds a word at the end. Returns its slot, or -1 if it is already present."""
+        if word in self._index: return -1
+        slot = len(self._slots)
+        self._slots.append(word)
+        self._index[word] = slot
+        return slot
+
+    def extend(self, words):
+        """Appends many words in one pass, skipping duplicates. Returns the new slots."""
+        if not self._slots: # Fast path for building a list from duplicate-free words
+            words = list(words)
+            index = dict(zip(words, range(len(words))))
+            if len(index) == len(words):
+                self._slots, self._index = words, index
+                return list(range(len(words)))
+        index, start = self._index, len(self._slots)
+        new_words = [word for word in dict.fromkeys(words) if word not in index] # dict.fromkeys drops repeats within `words`, keeping order
+        index.update(zip(new_words, range(start, start + len(new_words))))
+        self._slots.extend(new_words)
+        return list(range(start, start + len(new_words)))
+
+    def remove(self, word):
+        """Tombstones a word. Returns its former slot, or -1 if it was not present."""
+        slot = self._index.pop(word, -1)
+        if slot != -1: self._slots[slot] = None
+        return slot
+
+    def needs_compaction(self):
+        """Checks whether tombstones have grown enough to be worth compacting."""
+        tombstones = self.tombstone_count
+        return tombstones >= self.COMPACT_MIN_TOMBSTONES and tombstones > len(self._slots) * self.COMPACT_RATIO
+
+    def compact(self):
+        """Drops tombstones, renumbering slots. Returns a list mapping old slot -> new slot (-1 for tombstones)."""
+        mapping, slots = [], []
+        for word in self._slots:
+            if word is None:
+                mapping.append(-1)
+            else:
+                mapping.append(len(slots))
+                self._index[word] = len(slots)
+                slots.append(word)
+        self._slots = slots
+        return mapping
+
 
 class WordListManager:
     """Manages word lists for the spelling practice application."""
@@ -78,6 +182,8 @@ class WordListManager:
             ]
         }
 
+        self.word_lists = {name: IndexedWordList(words) for name, words in self.word_lists.items()}
+
         default_list_name = "Common Misspelled Words"
         available_names = list(self.word_lists.keys())
         if default_list_name in self.word_lists:
@@ -87,7 +193,31 @@ class WordListManager:
         else:
              self.active_list_name = "None"
 
-        self.active_list = self.word_lists.get(self.active_list_name, [])
+        self.active_list = self.word_lists.get(self.active_list_name, IndexedWordList())
+        self._change_listeners = []
+        self._pack = None # Open WordPack backing lists that have not been materialized yet
+        self._owned_store = None # WordStore opened by load_from_file, closed when the lists are replaced
+        self._list_indexes = {} # List name -> {index class: index}, each built the first time it is needed
+        self._real_words = None # SymSpellIndex over every list, built the first time it is needed
+        self.vocabulary_version = 0 # Bumped whenever the words of any list change, so an index built from older words is not installed
+        self.dictionary_words = set() # Extra real words, e.g. from a dictionary file, for telling misspellings from other words
+
+    def add_change_listener(self, callback):
+        """Registers callback(list_name, action, detail), called after a list is edited in place.
+
+        `action` is "add" or "remove" with the affected slots as `detail`, or
+        "compact" with a list mapping old slot -> new slot.
+        """
+        self._change_listeners.append(callback)
+
+    def _notify_change(self, list_name, action, detail):
+        """Tells registered listeners about an in-place edit of a list."""
+        for index in self._list_indexes.get(list_name, {}).values():
+            if index.word_list is self.word_lists.get(list_name):
+                getattr(index, action)(detail) # Updated first so listeners see current indexes
+        for callback in self._change_listeners:
+            try: callback(list_name, action, detail)
+            except Exception as e: print(f"Error in word list change listener: {e}")
 
     def get_available_lists(self):
         """Returns a list of available word list names."""
@@ -97,60 +227,260 @@ class WordListManager:
         """Sets the active word list by name."""
         if list_name in self.word_lists:
             self.active_list_name = list_name
-            self.active_list = self.word_lists[list_name]
+            self.active_list = self._materialize(list_name)
             return True
         return False
 
+    def _materialize(self, list_name):
+        """Decodes a lazily loaded pack or database list into an IndexedWordList the first time it is needed."""
+        words = self.word_lists[list_name]
+        if not isinstance(words, IndexedWordList): # A PackedList or StoredList
+            words = self.word_lists[list_name] = IndexedWordList(words.materialize())
+        return words
+
+    def get_list(self, list_name):
+        """Returns a named list as an IndexedWordList, decoding it if needed, or None if there is no such list."""
+        return self._materialize(list_name) if list_name in self.word_lists else None
+
     def get_active_list_name(self):
         """Returns the name of the currently active word list."""
         return self.active_list_name
 
     def get_active_list(self):
         """Returns the currently active word list (the list of words)."""
-        return self.active_list if isinstance(self.active_list, list) else []
+        return self.active_list if isinstance(self.active_list, IndexedWordList) else IndexedWordList()
+
+    def _list_index(self, index_class, list_name=None):
+        """Returns an index_class over the active (or named) list, building it on first use.
+
+        Indexes take the list in their constructor and follow in-place edits
+        through add(slots), remove(slots) and compact(mapping).
+        """
+        if list_name is None: list_name, word_list = self.active_list_name, self.get_active_list()
+        else: word_list = self._materialize(list_name)
+        indexes = self._list_indexes.setdefault(list_name, {})
+        index = indexes.get(index_class)
+        if index is None or index.word_list is not word_list:
+            index = indexes[index_class] = index_class(word_list)
+        return index
+
+    def get_feature_index(self, list_name=None):
+        """Returns the hint-feature index of the active list, or of a named one."""
+        return self._list_index(FeatureIndex, list_name)
+
+    def get_prefix_index(self, list_name=None):
+        """Returns the prefix index of the active list (or a named one), used for live feedback while typing."""
+        return self._list_index(PrefixIndex, list_name)
+
+    def get_real_word_index(self, cache_file=None):
+        """Returns a SymSpellIndex over the words of every list and the dictionary words, building it on first use."""
+        if self._real_words is None:
+            from symspell_index import build_real_word_index # Only needed once an index is asked for
+            self._real_words = build_real_word_index(self.real_word_vocabulary(), cache_file)
+        return self._real_words
+
+    def real_word_vocabulary(self):
+        """Returns the words of every list plus the dictionary words as one plain list.
+
+        Stored lists read through a SQLite connection that only works on the
+        thread that opened it, so call this on that thread and hand the list
+        to `build_real_word_index` on another one.
+        """
+        words = [word for name in self.get_available_lists() for word in self.word_lists[name]]
+        words += self.dictionary_words
+        return words
+
+    def set_real_word_index(self, index, version):
+        """Installs an index built from the vocabulary read at `vocabulary_version` == version. Returns False if the lists changed since."""
+        if version != self.vocabulary_version: return False
+        self._real_words = index
+        return True
+
+    def _vocabulary_replaced(self):
+        """Drops the real-word index after a change too large to apply to it in place."""
+        self._real_words = None
+        self.vocabulary_version += 1
 
-    def get_word_count(self):
-        """Returns the number of words in the active list."""
+    def set_dictionary(self, words):
+        """Counts these words as real words too (see get_real_word_index), besides the words of the lists."""
+        self.dictionary_words = set(words)
+        self._vocabulary_replaced()
+
+    def _in_any_list(self, word):
+        """Checks every list with its hashed membership test (indexed lists, a packed list's decoded-once set, an indexed SQL query)."""
+        return word in self.dictionary_words or any(word in word_list for word_list in self.word_lists.values())
+
+    def get_word_count(self, list_name=None):
+        """Returns the number of words in the active list, or in a named list (without decoding packed lists)."""
+        if list_name is not None: return len(self.word_lists.get(list_name, ()))
         return len(self.get_active_list())
 
     def add_custom_list(self, list_name, words):
         """Adds or replaces a custom word list."""
-        if isinstance(list_name, str) and list_name and isinstance(words, list):
-            self.word_lists[list_name] = words
+        if isinstance(list_name, str) and list_name and isinstance(words, (list, IndexedWordList)):
+            self._vocabulary_replaced() # Rebuilt (or loaded from its cache) on next use, rather than extended here with a whole list
+            self.word_lists[list_name] = words if isinstance(words, IndexedWordList) else IndexedWordList(words)
+            if list_name == self.active_list_name: self.active_list = self.word_lists[list_name]
             return True
         return False
 
     def add_word_to_active_list(self, word):
         """Adds a word to the active list if it doesn't already exist."""
-        active_list = self.get_active_list()
-        word = str(word).strip() if word else ""
-        if word and word not in active_list:
-            active_list.append(word)
-            self.word_lists[self.active_list_name] = active_list # Ensure main dict is updated
-            return True
-        return False
+        return self.add_words([word]) == 1
 
     def remove_word_from_active_list(self, word):
         """Removes a word from the active list if it exists."""
+        return self.remove_words([word]) == 1
+
+    def add_words(self, words):
+        """Adds many words to the active list in one pass, skipping blanks and duplicates. Returns the number added."""
         active_list = self.get_active_list()
-        if word in active_list:
-            active_list.remove(word)
+        new_slots = active_list.extend(w for w in (str(word).strip() if word else "" for word in words) if w)
+        if new_slots:
             self.word_lists[self.active_list_name] = active_list # Ensure main dict is updated
-            return True
-        return False
+            self.vocabulary_version += 1
+            if self._real_words is not None: self._real_words.add_words(active_list[slot] for slot in new_slots)
+            self._notify_change(self.active_list_name, "add", new_slots)
+        return len(new_slots)
+
+    def remove_words(self, words):
+        """Removes many words from the active list in one pass. Returns the number removed."""
+        active_list = self.get_active_list()
+        words = list(words)
+        removed = [(word, slot) for word, slot in zip(words, map(active_list.remove, words)) if slot != -1]
+        removed_slots = [slot for _, slot in removed]
+        if removed_slots: self.vocabulary_version += 1
+        if removed_slots and self._real_words is not None:
+            for word, _ in removed:
+                if not self._in_any_list(word): self._real_words.discard(word)
+        if removed_slots:
+            self._notify_change(self.active_list_name, "remove", removed_slots)
+            if active_list.needs_compaction():
+                self._notify_change(self.active_list_name, "compact", active_list.compact())
+        return len(removed_slots)
+
+    def compact_active_list(self):
+        """Squeezes tombstones out of the active list, telling listeners how slots were renumbered."""
+        active_list = self.get_active_list()
+        if active_list.tombstone_count:
+            self._notify_change(self.active_list_name, "compact", active_list.compact())
 
     def save_to_file(self, filename):
-        """Saves all current word lists to a JSON file."""
+        """Saves all current word lists to a JSON file, a word pack (.pack) or an SQLite database (.db, .sqlite)."""
+        if filename.endswith(PACK_EXTENSION): return self.save_to_pack(filename)
+        from word_store import STORE_EXTENSIONS
+        if filename.endswith(STORE_EXTENSIONS):
+            import sqlite3
+            from word_store import WordStore
+            try: store = WordStore(filename)
+            except (sqlite3.Error, ValueError) as e:
+                print(f"Error opening database {filename}: {e}")
+                return False
+            try: return self.save_to_store(store)
+            finally: store.close()
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.word_lists, f, indent=2, ensure_ascii=False)
+                json.dump({name: list(words) for name, words in self.word_lists.items()}, f, indent=2, ensure_ascii=False)
             return True
         except Exception as e:
             print(f"Error saving word lists to {filename}: {e}")
             return False
 
+    def save_to_pack(self, filename):
+        """Saves all current word lists to a memory-mappable word pack."""
+        from word_pack import write_pack
+        try:
+            if self._pack and os.path.abspath(self._pack.filename) == os.path.abspath(filename):
+                for name in self.get_available_lists(): self._materialize(name) # The file is about to be replaced
+                self._close_backing()
+            write_pack(filename, self.word_lists)
+            return True
+        except Exception as e:
+            print(f"Error saving word pack to {filename}: {e}")
+            return False
+
+    def load_from_pack(self, filename):
+        """Opens a word pack, replacing existing lists. Lists are only decoded when selected."""
+        from word_pack import PackedList, WordPack
+        try:
+            pack = WordPack(filename)
+        except (OSError, ValueError) as e:
+            print(f"Error loading word pack from {filename}: {e}")
+            return False
+        names = pack.list_names()
+        if not names:
+            print("Error loading: No valid word lists found in file.")
+            pack.close()
+            return False
+
+        self._close_backing()
+        self._pack = pack
+        self.word_lists = {name: PackedList(pack, name) for name in names}
+        self._list_indexes = {}
+        self._vocabulary_replaced()
+        if self.active_list_name not in self.word_lists:
+            self.active_list_name = names[0] # Set to first available if old one gone
+        self.active_list = self._materialize(self.active_list_name)
+        return True
+
+    def save_to_store(self, store):
+        """Saves all current word lists to a WordStore, replacing the lists it holds."""
+        import sqlite3
+        try:
+            for name in self.get_available_lists(): self._materialize(name) # The store may be the one backing lazy lists
+            store.save_lists(self.word_lists)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving word lists to {store.path}: {e}")
+            return False
+
+    def load_from_store(self, store):
+        """Uses the lists in a WordStore, replacing existing lists. Lists are read only when selected."""
+        import sqlite3
+        from word_store import StoredList
+        try: names = store.list_names()
+        except sqlite3.Error as e:
+            print(f"Error loading word lists from {store.path}: {e}")
+            return False
+        if not names:
+            print("Error loading: No valid word lists found in database.")
+            return False
+
+        self._close_backing()
+        self.word_lists = {name: StoredList(store, name) for name in names}
+        self._list_indexes = {}
+        self._vocabulary_replaced()
+        if self.active_list_name not in self.word_lists:
+            self.active_list_name = names[0] # Set to first available if old one gone
+        self.active_list = self._materialize(self.active_list_name)
+        return True
+
+    def _close_backing(self):
+        """Closes the pack or database that lazily loaded lists were read from."""
+        if self._pack:
+            self._pack.close()
+            self._pack = None
+        if self._owned_store:
+            self._owned_store.close()
+            self._owned_store = None
+
     def load_from_file(self, filename):
-        """Loads word lists from a JSON file, replacing existing lists."""
+        """Loads word lists from a JSON file, word pack or SQLite database, replacing existing lists."""
+        from word_pack import is_pack_file
+        from word_store import is_store_file
+        if is_pack_file(filename): return self.load_from_pack(filename)
+        if is_store_file(filename):
+            import sqlite3
+            from word_store import WordStore
+            try: store = WordStore(filename)
+            except (sqlite3.Error, ValueError) as e:
+                print(f"Error opening database {filename}: {e}")
+                return False
+            if not self.load_from_store(store):
+                store.close()
+                return False
+            self._owned_store = store
+            return True
         try:
             with open(filename, 'r', encoding='utf-8') as f:
                 loaded_lists = json.load(f)
@@ -162,7 +492,7 @@ class WordListManager:
             valid_lists = {}
             for name, words in loaded_lists.items():
                 if isinstance(name, str) and isinstance(words, list):
-                     valid_lists[name] = [str(w) for w in words if isinstance(w, (str, int, float))]
+                     valid_lists[name] = IndexedWordList(str(w) for w in words if isinstance(w, (str, int, float)))
                 else:
                      print(f"Warning: Skipping invalid list during load - Key: {name}")
 
@@ -170,13 +500,16 @@ class WordListManager:
                  print("Error loading: No valid word lists found in file.")
                  return False
 
+            self._close_backing()
             self.word_lists = valid_lists
+            self._list_indexes = {}
+            self._vocabulary_replaced()
 
             available_names = self.get_available_lists()
             if self.active_list_name not in self.word_lists and available_names:
                 self.active_list_name = available_names[0] # Set to first available if old one gone
 
-            self.active_list = self.word_lists.get(self.active_list_name, []) # Update active list content
+            self.active_list = self.word_lists.get(self.active_list_name, IndexedWordList()) # Update active list content
 
             return True
 
@@ -0,0 +1,199 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# Layout (little-endian):
+#   header       MAGIC, uint32 list count, uint32 flags
+#   list index   per list: uint64 name offset, uint32 name length, uint32 word count, uint64 offsets-table position
+#   offsets      per list: word count + 1 uint64 file positions; word i is bytes [off[i], off[i+1] - 1)
+#   strings      UTF-8 list names, then each list's words, each followed by a newline
+MAGIC = b"SPWPACK\x01"
+HEADER = struct.Struct("<8sII")
+FLAG_SPLITTABLE = 1 # No word contains a newline, so a whole list decodes with one split
+INDEX_ENTRY = struct.Struct("<QIIQ")
+OFFSET_TYPECODE = "Q"
+OFFSET_SIZE = 8
+
+
+def is_pack_file(filename):
+    """Checks whether a file starts with the word-pack magic bytes."""
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_pack(filename, word_lists):
+    """Writes {list name: words} as a word pack, atomically replacing `filename`."""
+    names = list(word_lists.keys())
+    encoded_lists = [[str(w).encode('utf-8') for w in word_lists[name]] for name in names]
+    encoded_names = [name.encode('utf-8') for name in names]
+    flags = FLAG_SPLITTABLE if not any(b"\n" in word for words in encoded_lists for word in words) else 0
+
+    offsets_start = HEADER.size + INDEX_ENTRY.size * len(names)
+    strings_start = offsets_start + sum((len(words) + 1) * OFFSET_SIZE for words in encoded_lists)
+
+    index_entries, offset_tables = [], []
+    position, table_position = strings_start, offsets_start
+    for encoded_name, words in zip(encoded_names, encoded_lists):
+        name_offset = position
+        position += len(encoded_name)
+        offsets = array(OFFSET_TYPECODE, [position])
+        for word in words:
+            position += len(word) + 1
+            offsets.append(position)
+        index_entries.append(INDEX_ENTRY.pack(name_offset, len(encoded_name), len(words), table_position))
+        offset_tables.append(offsets)
+        table_position += len(offsets) * OFFSET_SIZE
+
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(names), flags))
+        f.writelines(index_entries)
+        for offsets in offset_tables:
+            if sys.byteorder != "little": offsets.byteswap()
+            f.write(offsets.tobytes())
+        for encoded_name, words in zip(encoded_names, encoded_lists):
+            f.write(encoded_name)
+            for word in words:
+                f.write(word)
+                f.write(b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_filename, filename)
+
+
+class WordPack:
+    """Read-only, memory-mapped view of a word pack file."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, list_count, self._flags = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC: raise ValueError(f"{filename} is not a word pack")
+            self._lists = {} # Name -> (word count, offsets-table position)
+            for i in range(list_count):
+                name_offset, name_length, word_count, table_position = INDEX_ENTRY.unpack_from(self._map, HEADER.size + i * INDEX_ENTRY.size)
+                name = self._map[name_offset:name_offset + name_length].decode('utf-8')
+                self._lists[name] = (word_count, table_position)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Unmaps and closes the file."""
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def list_names(self):
+        """Returns list names in file order."""
+        return list(self._lists.keys())
+
+    def word_count(self, name):
+        """Returns the number of words in a list without decoding any of them."""
+        return self._lists[name][0]
+
+    def word(self, name, i):
+        """Decodes a single word."""
+        word_count, table_position = self._lists[name]
+        if not 0 <= i < word_count: raise IndexError(i)
+        start, end = struct.unpack_from("<QQ", self._map, table_position + i * OFFSET_SIZE)
+        return self._map[start:end - 1].decode('utf-8')
+
+    def words(self, name):
+        """Decodes a whole list."""
+        word_count, table_position = self._lists[name]
+        if word_count == 0: return []
+        start, = struct.unpack_from("<Q", self._map, table_position)
+        end, = struct.unpack_from("<Q", self._map, table_position + word_count * OFFSET_SIZE)
+        if self._flags & FLAG_SPLITTABLE:
+            return self._map[start:end - 1].decode('utf-8').split("\n")
+        offsets = struct.unpack_from(f"<{word_count + 1}Q", self._map, table_position)
+        blob = self._map[start:end]
+        return [blob[a - start:b - start - 1].decode('utf-8') for a, b in zip(offsets, offsets[1:])]
+
+
+class PackedList:
+    """Lazy, read-only sequence over one list in a WordPack; nothing is decoded until asked for."""
+
+    def __init__(self, pack, name):
+        self.pack = pack
+        self.name = name
+        self._members = None # Set of the words, decoded on the first membership test
+
+    def __len__(self):
+        return self.pack.word_count(self.name)
+
+    def __getitem__(self, i):
+        return self.pack.word(self.name, i)
+
+    def __iter__(self):
+        return iter(self.pack.words(self.name))
+
+    def __contains__(self, word):
+        if self._members is None: self._members = set(self.pack.words(self.name))
+        return word in self._members
+
+    def materialize(self):
+        """Decodes the whole list."""
+        return self.pack.words(self.name)
+
+
+def json_to_pack(json_filename, pack_filename):
+    """Converts a word-list JSON file (as written by WordListManager.save_to_file) to a pack. Returns the list count."""
+    with open(json_filename, 'r', encoding='utf-8') as f:
+        loaded_lists = json.load(f)
+    if not isinstance(loaded_lists, dict): raise ValueError(f"{json_filename} is not a valid dictionary format.")
+    valid_lists = {name: [str(w) for w in words if isinstance(w, (str, int, float))]
+                   for name, words in loaded_lists.items() if isinstance(name, str) and isinstance(words, list)}
+    write_pack(pack_filename, valid_lists)
+    return len(valid_lists)
+
+
+def pack_to_json(pack_filename, json_filename):
+    """Converts a pack back to the word-list JSON format. Returns the list count."""
+    pack = WordPack(pack_filename)
+    try:
+        word_lists = {name: pack.words(name) for name in pack.list_names()}
+    finally:
+        pack.close()
+    with open(json_filename, 'w', encoding='utf-8') as f:
+        json.dump(word_lists, f, indent=2, ensure_ascii=False)
+    return len(word_lists)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert word lists between the JSON format and the memory-mapped pack format.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    to_pack = subparsers.add_parser("to-pack", help="convert a JSON word-list file to a pack")
+    to_pack.add_argument("source")
+    to_pack.add_argument("destination")
+    to_json = subparsers.add_parser("to-json", help="convert a pack to a JSON word-list file")
+    to_json.add_argument("source")
+    to_json.add_argument("destination")
+    info = subparsers.add_parser("info", help="list the word lists in a pack")
+    info.add_argument("source")
+    args = parser.parse_args()
+
+    if args.command == "to-pack":
+        print(f"Wrote {json_to_pack(args.source, args.destination)} lists to {args.destination}")
+    elif args.command == "to-json":
+        print(f"Wrote {pack_to_json(args.source, args.destination)} lists to {args.destination}")
+    else:
+        pack = WordPack(args.source)
+        for name in pack.list_names():
+            print(f"{name}: {pack.word_count(name)} words")
+        pack.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+import random
+from array import array
+from bisect import bisect_left, insort
+
+
+def rng_state(rng):
+    """Returns a random.Random's state as a dict with the Mersenne Twister words packed into bytes."""
+    version, internal, gauss_next = rng.getstate()
+    return {'version': version, 'words': array('I', internal).tobytes(), 'gauss_next': gauss_next}
+
+
+def set_rng_state(rng, state):
+    """Restores a state returned by `rng_state`."""
+    words = array('I')
+    words.frombytes(state['words'])
+    rng.setstate((state['version'], tuple(words), state['gauss_next']))
+
+
+class WordSelector:
+    """Hands out the unpresented positions of a word list in random order.
+
+    Progress is a bitmap with one bit per position. A second bitmap, only
+    allocated when needed, marks positions outside the pass (filtered out or
+    discarded). A draw picks random positions until it finds one with neither
+    bit set. Once at most 1/POOL_RATIO of the positions are left, the draw
+    instead picks from a sorted array of the remaining positions, so it never
+    takes more than POOL_RATIO tries. Both ways draw uniformly from the
+    remaining positions. The whole pass is therefore the bitmaps plus the
+    RNG state. `snapshot` captures them, and `restore` continues with exactly
+    the draws the snapshot would have made.
+    """
+
+    POOL_RATIO = 8
+
+    def __init__(self, total=0, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+        self.reset(total)
+
+    def reset(self, total):
+        """Starts a new pass over list indices 0..total-1."""
+        self._end = max(0, total) # Indices from here on are outside the pass
+        self._presented = bytearray((self._end + 7) >> 3)
+        self._out = None # Bitmap of indices below _end that are not in the pass; None when there are none
+        self._total = self._end
+        self._presented_count = 0
+        self._pool = None # Sorted remaining indices, once few are left
+        self._peeked = -1
+
+    def reset_to(self, indices):
+        """Starts a new pass over just the given (distinct) list indices."""
+        self.reset(max(indices) + 1 if indices else 0)
+        self._out = bytearray(b"\xff") * len(self._presented)
+        for index in indices: self._out[index >> 3] &= ~(1 << (index & 7))
+        self._total = len(indices)
+
+    @property
+    def total(self):
+        """Number of indices in the current pass."""
+        return self._total
+
+    @property
+    def presented_count(self):
+        """Number of indices handed out so far in this pass."""
+        return self._presented_count
+
+    @property
+    def remaining(self):
+        """Number of indices not yet handed out."""
+        return self._total - self._presented_count
+
+    def _in_pass(self, index):
+        return 0 <= index < self._end and (self._out is None or not self._out[index >> 3] >> (index & 7) & 1)
+
+    def _available(self):
+        """Returns the in-pass, unpresented indices in ascending order."""
+        taken = self._presented
+        if self._out is not None:
+            taken = (int.from_bytes(taken, 'little') | int.from_bytes(self._out, 'little')).to_bytes(len(taken), 'little')
+        available = array('I')
+        for byte_index, byte in enumerate(taken):
+            if byte == 0xFF: continue
+            base = byte_index << 3
+            available.extend(base + bit for bit in range(8) if not byte >> bit & 1 and base + bit < self._end)
+        return available
+
+    def _draw(self):
+        remaining = self._total - self._presented_count
+        if remaining <= 0: return -1
+        if remaining * self.POOL_RATIO > self._end: # Rejection sampling expects under POOL_RATIO tries
+            self._pool = None
+            presented, out, randrange, end = self._presented, self._out, self.rng.randrange, self._end
+            while True:
+                index = randrange(end)
+                byte = presented[index >> 3] if out is None else presented[index >> 3] | out[index >> 3]
+                if not byte >> (index & 7) & 1: return index
+        if self._pool is None: self._pool = self._available()
+        return self._pool[self.rng.randrange(len(self._pool))]
+
+    def peek(self):
+        """Returns the index the next call to `next` will hand out, or -1 if the pass is done."""
+        if self._peeked == -1: self._peeked = self._draw()
+        return self._peeked
+
+    def next(self):
+        """Hands out a random unpresented index, or -1 if the pass is done."""
+        index = self.peek()
+        if index != -1:
+            self._presented[index >> 3] |= 1 << (index & 7)
+            self._presented_count += 1
+            if self._pool is not None: del self._pool[bisect_left(self._pool, index)]
+            self._peeked = -1
+        return index
+
+    def is_presented(self, index):
+        """Checks whether an index has already been handed out in this pass."""
+        return 0 <= index < self._end and bool(self._presented[index >> 3] >> (index & 7) & 1)
+
+    def _grow(self, end):
+        """Extends the index range to `end`; the new indices start outside the pass."""
+        size = (end + 7) >> 3
+        self._presented.extend(bytes(size - len(self._presented)))
+        if self._out is None: self._out = bytearray(size)
+        else: self._out.extend(bytes(size - len(self._out)))
+        for index in range(self._end, end): self._out[index >> 3] |= 1 << (index & 7)
+        self._end = end
+
+    def add(self, index):
+        """Adds a newly appended list index to the unpresented pool."""
+        if self._in_pass(index): return
+        if index > self._end: self._grow(index)
+        if index == self._end:
+            self._end += 1
+            if len(self._presented) * 8 < self._end:
+                self._presented.append(0)
+                if self._out is not None: self._out.append(0)
+        if self._out is not None: self._out[index >> 3] &= ~(1 << (index & 7))
+        self._total += 1
+        if self._pool is not None: insort(self._pool, index)
+
+    def discard(self, index):
+        """Drops an index from the pass, whether or not it was presented yet."""
+        if not self._in_pass(index): return
+        if self.is_presented(index):
+            self._presented[index >> 3] &= ~(1 << (index & 7))
+            self._presented_count -= 1
+        elif self._pool is not None:
+            del self._pool[bisect_left(self._pool, index)]
+        if self._out is None: self._out = bytearray(len(self._presented))
+        self._out[index >> 3] |= 1 << (index & 7)
+        self._total -= 1
+        if index == self._peeked: self._peeked = -1
+
+    def remap(self, mapping):
+        """Renumbers every index in the pass with mapping(old_index) -> new_index. O(n)."""
+        moved = [(mapping(index), self.is_presented(index)) for index in range(self._end) if self._in_pass(index)]
+        end = max(moved)[0] + 1 if moved else 0
+        presented, out = bytearray((end + 7) >> 3), None
+        if len(moved) < end: out = bytearray(b"\xff") * len(presented)
+        for index, was_presented in moved:
+            if was_presented: presented[index >> 3] |= 1 << (index & 7)
+            if out is not None: out[index >> 3] &= ~(1 << (index & 7))
+        self._end, self._presented, self._out = end, presented, out
+        self._pool = None
+        if self._peeked != -1: self._peeked = mapping(self._peeked)
+
+    # --- Snapshots ---
+    def snapshot(self):
+        """Returns the pass as a dict of plain values and bytes, for `restore`."""
+        return {'end': self._end, 'total': self._total, 'presented_count': self._presented_count, 'peeked': self._peeked,
+                'presented': bytes(self._presented), 'out': bytes(self._out) if self._out is not None else None, 'rng': rng_state(self.rng)}
+
+    def restore(self, state):
+        """Continues the pass saved by `snapshot`."""
+        self._end, self._total, self._presented_count, self._peeked = state['end'], state['total'], state['presented_count'], state['peeked']
+        self._presented = bytearray(state['presented'])
+        self._out = bytearray(state['out']) if state['out'] is not None else None
+        if len(self._presented) != (self._end + 7) >> 3 or (self._out is not None and len(self._out) != len(self._presented)):
+            raise ValueError("Snapshot bitmaps do not match its index range.")
+        self._pool = None # Rebuilt from the bitmaps, so the draws match the uninterrupted pass
+        set_rng_state(self.rng, state['rng'])
+
+
+class WeightedSelector:
+    """Draws list positions at random, with replacement, in proportion to a per-position weight.
+
+    Weights come from `weight_of(index)` and live in a Fenwick (binary
+    indexed) tree, so a draw is a single O(log n) descent and re-weighting
+    one position after it is graded is an O(log n) update; the tree is only
+    rebuilt when a pass starts or positions are renumbered. A draw never
+    repeats the position handed out just before it, unless it is the only
+    one left. Exposes the same methods as WordSelector, but a drill never
+    runs out: `next` returns -1 only when no position has any weight.
+    """
+
+    REBUILD_UPDATES = 1 << 20 # Resum from the weights this often, so float error from updates cannot pile up
+
+    def __init__(self, weight_of, rng=None):
+        self.weight_of = weight_of
+        self.rng = rng if rng is not None else random.Random()
+        self.reset(0)
+
+    def reset(self, total):
+        """Starts a new drill over list indices 0..total-1."""
+        self._build(array('d', map(self._checked_weight, range(max(0, total)))))
+
+    def reset_to(self, indices):
+        """Starts a new drill over just the given list indices."""
+        weights = array('d', bytes(8 * (max(indices) + 1 if indices else 0)))
+        for index in indices: weights[index] = self._checked_weight(index)
+        self._build(weights)
+
+    def reset_weights(self, weights):
+        """Starts a new drill from precomputed non-negative weights, one per list index, instead of calling weight_of for each."""
+        self._build(array('d', weights))
+
+    def _checked_weight(self, index):
+        weight = self.weight_of(index)
+        return weight if weight > 0 else 0.0
+
+    def _build(self, weights):
+        """Builds the tree over `weights` in O(n)."""
+        self._weights = weights
+        size = len(weights)
+        tree = array('d', bytes(8)) + weights # 1-based: tree[i] sums weights (i - lowbit(i), i]
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size: tree[parent] += tree[i]
+        self._tree = tree
+        self._total = sum(weights)
+        self._count = size - weights.count(0.0)
+        self._draws = 0
+        self._last = -1
+        self._peeked = -1
+        self._updates = 0
+
+    @property
+    def total(self):
+        """Number of indices that can be drawn."""
+        return self._count
+
+    @property
+    def presented_count(self):
+        """Number of draws so far in this drill."""
+        return self._draws
+
+    @property
+    def remaining(self):
+        """A drill never runs out while any index has weight."""
+        return self._count
+
+    def _add_to_tree(self, index, delta):
+        tree, size = self._tree, len(self._weights)
+        i = index + 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, end):
+        """Sum of the weights of indices below `end`."""
+        tree, total = self._tree, 0.0
+        while end > 0:
+            total += tree[end]
+            end -= end & -end
+        return total
+
+    def _set(self, index, weight):
+        if index >= len(self._weights): self._grow(index + 1)
+        old = self._weights[index]
+        if weight == old: return
+        self._weights[index] = weight
+        self._add_to_tree(index, weight - old)
+        self._total += weight - old
+        self._count += (weight > 0) - (old > 0)
+        if weight == 0 and index == self._peeked: self._peeked = -1
+        self._updates += 1
+        if self._updates >= self.REBUILD_UPDATES: self._rebuild()
+
+    def _grow(self, size):
+        """Appends zero-weight indices up to `size`; each new tree node sums the existing weights it covers."""
+        for i in range(len(self._weights) + 1, size + 1):
+            self._weights.append(0.0)
+            self._tree.append(self._prefix(i - 1) - self._prefix(i - (i & -i)))
+
+    def _rebuild(self):
+        draws, last, peeked = self._draws, self._last, self._peeked
+        self._build(self._weights)
+        self._draws, self._last, self._peeked = draws, last, peeked
+
+    def _draw(self):
+        """Returns a weighted random index other than the last one handed out (if there is another), or -1."""
+        if not self._count: return -1
+        excluded = self._last if self._count > 1 and 0 <= self._last < len(self._weights) else -1
+        held = self._weights[excluded] if excluded != -1 else 0.0
+        if held: self._add_to_tree(excluded, -held)
+        try:
+            tree, size = self._tree, len(self._weights)
+            while True:
+                target = self.rng.random() * (self._total - held)
+                index, step = 0, 1 << size.bit_length() - 1
+                while step:
+                    node = index + step
+                    if node <= size and tree[node] <= target:
+                        index = node
+                        target -= tree[node]
+                    step >>= 1
+                if index < size: return index
+                self._total = self._prefix(size) + held # Rounding put the target past the end
+        finally:
+            if held: self._add_to_tree(excluded, held)
+
+    def peek(self):
+        """Returns the index the next call to `next` will hand out, or -1 if nothing can be drawn."""
+        if self._peeked == -1: self._peeked = self._draw()
+        return self._peeked
+
+    def next(self):
+        """Hands out a weighted random index, or -1 if nothing can be drawn."""
+        index = self.peek()
+        if index != -1:
+            self._draws += 1
+            self._last = index
+            self._peeked = -1
+        return index
+
+    def _drawable(self, index):
+        return 0 <= index < len(self._weights) and self._weights[index] > 0
+
+    def is_presented(self, index):
+        """Checks whether an index was the last one handed out."""
+        return index == self._last
+
+    def update(self, index):
+        """Re-reads one index's weight, e.g. after an attempt at its word was graded."""
+        if 0 <= index < len(self._weights) and self._weights[index]: self._set(index, self._checked_weight(index))
+
+    def add(self, index):
+        """Adds a newly appended list index to the drill."""
+        self._set(index, self._checked_weight(index))
+
+    def discard(self, index):
+        """Drops an index from the drill."""
+        if 0 <= index < len(self._weights): self._set(index, 0.0)
+
+    def remap(self, mapping):
+        """Renumbers every index in the drill with mapping(old_index) -> new_index. O(n)."""
+        moved = [(mapping(index), weight) for index, weight in enumerate(self._weights) if weight]
+        weights = array('d', bytes(8 * (max(moved)[0] + 1 if moved else 0)))
+        for index, weight in moved: weights[index] = weight
+        draws = self._draws
+        last = mapping(self._last) if self._last != -1 and self._weights[self._last] else -1
+        self._build(weights)
+        self._draws, self._last = draws, last
+
+    # --- Snapshots ---
+    def snapshot(self):
+        """Returns the drill's position (draws so far, last and peeked index, RNG state); the weights come from the tracking data."""
+        return {'draws': self._draws, 'last': self._last, 'peeked': self._peeked, 'rng': rng_state(self.rng)}
+
+    def restore(self, state):
+        """Continues a drill saved by `snapshot`, over weights already set up with `reset_weights`."""
+        self._draws = state['draws']
+        self._last = state['last'] if self._drawable(state['last']) else -1
+        self._peeked = state['peeked'] if self._drawable(state['peeked']) else -1
+        set_rng_state(self.rng, state['rng'])
@@ -0,0 +1,213 @@
+import argparse
+import sqlite3
+import time
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+STORE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+SCHEMA_VERSION = 1
+PAGE_SIZE = 1000
+DAY_SECONDS = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lists (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    word_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS words (
+    list_id INTEGER NOT NULL REFERENCES lists(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    PRIMARY KEY (list_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS words_by_word ON words (word);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    list_name TEXT,
+    word TEXT NOT NULL,
+    attempt TEXT NOT NULL,
+    correct INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_word ON attempts (word, ts);
+CREATE INDEX IF NOT EXISTS attempts_missed ON attempts (correct, ts, word);
+"""
+
+
+def is_store_file(filename):
+    """Checks whether a file is an SQLite database."""
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+class WordStore:
+    """SQLite storage for word lists and attempt history.
+
+    Runs in WAL mode so reads never wait on the writer. Words are keyed by
+    (list, position), so a page of a list is one index range scan, and
+    attempts are indexed by word and by (correct, timestamp), so history
+    queries such as `missed_words` touch only the rows they return.
+    Recorded attempts are committed by `flush`, which callers run on a timer.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL") # Durable at each WAL checkpoint; a crash can only lose the last commit
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION: raise ValueError(f"{path} was written by a newer version of the app")
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._pending = False
+
+    def close(self):
+        """Commits anything pending and closes the database."""
+        self.flush()
+        self.connection.close()
+
+    # --- Word Lists ---
+    def list_names(self):
+        """Returns list names in the order they were saved."""
+        return [name for name, in self.connection.execute("SELECT name FROM lists ORDER BY id")]
+
+    def _list_id(self, name):
+        row = self.connection.execute("SELECT id FROM lists WHERE name = ?", (name,)).fetchone()
+        if row is None: raise KeyError(name)
+        return row[0]
+
+    def word_count(self, name):
+        """Returns the number of words in a list without reading them."""
+        row = self.connection.execute("SELECT word_count FROM lists WHERE name = ?", (name,)).fetchone()
+        if row is None: raise KeyError(name)
+        return row[0]
+
+    def save_list(self, name, words):
+        """Adds or replaces one list."""
+        with self.connection:
+            self._write_list(name, words)
+
+    def save_lists(self, word_lists):
+        """Replaces every stored list with {list name: words} in one transaction."""
+        with self.connection:
+            self.connection.execute("DELETE FROM lists")
+            for name, words in word_lists.items(): self._write_list(name, words)
+
+    def _write_list(self, name, words):
+        self.connection.execute("DELETE FROM lists WHERE name = ?", (name,))
+        list_id = self.connection.execute("INSERT INTO lists (name) VALUES (?)", (name,)).lastrowid
+        rows = ((list_id, position, word) for position, word in enumerate(words))
+        count = self.connection.executemany("INSERT INTO words (list_id, position, word) VALUES (?, ?, ?)", rows).rowcount
+        self.connection.execute("UPDATE lists SET word_count = ? WHERE id = ?", (max(count, 0), list_id))
+
+    def load_list(self, name):
+        """Reads a whole list."""
+        return [word for word, in self.connection.execute("SELECT word FROM words WHERE list_id = ? ORDER BY position", (self._list_id(name),))]
+
+    def fetch_page(self, name, offset=0, limit=PAGE_SIZE):
+        """Reads words offset..offset+limit-1 of a list with one index range scan."""
+        return [word for word, in self.connection.execute(
+            "SELECT word FROM words WHERE list_id = ? AND position >= ? ORDER BY position LIMIT ?", (self._list_id(name), offset, limit))]
+
+    def word_at(self, name, position):
+        """Reads a single word."""
+        row = self.connection.execute("SELECT word FROM words WHERE list_id = ? AND position = ?", (self._list_id(name), position)).fetchone()
+        if row is None: raise IndexError(position)
+        return row[0]
+
+    def lists_containing(self, word):
+        """Returns the names of the lists that contain a word."""
+        return [name for name, in self.connection.execute(
+            "SELECT DISTINCT lists.name FROM words JOIN lists ON lists.id = words.list_id WHERE words.word = ?", (word,))]
+
+    # --- Attempt History ---
+    def record_attempt(self, word, attempt, is_correct, list_name=None, ts=None):
+        """Queues one graded attempt; it is committed by the next `flush`."""
+        self.connection.execute("INSERT INTO attempts (ts, list_name, word, attempt, correct) VALUES (?, ?, ?, ?, ?)",
+                                (time.time() if ts is None else ts, list_name, word, attempt, int(bool(is_correct))))
+        self._pending = True
+
+    def record_attempts(self, rows, list_name=None, ts=None):
+        """Queues many (word, attempt, is_correct) rows."""
+        ts = time.time() if ts is None else ts
+        self.connection.executemany("INSERT INTO attempts (ts, list_name, word, attempt, correct) VALUES (?, ?, ?, ?, ?)",
+                                    ((ts, list_name, word, attempt, int(bool(ok))) for word, attempt, ok in rows))
+        self._pending = True
+
+    def flush(self):
+        """Commits queued attempts."""
+        if self._pending:
+            self.connection.commit()
+            self._pending = False
+
+    def missed_words(self, min_misses=3, days=30, now=None):
+        """Returns (word, misses) for words missed more than `min_misses` times in the last `days`, most missed first."""
+        since = (time.time() if now is None else now) - days * DAY_SECONDS
+        return self.connection.execute(
+            "SELECT word, COUNT(*) AS misses FROM attempts WHERE correct = 0 AND ts >= ? GROUP BY word HAVING misses > ? ORDER BY misses DESC, word",
+            (since, min_misses)).fetchall()
+
+    def word_history(self, word, limit=50):
+        """Returns the latest (ts, attempt, correct) rows for a word, newest first."""
+        return self.connection.execute(
+            "SELECT ts, attempt, correct FROM attempts WHERE word = ? ORDER BY ts DESC LIMIT ?", (word, limit)).fetchall()
+
+
+class StoredList:
+    """Lazy, read-only sequence over one list in a WordStore; words are read a page at a time."""
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def __len__(self):
+        return self.store.word_count(self.name)
+
+    def __getitem__(self, i):
+        return self.store.word_at(self.name, i)
+
+    def __iter__(self):
+        offset = 0
+        while True:
+            page = self.store.fetch_page(self.name, offset)
+            yield from page
+            if len(page) < PAGE_SIZE: return
+            offset += len(page)
+
+    def __contains__(self, word):
+        return self.name in self.store.lists_containing(word)
+
+    def materialize(self):
+        """Reads the whole list."""
+        return self.store.load_list(self.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the word-list and attempt-history database.")
+    parser.add_argument("database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    missed = subparsers.add_parser("missed", help="words missed repeatedly in a recent period")
+    missed.add_argument("--min", type=int, default=3, help="report words missed more than this many times (default 3)")
+    missed.add_argument("--days", type=float, default=30, help="look back this many days (default 30)")
+    history = subparsers.add_parser("history", help="latest attempts at one word")
+    history.add_argument("word")
+    subparsers.add_parser("lists", help="stored word lists and their sizes")
+    args = parser.parse_args()
+
+    store = WordStore(args.database)
+    if args.command == "missed":
+        for word, misses in store.missed_words(args.min, args.days): print(f"{word}: missed {misses} times")
+    elif args.command == "history":
+        for ts, attempt, correct in store.word_history(args.word):
+            print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))}  {'correct' if correct else attempt}")
+    else:
+        for name in store.list_names(): print(f"{name}: {store.word_count(name)} words")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()